@@ -1,7 +1,8 @@
 import argparse
 import sys
 import os
-import json
+
+import orjson
 
 core_dir = os.path.dirname(os.path.abspath(__file__))
 code_dir = os.path.dirname(core_dir)
@@ -18,6 +19,10 @@ def setup_parser() -> argparse.ArgumentParser:
     match_parser.add_argument("--db", type=str, default="data/filament.db", help="Path to SQLite DB")
     match_parser.add_argument("--output", type=str, default="data/processed/leads_advanced.json", help="Output JSON path")
     match_parser.add_argument("--min-score", type=float, default=0.35, help="Minimum score threshold")
+    match_parser.add_argument("--cached", action="store_true",
+                              help="Reuse the existing --output file instead of re-running the matcher "
+                                   "(--limit/--min-score are ignored; the file is not checked against them)")
+    match_parser.add_argument("--reports", action="store_true", help="Generate XAI narrative reports after matching")
     
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate Explainable AI (XAI) narrative reports")
@@ -38,6 +43,18 @@ def setup_parser() -> argparse.ArgumentParser:
     return parser
 
 def cmd_match(args):
+    if args.cached and os.path.exists(args.output):
+        # Fast path: skip loading the matcher entirely. The file is reused as-is,
+        # whatever --limit/--min-score produced it; the report step parses it.
+        leads = None
+        print(f"Using cached leads from {args.output}")
+    else:
+        leads = run_matcher(args)
+    
+    if args.reports:
+        cmd_report(args, leads_path=args.output, leads=leads, db_path=args.db)
+
+def run_matcher(args) -> list:
     from core.search import CompositeMatcher
     if not os.path.exists(args.db):
         print(f"Error: Database not found at {args.db}")
@@ -49,15 +66,19 @@ def cmd_match(args):
     leads = matcher.find_leads(limit=args.limit, min_score=args.min_score)
     
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
-    with open(args.output, "w") as f:
-        json.dump(leads, f, indent=2)
+    # Write to a temp file and swap it in so readers never see a partial file
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(leads, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, args.output)
     print(f"Found {len(leads)} leads. Saved to {args.output}")
+    return leads
 
-def cmd_report(args):
+def cmd_report(args, leads_path=None, leads=None, db_path=None):
     try:
         from scripts.generate_narrative_reports import generate_reports
         print("Generating Explainable AI (XAI) reports...")
-        generate_reports()
+        generate_reports(leads_path=leads_path, leads=leads, db_path=db_path)
     except ImportError as e:
         print(f"Error loading report generator: {e}")
 
@@ -14,6 +14,7 @@ from .entities import (
     PhysicalFeature,
     Clothing,
     BioEvidence,
+    PersonTable,
 )
 
 __all__ = [
@@ -23,4 +24,5 @@ __all__ = [
     "PhysicalFeature",
     "Clothing",
     "BioEvidence",
+    "PersonTable",
 ]
@@ -9,8 +9,10 @@ from datetime import date
 from typing import Optional
 from uuid import UUID, uuid4
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Location:
     """Geographic location with optional precision indicator."""
     
@@ -22,7 +24,7 @@ class Location:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PhysicalFeature:
     """Physical characteristic or medical condition."""
     
@@ -32,7 +34,7 @@ class PhysicalFeature:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Clothing:
     """Clothing item found or described."""
     
@@ -44,7 +46,7 @@ class Clothing:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BioEvidence:
     """Biological evidence metadata (not raw data)."""
     
@@ -60,7 +62,7 @@ class BioEvidence:
     isotope_region: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     """
     Unified person entity for both unidentified remains and missing persons.
@@ -97,3 +99,96 @@ class Person:
     
     # Embedding (populated later)
     embedding: Optional[list[float]] = None
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Person":
+        """
+        Rebuild a Person from its dataclasses.asdict() / JSON form.
+        
+        Args:
+            data: Field dict; ids and dates may be strings, nested entities dicts.
+            
+        Returns:
+            Person with nested Location, PhysicalFeature, Clothing and BioEvidence.
+        """
+        data = dict(data)
+        if isinstance(data.get("id"), str):
+            data["id"] = UUID(data["id"])
+        for key in ("discovery_date", "last_seen_date"):
+            if isinstance(data.get(key), str):
+                data[key] = date.fromisoformat(data[key])
+        if isinstance(data.get("location"), dict):
+            data["location"] = Location(**data["location"])
+        data["physical_features"] = [PhysicalFeature(**f) for f in data.get("physical_features", [])]
+        data["clothing"] = [Clothing(**c) for c in data.get("clothing", [])]
+        data["bio_evidence"] = [BioEvidence(**b) for b in data.get("bio_evidence", [])]
+        return cls(**data)
+
+
+def _float_column(values: list[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+
+def _date_column(values: list[Optional[date]]) -> np.ndarray:
+    return np.array(["NaT" if v is None else v.isoformat() for v in values], dtype="datetime64[D]")
+
+
+@dataclass(slots=True)
+class PersonTable:
+    """
+    Column-oriented (SoA) mirror of a list of Person entities.
+    
+    The numeric fields used for candidate filtering are held in parallel
+    NumPy arrays so they can be masked in one vectorized pass instead of
+    walking Person objects. Missing values are NaN (numbers) or NaT (dates).
+    
+    Usage:
+        table = PersonTable.from_persons(persons)
+        adults = table.age_min >= 18
+    """
+    
+    persons: list[Person]
+    case_numbers: np.ndarray
+    person_types: np.ndarray
+    sexes: np.ndarray
+    age_min: np.ndarray
+    age_max: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    discovery_date: np.ndarray
+    last_seen_date: np.ndarray
+    descriptions: list[str]
+    
+    @classmethod
+    def from_persons(cls, persons: list[Person]) -> "PersonTable":
+        """
+        Build the column arrays from Person entities.
+        
+        Args:
+            persons: Entities to mirror; kept as-is for to_persons().
+            
+        Returns:
+            PersonTable with one row per person, in input order.
+        """
+        persons = list(persons)
+        locations = [p.location for p in persons]
+        return cls(
+            persons=persons,
+            case_numbers=np.array([p.case_number for p in persons], dtype=str),
+            person_types=np.array([p.person_type for p in persons], dtype=str),
+            sexes=np.array([p.estimated_sex or "" for p in persons], dtype=str),
+            age_min=_float_column([p.estimated_age_min for p in persons]),
+            age_max=_float_column([p.estimated_age_max for p in persons]),
+            latitude=_float_column([loc.latitude if loc else None for loc in locations]),
+            longitude=_float_column([loc.longitude if loc else None for loc in locations]),
+            discovery_date=_date_column([p.discovery_date for p in persons]),
+            last_seen_date=_date_column([p.last_seen_date for p in persons]),
+            descriptions=[p.description or "" for p in persons],
+        )
+    
+    def to_persons(self) -> list[Person]:
+        """Return the mirrored Person entities."""
+        return list(self.persons)
+    
+    def __len__(self) -> int:
+        return len(self.persons)
@@ -2,11 +2,49 @@
 Extraction Pipeline - Orchestrates document processing and entity extraction.
 """
 
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterator
 
+import numpy as np
+import orjson
+
+from core.search.embedding_index import EmbeddingIndex
+
 from .entities import Person
 
+HASH_CHUNK_SIZE = 1 << 20
+DOCUMENT_EXTENSIONS = (".pdf", ".txt", ".docx")
+# Pipeline copy held by each worker process (set by _init_worker)
+_worker_pipeline = None
+
+
+def file_sha256(file_path: Path) -> str:
+    """Hex SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_documents(directory: str | Path) -> Iterator[Path]:
+    """
+    Recursively yield document files under a directory.
+    
+    Uses os.scandir so rejected entries are filtered on the name and cached
+    d_type alone, without a stat call or Path object each.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_documents(entry.path)
+            elif entry.name.lower().endswith(DOCUMENT_EXTENSIONS):
+                yield Path(entry.path)
+
 
 class ExtractionPipeline:
     """
@@ -21,7 +59,10 @@ class ExtractionPipeline:
     def __init__(
         self,
         llm_model: str = "llama3",
-        ollama_url: str = "http://localhost:11434"
+        ollama_url: str = "http://localhost:11434",
+        cache_path: str | None = "data/processed/extraction_cache.db",
+        embedding_model=None,
+        semantic_threshold: float = 0.95
     ):
         """
         Initialize the extraction pipeline.
@@ -29,41 +70,229 @@ class ExtractionPipeline:
         Args:
             llm_model: Ollama model name for extraction.
             ollama_url: URL of the Ollama server.
+            cache_path: SQLite file caching extractions by document hash,
+                or None to always call the LLM.
+            embedding_model: Optional EmbeddingModel; when set (and caching is
+                on), near-duplicate documents reuse a cached extraction.
+            semantic_threshold: Cosine similarity at which two document texts
+                count as near-duplicates.
         """
         self.llm_model = llm_model
         self.ollama_url = ollama_url
+        self.cache_path = cache_path
+        self.embedding_model = embedding_model
+        self.semantic_threshold = semantic_threshold
+        self._cache_conn = None
+        self._semantic_index = None
+        self._semantic_persons = []
+        # Set only on pickled copies: EmbeddingModel arguments for _init_worker
+        self._embedding_config = None
+    
+    def _cache(self) -> sqlite3.Connection | None:
+        """Open the extraction cache on first use."""
+        if self.cache_path is None:
+            return None
+        if self._cache_conn is None:
+            if self.cache_path != ":memory:":
+                Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes share the cache file; wait on each other's writes
+            self._cache_conn = sqlite3.connect(self.cache_path, timeout=30)
+            if self.cache_path != ":memory:":
+                self._cache_conn.execute("PRAGMA journal_mode=WAL")
+            with self._cache_conn:
+                self._cache_conn.execute("""
+                    CREATE TABLE IF NOT EXISTS extraction_cache (
+                        hash TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        person_json TEXT NOT NULL,
+                        PRIMARY KEY (hash, model)
+                    )
+                """)
+                self._cache_conn.execute("""
+                    CREATE TABLE IF NOT EXISTS semantic_cache (
+                        hash TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        embedding BLOB NOT NULL,
+                        PRIMARY KEY (hash, model)
+                    )
+                """)
+        return self._cache_conn
+    
+    def _load_semantic_index(self, cache: sqlite3.Connection) -> EmbeddingIndex:
+        """Build the in-memory embedding index from cached extractions on first use."""
+        if self._semantic_index is None:
+            rows = cache.execute("""
+                SELECT s.embedding, c.person_json
+                FROM semantic_cache s
+                JOIN extraction_cache c ON c.hash = s.hash AND c.model = s.model
+                WHERE s.model = ?
+            """, (self.llm_model,)).fetchall()
+            self._semantic_index = EmbeddingIndex(self.embedding_model.dimension, exact=True)
+            if rows:
+                self._semantic_index.add(np.stack([np.frombuffer(emb, dtype=np.float32) for emb, _ in rows]))
+            self._semantic_persons = [person_json for _, person_json in rows]
+        return self._semantic_index
+    
+    def _semantic_lookup(self, cache: sqlite3.Connection, embedding: np.ndarray) -> str | None:
+        """Cached person JSON of the closest earlier document above the threshold."""
+        index = self._load_semantic_index(cache)
+        if len(index) == 0:
+            return None
+        scores, ids = index.search(embedding, k=1)
+        if ids[0, 0] >= 0 and scores[0, 0] >= self.semantic_threshold:
+            return self._semantic_persons[ids[0, 0]]
+        return None
+    
+    def _store(
+        self,
+        cache: sqlite3.Connection,
+        digest: str,
+        person_json: str,
+        embedding: np.ndarray | None
+    ) -> None:
+        """Record an extraction under the document hash (and its embedding)."""
+        with cache:
+            cache.execute(
+                "INSERT OR REPLACE INTO extraction_cache (hash, model, person_json) VALUES (?, ?, ?)",
+                (digest, self.llm_model, person_json)
+            )
+            if embedding is not None:
+                cache.execute(
+                    "INSERT OR REPLACE INTO semantic_cache (hash, model, embedding) VALUES (?, ?, ?)",
+                    (digest, self.llm_model, embedding.astype(np.float32).tobytes())
+                )
+        if embedding is not None and self._semantic_index is not None:
+            self._semantic_index.add(embedding)
+            self._semantic_persons.append(person_json)
+    
+    def __getstate__(self) -> dict:
+        """
+        Pickle without the cache connection or index (rebuilt lazily in workers).
+        
+        An EmbeddingModel is replaced by its constructor arguments, so workers
+        load their own model instead of unpickling a serialized torch model.
+        """
+        state = self.__dict__.copy()
+        state["_cache_conn"] = None
+        state["_semantic_index"] = None
+        state["_semantic_persons"] = []
+        config = getattr(self.embedding_model, "init_kwargs", None)
+        if config is not None:
+            state["embedding_model"] = None
+            state["_embedding_config"] = config
+        return state
+    
+    def close(self) -> None:
+        """Close the extraction cache connection."""
+        if self._cache_conn is not None:
+            self._cache_conn.close()
+            self._cache_conn = None
     
     def process_file(self, file_path: Path) -> Person | None:
         """
         Process a single document and extract a Person entity.
         
+        Extractions are cached by SHA-256 of the file bytes and the LLM model,
+        so re-running over an unchanged document skips the LLM call. With an
+        embedding model, a document whose text is a near-duplicate of a cached
+        one (e.g. differing only in headers or whitespace) also reuses it.
+        
         Args:
             file_path: Path to the document (PDF, TXT, etc.)
             
         Returns:
             Extracted Person entity, or None if extraction fails.
         """
+        file_path = Path(file_path)
+        cache = self._cache()
+        if cache is None:
+            return self._extract_from_text(self._load_text(file_path))
+        
+        digest = file_sha256(file_path)
+        row = cache.execute(
+            "SELECT person_json FROM extraction_cache WHERE hash = ? AND model = ?",
+            (digest, self.llm_model)
+        ).fetchone()
+        if row:
+            return Person.from_dict(orjson.loads(row[0]))
+        
+        text = self._load_text(file_path)
+        
+        embedding = None
+        if self.embedding_model is not None:
+            # Embedding a document is milliseconds; the LLM call it may save is seconds
+            embedding = self.embedding_model.embed_batch([text], normalize=True)[0]
+            person_json = self._semantic_lookup(cache, embedding)
+            if person_json is not None:
+                self._store(cache, digest, person_json, None)
+                return Person.from_dict(orjson.loads(person_json))
+        
+        person = self._extract_from_text(text)
+        # Failures are not cached so they are retried on the next run
+        if person is not None:
+            self._store(cache, digest, orjson.dumps(person).decode(), embedding)
+        return person
+    
+    def _load_text(self, file_path: Path) -> str:
+        """Load a document and return its text content."""
         # TODO: Implement document processing
         # 1. Load document using Unstract
         # 2. Extract text content
-        # 3. Call LLM for entity extraction
-        # 4. Parse response into Person entity
         raise NotImplementedError("Document processing not yet implemented")
     
-    def process_directory(self, directory: Path) -> Iterator[Person]:
+    def _extract_from_text(self, text: str) -> Person | None:
+        """Run LLM entity extraction over document text (uncached)."""
+        # TODO: Implement entity extraction
+        # 1. Call LLM for entity extraction
+        # 2. Parse response into Person entity
+        raise NotImplementedError("Entity extraction not yet implemented")
+    
+    def process_directory(self, directory: Path, max_workers: int = 2) -> Iterator[Person]:
         """
         Process all documents in a directory.
         
+        Documents are independent, so with max_workers > 1 they are processed
+        in a pool of worker processes, each holding a copy of this pipeline.
+        Ollama serves one model at a time, so a small pool (2-4) is enough to
+        keep it busy while the next documents are being parsed.
+        
         Args:
             directory: Path to directory containing documents.
+            max_workers: Worker processes; 1 processes files in this process.
             
         Yields:
-            Extracted Person entities.
+            Extracted Person entities, in directory walk order.
         """
-        directory = Path(directory)
-        
-        for file_path in directory.glob("**/*"):
-            if file_path.suffix.lower() in [".pdf", ".txt", ".docx"]:
+        if max_workers <= 1:
+            for file_path in iter_documents(directory):
                 person = self.process_file(file_path)
                 if person:
                     yield person
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            for person in executor.map(_process_file_task, iter_documents(directory)):
+                if person:
+                    yield person
+
+
+def _load_embedding_model(config: dict):
+    """Build an EmbeddingModel in this process (torch is only imported here)."""
+    from core.search.embeddings import EmbeddingModel
+    return EmbeddingModel(**config)
+
+
+def _init_worker(pipeline: ExtractionPipeline) -> None:
+    """Keep one pipeline (and its cache connection) per worker process."""
+    global _worker_pipeline
+    if pipeline._embedding_config is not None:
+        pipeline.embedding_model = _load_embedding_model(pipeline._embedding_config)
+        pipeline._embedding_config = None
+    _worker_pipeline = pipeline
+
+
+def _process_file_task(file_path: Path) -> Person | None:
+    """Top-level (picklable) entry point for ProcessPoolExecutor."""
+    return _worker_pipeline.process_file(file_path)
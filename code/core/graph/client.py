@@ -3,8 +3,23 @@ SQLite-based Graph Store, replacing Neo4j.
 """
 
 import sqlite3
-import json
-from typing import Any
+from typing import Any, Iterable
+
+import orjson
+
+# Node properties exposed as generated columns so queries can join and
+# index on them instead of calling json_extract per row.
+NODE_GENERATED_COLUMNS = {
+    "medical_term": "TEXT GENERATED ALWAYS AS (json_extract(properties, '$.medical_term')) VIRTUAL",
+    "category": "TEXT GENERATED ALWAYS AS (json_extract(properties, '$.category')) VIRTUAL",
+    "lat_r": "REAL GENERATED ALWAYS AS (CAST(json_extract(properties, '$.lat') AS REAL)) VIRTUAL",
+    "lon_r": "REAL GENERATED ALWAYS AS (CAST(json_extract(properties, '$.lon') AS REAL)) VIRTUAL",
+}
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize properties with orjson, decoded so SQLite stores TEXT JSON."""
+    return orjson.dumps(obj).decode()
 
 
 class GraphClient:
@@ -24,8 +39,17 @@ class GraphClient:
             db_path: Path to the SQLite database.
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, cached_statements=256)
+        self._configure_connection()
         self._init_schema()
+
+    def _configure_connection(self) -> None:
+        """Tune SQLite for the read-heavy join workload in queries.py."""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-200000")
+        self.conn.execute("PRAGMA mmap_size=1073741824")
     
     def _init_schema(self) -> None:
         """Initialize nodes and edges tables."""
@@ -48,6 +72,37 @@ class GraphClient:
                     FOREIGN KEY (target) REFERENCES graph_nodes(id)
                 );
             """)
+            self._ensure_generated_columns()
+            # Indexes backing the edge joins and type filters in queries.py
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_edges_source_type ON graph_edges(source, type)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_edges_target_type ON graph_edges(target, type)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_label ON graph_nodes(label)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_type "
+                "ON graph_nodes(json_extract(properties, '$.type'))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_medical_term ON graph_nodes(medical_term)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_category ON graph_nodes(category)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_nodes_lat_lon ON graph_nodes(lat_r, lon_r)"
+            )
+
+    def _ensure_generated_columns(self) -> None:
+        """Add any missing generated columns to graph_nodes (older databases)."""
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_xinfo(graph_nodes)")}
+        for name, definition in NODE_GENERATED_COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE graph_nodes ADD COLUMN {name} {definition}")
 
     def close(self):
         """Close the database connection."""
@@ -69,7 +124,7 @@ class GraphClient:
                 INSERT OR REPLACE INTO graph_nodes (id, label, properties)
                 VALUES (?, 'Person', ?)
                 """,
-                (case_id, json.dumps(properties))
+                (case_id, _dumps(properties))
             )
     
     def create_location(self, location_id: str, properties: dict[str, Any]) -> None:
@@ -82,7 +137,7 @@ class GraphClient:
                 INSERT OR REPLACE INTO graph_nodes (id, label, properties)
                 VALUES (?, 'Location', ?)
                 """,
-                (location_id, json.dumps(properties))
+                (location_id, _dumps(properties))
             )
             
     def create_node(self, node_id: str, label: str, properties: dict[str, Any]) -> None:
@@ -90,7 +145,7 @@ class GraphClient:
         with self.conn:
             self.conn.execute(
                 "INSERT OR REPLACE INTO graph_nodes (id, label, properties) VALUES (?, ?, ?)",
-                (node_id, label, json.dumps(properties))
+                (node_id, label, _dumps(properties))
             )
     
     def link_nodes(
@@ -107,7 +162,42 @@ class GraphClient:
                 INSERT OR REPLACE INTO graph_edges (source, target, type, properties)
                 VALUES (?, ?, ?, ?)
                 """,
-                (source_id, target_id, rel_type, json.dumps(properties or {}))
+                (source_id, target_id, rel_type, _dumps(properties or {}))
+            )
+
+    def create_nodes_bulk(self, rows: Iterable[tuple[str, str, dict[str, Any]]]) -> None:
+        """
+        Create many nodes in a single transaction.
+        
+        Args:
+            rows: (node_id, label, properties) tuples.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO graph_nodes (id, label, properties) VALUES (?, ?, ?)",
+                ((node_id, label, _dumps(properties)) for node_id, label, properties in rows)
+            )
+    
+    def link_nodes_bulk(
+        self,
+        edges: Iterable[tuple[str, str, str, dict[str, Any] | None]]
+    ) -> None:
+        """
+        Create many relationships in a single transaction.
+        
+        Args:
+            edges: (source_id, target_id, rel_type, properties) tuples.
+        """
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO graph_edges (source, target, type, properties)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (source_id, target_id, rel_type, _dumps(properties or {}))
+                    for source_id, target_id, rel_type, properties in edges
+                )
             )
 
     def link_person_to_location(
@@ -6,6 +6,70 @@ import sqlite3
 import json
 from typing import Any
 
+import numpy as np
+
+from core.utils.geo_utils import bounding_box, haversine_distance_batch, longitude_ranges
+
+
+# SQL is kept in module constants so the connection's statement cache
+# (keyed by SQL text) reuses the prepared statements across calls.
+_FEATURE_MATCH_SQL = """
+    WITH u_feats AS (
+        SELECT
+            uf.id,
+            uf.medical_term,
+            uf.category,
+            json_extract(uf.properties, '$.description') AS description
+        FROM graph_edges e1
+        JOIN graph_nodes uf ON e1.target = uf.id
+        WHERE e1.source = ?
+          AND e1.type = 'HAS_FEATURE'
+          AND EXISTS (
+            SELECT 1 FROM graph_nodes u
+            WHERE u.id = e1.source
+              AND json_extract(u.properties, '$.type') = 'unidentified'
+          )
+    )
+    SELECT 
+        m.id AS missing_id,
+        json_extract(m.properties, '$.name') AS missing_name,
+        group_concat(DISTINCT f.description) AS unid_features,
+        group_concat(DISTINCT json_extract(mf.properties, '$.description')) AS missing_features
+    FROM u_feats f
+    JOIN graph_edges e2 ON e2.target = f.id AND e2.type = 'HAS_FEATURE'
+    JOIN graph_nodes m ON e2.source = m.id
+    JOIN graph_edges e3 ON e3.source = m.id AND e3.type = 'HAS_FEATURE'
+    JOIN graph_nodes mf ON e3.target = mf.id
+    WHERE json_extract(m.properties, '$.type') = 'missing'
+      AND (mf.medical_term = f.medical_term OR mf.category = f.category)
+    GROUP BY m.id
+"""
+
+_CASE_LOCATIONS_SQL = """
+    SELECT ul.lat_r, ul.lon_r
+    FROM graph_nodes u
+    JOIN graph_edges e1 ON u.id = e1.source AND e1.type = 'LOCATED_AT'
+    JOIN graph_nodes ul ON e1.target = ul.id
+    WHERE u.id = ?
+      AND json_extract(u.properties, '$.type') = 'unidentified'
+"""
+
+_NEARBY_MISSING_SQL = """
+    SELECT 
+        m.id AS missing_id,
+        json_extract(m.properties, '$.name') AS missing_name,
+        json_extract(ml.properties, '$.name') AS last_seen_location,
+        ml.lat_r,
+        ml.lon_r
+    FROM graph_nodes ml
+    JOIN graph_edges e2 ON ml.id = e2.target AND e2.type = 'LAST_SEEN_AT'
+    JOIN graph_nodes m ON e2.source = m.id
+    WHERE ml.label = 'Location'
+      AND ml.lat_r BETWEEN ? AND ?
+      AND (ml.lon_r BETWEEN ? AND ? OR ml.lon_r BETWEEN ? AND ?)
+      AND json_extract(m.properties, '$.type') = 'missing'
+"""
+
 
 def find_matches_by_feature(
     conn: sqlite3.Connection,
@@ -15,34 +79,12 @@ def find_matches_by_feature(
     """
     Find potential matches based on shared physical features.
     
-    Neo4j Cypher equivalent translated to SQL joins.
+    Neo4j Cypher equivalent translated to SQL joins. The unidentified
+    case's features are resolved once in a CTE and compared against the
+    missing persons' features via the indexed medical_term/category
+    columns on graph_nodes.
     """
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT 
-            m.id AS missing_id,
-            json_extract(m.properties, '$.name') AS missing_name,
-            group_concat(DISTINCT json_extract(uf.properties, '$.description')) AS unid_features,
-            group_concat(DISTINCT json_extract(mf.properties, '$.description')) AS missing_features
-        FROM graph_nodes u
-        JOIN graph_edges e1 ON u.id = e1.source AND e1.type = 'HAS_FEATURE'
-        JOIN graph_nodes uf ON e1.target = uf.id
-        JOIN graph_edges e2 ON uf.id = e2.target AND e2.type = 'HAS_FEATURE'
-        JOIN graph_nodes m ON e2.source = m.id
-        JOIN graph_edges e3 ON m.id = e3.source AND e3.type = 'HAS_FEATURE'
-        JOIN graph_nodes mf ON e3.target = mf.id
-        WHERE u.id = ? 
-          AND json_extract(u.properties, '$.type') = 'unidentified'
-          AND json_extract(m.properties, '$.type') = 'missing'
-          AND (
-            json_extract(uf.properties, '$.medical_term') = json_extract(mf.properties, '$.medical_term')
-            OR json_extract(uf.properties, '$.category') = json_extract(mf.properties, '$.category')
-          )
-        GROUP BY m.id
-        """,
-        (case_id,)
-    )
+    cursor = conn.execute(_FEATURE_MATCH_SQL, (case_id,))
     
     results = []
     for row in cursor.fetchall():
@@ -62,48 +104,41 @@ def find_geographic_proximity(
 ) -> list[dict[str, Any]]:
     """
     Find missing persons last seen within distance of remains discovery.
-    Uses SQLite's json_extract and standard JOINs.
-    """
-    # Note: SQLite doesn't have a native point.distance. 
-    # We use a simplified bounding box or haversine formula if registered as a function.
-    # For now, let's assume we fetch and filter in Python or use a simple box.
-    
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT 
-            m.id AS missing_id,
-            json_extract(m.properties, '$.name') AS missing_name,
-            json_extract(ml.properties, '$.name') AS last_seen_location,
-            json_extract(ul.properties, '$.lat') AS u_lat,
-            json_extract(ul.properties, '$.lon') AS u_lon,
-            json_extract(ml.properties, '$.lat') AS m_lat,
-            json_extract(ml.properties, '$.lon') AS m_lon
-        FROM graph_nodes u
-        JOIN graph_edges e1 ON u.id = e1.source AND e1.type = 'LOCATED_AT'
-        JOIN graph_nodes ul ON e1.target = ul.id
-        JOIN graph_nodes ml ON ml.label = 'Location'
-        JOIN graph_edges e2 ON ml.id = e2.target AND e2.type = 'LAST_SEEN_AT'
-        JOIN graph_nodes m ON e2.source = m.id
-        WHERE u.id = ?
-          AND json_extract(m.properties, '$.type') = 'missing'
-          AND json_extract(u.properties, '$.type') = 'unidentified'
-        """,
-        (case_id,)
-    )
     
-    from core.utils.geo_utils import haversine_distance
+    Candidates are pruned in SQL with a lat/lon bounding box on the indexed
+    lat_r/lon_r columns; exact distances for the survivors are computed in
+    one vectorized NumPy pass.
+    """
+    case_locations = conn.execute(_CASE_LOCATIONS_SQL, (case_id,)).fetchall()
     
     results = []
-    for row in cursor.fetchall():
-        m_id, m_name, l_name, u_lat, u_lon, m_lat, m_lon = row
-        dist = haversine_distance(u_lat, u_lon, m_lat, m_lon)
-        if dist is not None and dist <= max_distance_km:
+    for u_lat, u_lon in case_locations:
+        if u_lat is None or u_lon is None:
+            continue
+        lat_min, lat_max, lon_min, lon_max = bounding_box(u_lat, u_lon, max_distance_km)
+        # Two longitude ranges when the box wraps the antimeridian; otherwise
+        # the single range is passed twice
+        ranges = longitude_ranges(lon_min, lon_max)
+        (lo1, hi1), (lo2, hi2) = ranges[0], ranges[-1]
+        
+        rows = conn.execute(
+            _NEARBY_MISSING_SQL,
+            (lat_min, lat_max, lo1, hi1, lo2, hi2)
+        ).fetchall()
+        if not rows:
+            continue
+        
+        m_lats = np.array([row[3] for row in rows], dtype=np.float64)
+        m_lons = np.array([row[4] for row in rows], dtype=np.float64)
+        distances = haversine_distance_batch(u_lat, u_lon, m_lats, m_lons)
+        
+        for idx in np.flatnonzero(distances <= max_distance_km):
+            m_id, m_name, l_name = rows[idx][:3]
             results.append({
                 "missing_id": m_id,
                 "missing_name": m_name,
                 "last_seen_location": l_name,
-                "distance_km": round(dist, 2)
+                "distance_km": round(float(distances[idx]), 2)
             })
             
     return sorted(results, key=lambda x: x['distance_km'])
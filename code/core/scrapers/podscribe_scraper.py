@@ -2,8 +2,11 @@
 Podscribe Scraper.
 """
 
+import asyncio
 import logging
+import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterator
 
 from selenium import webdriver
@@ -13,24 +16,64 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
 from core.extraction.podcasts import PodcastTranscript
 
 logger = logging.getLogger(__name__)
 
+# Transcript container, matched by the browser's native selector engine
+TRANSCRIPT_SELECTOR = "div[class*='transcript']"
+# Fallback heuristic: a div with more direct span children than this holds the words
+MIN_TRANSCRIPT_SPANS = 50
+# Static HTML counts as a transcript only with that many spans or this much text;
+# anything smaller is a placeholder ("Loading transcript...") left for Selenium
+MIN_STATIC_TRANSCRIPT_CHARS = 2000
+# Resources transcript extraction never needs; blocked over CDP in every driver
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+]
+
 class PodscribeClient:
     """
     Client for fetching transcripts from Podscribe.
     """
     
     BASE_URL = "https://app.podscribe.com"
+    USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     
-    def __init__(self):
-        """Initialize Selenium driver options."""
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize Selenium driver options.
+        
+        Args:
+            max_workers: Number of headless drivers loading episodes concurrently.
+                Keep this small to stay within a polite crawl rate.
+        """
+        self.max_workers = max_workers
         self.chrome_options = Options()
         self.chrome_options.add_argument("--headless")
         self.chrome_options.add_argument("--no-sandbox")
         self.chrome_options.add_argument("--disable-dev-shm-usage")
-        self.chrome_options.add_argument("user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        self.chrome_options.add_argument(f"user-agent={self.USER_AGENT}")
+        # Pages are only read for text; skip image decoding and GPU setup
+        self.chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        self.chrome_options.add_argument("--disable-gpu")
+        self.chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
         # Ensure we point to the installed chromium if needed, but standard should work
         # self.chrome_options.binary_location = "/usr/bin/chromium"
 
@@ -38,11 +81,19 @@ class PodscribeClient:
         """
         Fetch transcripts for a series.
         
+        Episode pages are first fetched as plain HTML (httpx + selectolax, when
+        installed); only pages that ship without a rendered transcript are loaded
+        concurrently on a small pool of drivers. Results are yielded in series order.
+        
         Args:
             series_id: Podscribe series ID (e.g., '870')
             limit: Max episodes to process
         """
-        driver = webdriver.Chrome(options=self.chrome_options)
+        driver = self._new_driver()
+        # Idle drivers; the series driver is reused as the first one
+        drivers = queue.SimpleQueue()
+        drivers.put(driver)
+        started = [driver]
         try:
             series_url = f"{self.BASE_URL}/series/{series_id}"
             logger.info(f"Navigating to {series_url}")
@@ -71,13 +122,34 @@ class PodscribeClient:
             
             logger.info(f"Found {len(episode_urls)} episodes. Processing top {limit}")
             
-            for url in episode_urls[:limit]:
-                try:
-                    transcript = self._process_episode(driver, url)
-                    if transcript:
-                        yield transcript
-                except Exception as e:
-                    logger.error(f"Failed to process {url}: {e}")
+            urls = episode_urls[:limit]
+            static = self._fetch_static_transcripts(urls)
+            needs_browser = [url for url in urls if url not in static]
+            if static:
+                logger.info(f"{len(static)} episodes served static HTML; {len(needs_browser)} need the browser")
+            
+            for _ in range(min(self.max_workers, len(needs_browser)) - 1):
+                extra = self._new_driver()
+                started.append(extra)
+                drivers.put(extra)
+            
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                futures = {url: executor.submit(self._process_with_pool, drivers, url) for url in needs_browser}
+                for url in urls:
+                    if url in static:
+                        yield static[url]
+                        continue
+                    try:
+                        transcript = futures[url].result()
+                        if transcript:
+                            yield transcript
+                    except Exception as e:
+                        logger.error(f"Failed to process {url}: {e}")
+            finally:
+                # A consumer that stops early (break, close) must not wait for
+                # every queued episode to load before the drivers are quit
+                executor.shutdown(wait=False, cancel_futures=True)
 
         except TimeoutException:
             logger.error("Timeout waiting for episodes.")
@@ -87,7 +159,98 @@ class PodscribeClient:
             raise
                     
         finally:
-            driver.quit()
+            for started_driver in started:
+                started_driver.quit()
+
+    def _new_driver(self) -> webdriver.Chrome:
+        """Start a headless driver that blocks images, fonts and analytics requests."""
+        driver = webdriver.Chrome(options=self.chrome_options)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        return driver
+
+    def _fetch_static_transcripts(self, urls: list[str]) -> dict[str, PodcastTranscript]:
+        """
+        Fetch episode pages over plain HTTP and parse server-rendered transcripts.
+        
+        Returns:
+            Mapping of url -> transcript for pages that already contain one;
+            the rest (JS-only shells, errors) are left for Selenium.
+        """
+        if not (HAS_HTTPX and HAS_SELECTOLAX) or not urls:
+            return {}
+        
+        try:
+            pages = asyncio.run(self._fetch_pages(urls))
+        except Exception as e:
+            logger.warning(f"Static fetch failed, falling back to browser: {e}")
+            return {}
+        
+        transcripts = {}
+        for url, html in zip(urls, pages):
+            transcript = self._parse_static_episode(url, html) if html else None
+            if transcript:
+                transcripts[url] = transcript
+        return transcripts
+
+    async def _fetch_pages(self, urls: list[str]) -> list[str | None]:
+        """GET all pages concurrently, bounded by max_workers connections."""
+        limits = httpx.Limits(max_connections=self.max_workers)
+        headers = {"User-Agent": self.USER_AGENT}
+        async with httpx.AsyncClient(limits=limits, headers=headers, timeout=15, follow_redirects=True) as client:
+            async def fetch(url):
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response.text
+                except httpx.HTTPError as e:
+                    logger.debug(f"Static fetch of {url} failed: {e}")
+                    return None
+            
+            return await asyncio.gather(*(fetch(url) for url in urls))
+
+    def _parse_static_episode(self, url: str, html: str) -> PodcastTranscript | None:
+        """Extract a transcript from server-rendered HTML, or None for a JS shell or placeholder."""
+        tree = LexborHTMLParser(html)
+        
+        content = self._find_transcript_node(tree)
+        if content is None:
+            return None
+        
+        text = content.text(separator=" ", strip=True)
+        span_count = sum(1 for child in content.iter() if child.tag == "span")
+        if span_count <= MIN_TRANSCRIPT_SPANS and len(text) < MIN_STATIC_TRANSCRIPT_CHARS:
+            return None
+        
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True).replace(" - Podscribe", "") if title_node else "Unknown Title"
+        
+        return PodcastTranscript(
+            video_id=url.split("/")[-1].split("?")[0], # Approximate ID
+            channel_name="Podscribe Series",
+            title=title,
+            text=text,
+            source_url=url
+        )
+
+    @staticmethod
+    def _find_transcript_node(tree):
+        """Transcript container in a parsed page, or a div of many spans, or None."""
+        content = tree.css_first(TRANSCRIPT_SELECTOR)
+        if content is None:
+            for div in tree.css("div"):
+                if sum(1 for child in div.iter() if child.tag == "span") > MIN_TRANSCRIPT_SPANS:
+                    content = div
+                    break
+        return content
+
+    def _process_with_pool(self, drivers: queue.SimpleQueue, url: str) -> PodcastTranscript | None:
+        """Process one episode on a driver borrowed from the pool."""
+        driver = drivers.get()
+        try:
+            return self._process_episode(driver, url)
+        finally:
+            drivers.put(driver)
 
     def _process_episode(self, driver: webdriver.Chrome, url: str) -> PodcastTranscript | None:
         """Process a single episode page."""
@@ -118,47 +281,26 @@ class PodscribeClient:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         time.sleep(2) # Allow load
         
-        # Extract text
-        # Strategy: Find the main transcript container or just grab all text spans that look like transcript
-        # Heuristic: Speaker blocks have timestamps.
-        # But simply: grab all text from the specific container if we can ID it.
-        # If not, grab all text and clean. 
-        # Let's try to get specific speaker blocks if possible, or just huge text blob.
-        
-        # Broad approach: get all meaningful text
-        # Refinement: Browser agent saw <span> elements for words.
-        # We can try to get all text from the "transcript-container" if it exists, or body.
-        
-        # Let's try to find a container with many spans
-        # or just get text from body but that includes menu.
+        # Extract text: the transcript container by CSS selector first. Without
+        # one, snapshot the DOM once and search it in-process rather than
+        # running the span-counting XPath (a full DOM walk) in the browser.
+        text = None
+        containers = driver.find_elements(By.CSS_SELECTOR, TRANSCRIPT_SELECTOR)
+        if containers:
+            text = containers[0].text
+        elif HAS_SELECTOLAX:
+            content = self._find_transcript_node(LexborHTMLParser(driver.page_source))
+            if content is not None:
+                text = content.text(separator=" ", strip=True)
+        else:
+            try:
+                text = driver.find_element(By.XPATH, f"//div[count(span) > {MIN_TRANSCRIPT_SPANS}]").text
+            except NoSuchElementException:
+                pass
         
-        # Better: Look for timestamp patterns or specific classes. 
-        # Since I assume standard podscribe structure:
-        
-        try:
-           # Attempt to find the main content area.
-           # Often distinct from nav.
-           # Let's assume there's a main div.
-           # Or just grab the text
-           
-           # Get all text from divs that are NOT nav/header/footer
-           # For now, let's just grab the whole body text and assume we can clean later?
-           # No, that's messy.
-           # Let's target the spans.
-           spans = driver.find_elements(By.TAG_NAME, "span")
-           # Filter spans that look like words (not UI elements)
-           # This is fuzzy.
-           
-           # Let's rely on the verification step to refine selectors.
-           # I'll dump the text of spans that are within a likely content div.
-           
-           # Using XPATH to find a div containing many spans?
-           content_div = driver.find_element(By.XPATH, "//div[count(span) > 50] | //div[contains(@class, 'transcript')]")
-           text = content_div.text
-           
-        except NoSuchElementException:
-           # Fallback
-           text = driver.find_element(By.TAG_NAME, "body").text
+        if text is None:
+            # Fallback
+            text = driver.find_element(By.TAG_NAME, "body").text
            
         return PodcastTranscript(
             video_id=url.split("/")[-1].split("?")[0], # Approximate ID
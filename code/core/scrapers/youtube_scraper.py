@@ -2,6 +2,8 @@
 YouTube Podcast Scraper.
 """
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Iterator
 
@@ -20,15 +22,23 @@ class YouTubePodcastClient:
     Client for fetching podcast transcripts from YouTube channels.
     """
     
-    def __init__(self):
-        """Initialize the YouTube Podcast client."""
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the YouTube Podcast client.
+        
+        Args:
+            max_workers: Number of concurrent transcript fetches.
+        """
         # youtube_transcript_api doesn't store state, but we might want to config proxies here later
-        pass
+        self.max_workers = max_workers
     
     def fetch_channel_transcripts(self, channel_id: str = None, channel_url: str = None, limit: int = 10) -> Iterator[PodcastTranscript]:
         """
         Fetch transcripts for the most recent videos in a channel.
         
+        The video list is streamed from scrapetube and transcripts are fetched
+        concurrently (network-bound), while results are yielded in channel order.
+        
         Args:
             channel_id: The YouTube channel ID (e.g., 'UC...')
             channel_url: The YouTube channel URL (e.g. 'https://youtube.com/@...')
@@ -43,26 +53,44 @@ class YouTubePodcastClient:
         else:
             videos = scrapetube.get_channel(channel_id=channel_id, limit=limit)
         
-        videos_list = list(videos) 
-        logger.info(f"Found {len(videos_list)} videos for {channel_id or channel_url}")
-        
-        for video in videos_list:
-            video_id = video['videoId']
-            title = video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title')
-            
-            transcript_text, segments = self._get_transcript(video_id)
+        count = 0
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for video in videos:
+                count += 1
+                pending.append((video, executor.submit(self._get_transcript, video['videoId'])))
+                # Bound in-flight work so the video generator stays lazy
+                if len(pending) >= self.max_workers * 2:
+                    transcript = self._build_transcript(channel_id, *pending.popleft())
+                    if transcript:
+                        yield transcript
             
-            if transcript_text:
-                yield PodcastTranscript(
-                    video_id=video_id,
-                    channel_id=channel_id,
-                    channel_name="Unknown Channel", 
-                    title=title,
-                    text=transcript_text,
-                    segments=segments
-                )
-            else:
-                logger.warning(f"No transcript for {video_id}: {title}")
+            while pending:
+                transcript = self._build_transcript(channel_id, *pending.popleft())
+                if transcript:
+                    yield transcript
+        
+        logger.info(f"Processed {count} videos for {channel_id or channel_url}")
+    
+    def _build_transcript(self, channel_id: str, video: dict, future: Future) -> PodcastTranscript | None:
+        """Wrap a completed transcript fetch into a PodcastTranscript."""
+        video_id = video['videoId']
+        title = video.get('title', {}).get('runs', [{}])[0].get('text', 'Unknown Title')
+        
+        transcript_text, segments = future.result()
+        
+        if not transcript_text:
+            logger.warning(f"No transcript for {video_id}: {title}")
+            return None
+        
+        return PodcastTranscript(
+            video_id=video_id,
+            channel_id=channel_id,
+            channel_name="Unknown Channel", 
+            title=title,
+            text=transcript_text,
+            segments=segments
+        )
     
     def _get_transcript(self, video_id: str) -> tuple[str, list[dict]]:
         """
@@ -81,32 +109,36 @@ class YouTubePodcastClient:
             transcript_list = api.list(video_id)
             
             # Find generated or manual English transcript
-            # Prefer manual, fall back to generated
-            try:
-                # Manual English - assuming TranscriptList object signature matches
-                transcript_obj = transcript_list.find_manually_created_transcript(['en'])
-            except:
-                try:
-                    # Auto-generated English
-                    transcript_obj = transcript_list.find_generated_transcript(['en'])
-                except:
-                     # Any English?
-                     return "", []
+            # Prefer manual, fall back to generated. Walking the list directly
+            # avoids raising (and swallowing) NoTranscriptFound per miss.
+            manual = None
+            generated = None
+            for transcript in transcript_list:
+                if transcript.language_code != 'en':
+                    continue
+                if transcript.is_generated:
+                    generated = generated or transcript
+                else:
+                    manual = transcript
+                    break
+            
+            transcript_obj = manual or generated
+            if transcript_obj is None:
+                return "", []
 
             segments = transcript_obj.fetch()
             
-            # Combine text
             # Version 1.2.3 returns objects with .text attribute
-            # But let's check if it's dict or object to be safe? 
-            # The error 'not subscriptable' confirms it's an object.
-            full_text = " ".join([seg.text for seg in segments])
-            
-            # Convert segments to dicts for storage if needed, or keep as is if compatible
-            # Our PodcastTranscript model expects 'segments': list[dict]
-            segments_dicts = [
-                {'text': seg.text, 'start': seg.start, 'duration': seg.duration}
-                for seg in segments
-            ]
+            # (the error 'not subscriptable' confirms it's an object).
+            # Single pass: collect text and the dicts our PodcastTranscript
+            # model expects ('segments': list[dict]) together.
+            texts = []
+            segments_dicts = []
+            for seg in segments:
+                text = seg.text
+                texts.append(text)
+                segments_dicts.append({'text': text, 'start': seg.start, 'duration': seg.duration})
+            full_text = " ".join(texts)
             
             return full_text, segments_dicts
             
@@ -5,18 +5,36 @@ This module handles:
 - Embedding generation
 - Vector storage and indexing
 - Semantic similarity search
+
+Submodules are imported on first attribute access, so that e.g. importing
+CompositeMatcher does not load sentence-transformers/torch.
 """
 
-from .embeddings import EmbeddingModel
-from .vector_store import VectorStore
-from .semantic_search import SemanticSearch
-from .specificity_search import CompositeMatcher
-from .narrative_generator import NarrativeGenerator
+import importlib
+
+_LAZY_ATTRS = {
+    "EmbeddingModel": ".embeddings",
+    "EmbeddingIndex": ".embedding_index",
+    "VectorStore": ".vector_store",
+    "SemanticSearch": ".semantic_search",
+    "CompositeMatcher": ".specificity_search",
+    "NarrativeGenerator": ".narrative_generator",
+}
 
 __all__ = [
     "EmbeddingModel",
+    "EmbeddingIndex",
     "VectorStore",
     "SemanticSearch",
     "CompositeMatcher",
     "NarrativeGenerator",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,152 @@
+"""
+Approximate nearest-neighbour index over normalized embeddings.
+"""
+
+import numpy as np
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+
+class EmbeddingIndex:
+    """
+    Cosine-similarity index backed by FAISS (HNSW or exact inner product).
+
+    Vectors are L2-normalized on add and search, so inner product equals
+    cosine similarity. Without faiss installed, an exact NumPy search is used.
+
+    Usage:
+        index = EmbeddingIndex(model.dimension)
+        index.add(model.embed_batch(descriptions))
+        scores, ids = index.search(model.embed(query), k=10)
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        exact: bool = False,
+        m: int = 32,
+        ef_construction: int = 200,
+        ef_search: int = 64
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            dimension: Embedding dimension.
+            exact: Use exact inner-product search instead of HNSW.
+            m: HNSW graph degree.
+            ef_construction: HNSW build-time candidate list size.
+            ef_search: HNSW query-time candidate list size.
+        """
+        self.dimension = dimension
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self.index = None
+
+        if HAS_FAISS:
+            if exact:
+                self.index = faiss.IndexFlatIP(dimension)
+            else:
+                self.index = faiss.IndexHNSWFlat(dimension, m, faiss.METRIC_INNER_PRODUCT)
+                self.index.hnsw.efConstruction = ef_construction
+                self.index.hnsw.efSearch = ef_search
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def __len__(self) -> int:
+        if self.index is not None:
+            return self.index.ntotal
+        return len(self._vectors)
+
+    def add(self, embeddings: np.ndarray) -> None:
+        """
+        Add embeddings to the index. Positions follow insertion order.
+
+        Args:
+            embeddings: Matrix of embeddings (n x dimension).
+        """
+        vectors = self._normalize(embeddings)
+        if self.index is not None:
+            self.index.add(vectors)
+        else:
+            self._vectors = np.vstack([self._vectors, vectors])
+
+    def search(self, query_embeddings: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar indexed vectors for each query.
+
+        Args:
+            query_embeddings: Query vector or matrix (q x dimension).
+            k: Number of neighbours per query.
+
+        Returns:
+            (scores, ids) arrays of shape (q x k); missing slots have id -1.
+        """
+        queries = self._normalize(query_embeddings)
+        if self.index is not None:
+            return self.index.search(queries, k)
+
+        n_results = min(k, len(self._vectors))
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        if n_results == 0:
+            return scores, ids
+
+        sims = queries @ self._vectors.T
+        top = np.argpartition(-sims, n_results - 1, axis=1)[:, :n_results]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1)
+        ids[:, :n_results] = np.take_along_axis(top, order, axis=1)
+        scores[:, :n_results] = np.take_along_axis(top_sims, order, axis=1)
+        return scores, ids
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index to disk.
+
+        The file is an .npz archive that records which backend wrote it, so
+        load() can read it whether or not faiss is installed on that machine.
+        """
+        with open(path, "wb") as f:
+            if self.index is not None:
+                np.savez(f, backend="faiss", data=faiss.serialize_index(self.index))
+            else:
+                np.savez(f, backend="numpy", data=self._vectors)
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingIndex":
+        """
+        Load an index previously written with save().
+
+        A NumPy-backed file is rebuilt as a FAISS index when faiss is
+        available; a FAISS-backed file requires faiss.
+        """
+        with np.load(path) as archive:
+            backend = str(archive["backend"])
+            data = archive["data"]
+
+        if backend == "faiss":
+            if not HAS_FAISS:
+                raise ImportError(f"{path} holds a FAISS index; install faiss to load it")
+            index = faiss.deserialize_index(data)
+            # Skip __init__ so no throwaway HNSW index is built
+            instance = cls.__new__(cls)
+            instance.dimension = index.d
+            instance._vectors = np.empty((0, index.d), dtype=np.float32)
+            instance.index = index
+            return instance
+
+        instance = cls(data.shape[1])
+        if instance.index is not None:
+            # Stored vectors are already normalized
+            instance.index.add(np.ascontiguousarray(data, dtype=np.float32))
+        else:
+            instance._vectors = data
+        return instance
@@ -1,8 +1,18 @@
 
 import requests
 import json
+import orjson
+from functools import lru_cache
 from typing import Dict, Any, List
 
+
+@lru_cache(maxsize=1024)
+def _extract_circumstances(description: str) -> str:
+    """Return the text after the last 'Circumstances:' marker, or ''."""
+    _, marker, circumstances = description.rpartition("Circumstances:")
+    return circumstances.strip() if marker else ""
+
+
 class NarrativeGenerator:
     """
     Generates investigative narratives and story lines using DeepSeek-R1 via Ollama.
@@ -11,6 +21,8 @@ class NarrativeGenerator:
     def __init__(self, ollama_host: str = "http://localhost:11434", model: str = "deepseek-r1:1.5b"):
         self.ollama_host = ollama_host
         self.model = model
+        # Reuse one HTTP connection to Ollama across all generated leads
+        self.session = requests.Session()
         
     def generate_story_line(self, uhr_data: Dict[str, Any], mp_data: Dict[str, Any], shared_features: List[str]) -> str:
         """
@@ -23,21 +35,23 @@ class NarrativeGenerator:
         
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                payload = {
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {
+                        "temperature": 0.7,
+                        "num_predict": 2500,
+                        "num_ctx": 4096
+                    }
+                }
+                response = self.session.post(
                     f"{self.ollama_host}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "num_predict": 2500,
-                            "num_ctx": 4096
-                        }
-                    },
+                    data=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"},
                     timeout=600
                 )
-                resp_json = response.json()
+                resp_json = orjson.loads(response.content)
                 narrative = resp_json.get("response", "")
                 
                 if not narrative or narrative.strip() == "":
@@ -78,13 +92,9 @@ class NarrativeGenerator:
         uhr_loc = uhr_data.get('discovery_location_name') or "Unknown"
         
         # Extract circumstances if available
-        mp_circ = ""
-        if "Circumstances:" in mp_data.get('description', ''):
-            mp_circ = mp_data['description'].split("Circumstances:")[-1].strip()
-        
-        uhr_circ = ""
-        if "Circumstances:" in uhr_data.get('description', ''):
-            uhr_circ = uhr_data['description'].split("Circumstances:")[-1].strip()
+        # Memoized: the same case description recurs across many leads
+        mp_circ = _extract_circumstances(mp_data.get('description') or '')
+        uhr_circ = _extract_circumstances(uhr_data.get('description') or '')
 
         prompt = f"""
 As a cold case investigator and forensic analyst, write a structured Explainable AI (XAI) report evaluating the potential match between these two cases.
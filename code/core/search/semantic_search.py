@@ -53,6 +53,31 @@ class SemanticSearch:
         embedding = self.embedder.embed(content)
         self.store.insert(table_name, doc_id, content, embedding, metadata)
     
+    def index_documents(
+        self,
+        table_name: str,
+        docs: list[tuple[str, str, dict[str, Any] | None]],
+        batch_size: int = 32
+    ) -> None:
+        """
+        Embed and index many documents with batched encoding and inserts.
+        
+        Args:
+            table_name: Target table.
+            docs: (doc_id, content, metadata) tuples.
+            batch_size: Encoding batch size.
+        """
+        if not docs:
+            return
+        embeddings = self.embedder.embed_batch([content for _, content, _ in docs], batch_size=batch_size)
+        self.store.insert_many(
+            table_name,
+            [
+                (doc_id, content, embedding, metadata)
+                for (doc_id, content, metadata), embedding in zip(docs, embeddings)
+            ]
+        )
+    
     def find_similar(
         self,
         table_name: str,
@@ -75,6 +100,30 @@ class SemanticSearch:
         query_embedding = self.embedder.embed(query)
         return self.store.search(table_name, query_embedding, limit, threshold)
     
+    def find_similar_batch(
+        self,
+        table_name: str,
+        queries: list[str],
+        limit: int = 10,
+        threshold: float = 0.5
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Find similar documents for many queries with one batched encode.
+        
+        Args:
+            table_name: Table to search.
+            queries: Natural language queries.
+            limit: Maximum results per query.
+            threshold: Minimum similarity score.
+            
+        Returns:
+            One list of matching documents per query.
+        """
+        if not queries:
+            return []
+        query_embeddings = self.embedder.embed_batch(queries)
+        return self.store.search_batch(table_name, query_embeddings, limit, threshold)
+    
     def compare_texts(self, text1: str, text2: str) -> float:
         """
         Compare semantic similarity of two texts.
@@ -3,15 +3,129 @@ import sqlite3
 import json
 import re
 import math
+import string
 from collections import Counter
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Tuple, Set, Iterable, Iterator
 from concurrent.futures import ProcessPoolExecutor
 import os
+from pathlib import Path
 
-from core.utils.geo_utils import haversine_distance, calculate_geo_score
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    from sklearn.feature_extraction.text import CountVectorizer
+    HAS_SKLEARN = True
+except ImportError:
+    HAS_SKLEARN = False
+
+try:
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+try:
+    from joblib import Parallel, delayed
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+from core.utils.geo_utils import haversine_distance_batch, calculate_geo_score_batch
 
 # Pre-compile regex for speed
 WORD_PATTERN = re.compile(r'\w+')
+# For ASCII text \w+ is [a-z0-9_]+ after lowercasing, so tokens can be split
+# out with one translate() call instead of a regex scan
+ASCII_WORD_CHARS = set(string.ascii_lowercase + string.digits + '_')
+ASCII_NON_WORD_TO_SPACE = str.maketrans({chr(i): ' ' for i in range(128) if chr(i) not in ASCII_WORD_CHARS})
+# Same tokens as _get_words (word runs of 3+ chars) for CountVectorizer
+TOKEN_PATTERN = r'(?u)\b\w\w\w+\b'
+# UHR rows per sparse overlap product; bounds the SpGEMM working set per call
+UHR_BLOCK_SIZE = 128
+
+MP_CANDIDATE_QUERY = """
+    SELECT file_number, name, age_at_disappearance, last_seen_date, 
+           description, last_seen_lat, last_seen_lon, sex, race, dna_status, dental_status
+    FROM missing_persons
+    WHERE description IS NOT NULL
+"""
+
+STOP_WORDS = frozenset({
+    'the', 'and', 'was', 'with', 'found', 'on', 'in', 'at', 'of', 'for', 'to', 'is', 'has', 
+    'unknown', 'unsure', 'uncertain', 'years', 'old', 'male', 'female', 'white', 'black', 
+    'caucasian', 'american', 'african', 'hispanic', 'asian', 'native', 'race', 'sex', 
+    'estimated', 'approximately', 'approx', 'about', 'inches', 'pounds', 'cm', 'kg', 'lbs',
+    'body', 'description', 'subject', 'case', 'number', 'discovery', 'location', 'found',
+    'sighting', 'last', 'seen', 'contact', 'date', 'remains', 'charred', 'skeletonized',
+    'burned', 'discovered', 'debris', 'underneath', 'after', 'before', 'around', 'above',
+    'below', 'where', 'which', 'there', 'their', 'them', 'they', 'this', 'that', 'from',
+    'into', 'been', 'were', 'also', 'some', 'many', 'very', 'small', 'large', 'water',
+    'side', 'both', 'between', 'area', 'name', 'time', 'well', 'worn', 'long', 'size',
+    'brand', 'color', 'black', 'white', 'blue', 'red', 'green', 'yellow', 'brown', 'gray'
+})
+
+# Permanent marks whose one-sided absence is penalized in calculate_traits_penalty
+RARE_TRAIT_WORDS = ("tattoo", "scar", "piercing", "surgical", "fracture")
+
+# Read-only connection opened once per ProcessPoolExecutor worker
+_worker_conn: sqlite3.Connection | None = None
+
+
+def _connect_readonly(db_path: str) -> sqlite3.Connection:
+    """Open the database read-only, tuned for the candidate scans."""
+    conn = sqlite3.connect(Path(db_path).absolute().as_uri() + "?mode=ro", uri=True)
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-200000")
+    conn.execute("PRAGMA mmap_size=1073741824")
+    return conn
+
+
+def _init_worker(db_path: str) -> None:
+    """ProcessPoolExecutor initializer: keep one connection for all chunks."""
+    global _worker_conn
+    _worker_conn = _connect_readonly(db_path)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _overlap_score(u_ids, m_ids, idf):
+        """Sum IDF weights of the ids shared by two sorted int32 arrays."""
+        total = 0.0
+        i = 0
+        j = 0
+        while i < u_ids.shape[0] and j < m_ids.shape[0]:
+            if u_ids[i] == m_ids[j]:
+                total += idf[u_ids[i]]
+                i += 1
+                j += 1
+            elif u_ids[i] < m_ids[j]:
+                i += 1
+            else:
+                j += 1
+        return total
+else:
+    def _overlap_score(u_ids, m_ids, idf):
+        """Sum IDF weights of the ids shared by two frozensets."""
+        return sum(idf[w] for w in u_ids & m_ids)
+
+
+def _sparse_row_values(matrix, row: int, columns: np.ndarray) -> np.ndarray:
+    """Entries of one CSR row (sorted indices) at sorted `columns`; 0.0 where unset."""
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    indices = matrix.indices[start:end]
+    values = np.zeros(len(columns), dtype=np.float64)
+    if len(indices):
+        pos = np.minimum(np.searchsorted(indices, columns), len(indices) - 1)
+        hit = indices[pos] == columns
+        values[hit] = matrix.data[start:end][pos[hit]]
+    return values
 
 class CompositeMatcher:
     """
@@ -24,56 +138,94 @@ class CompositeMatcher:
     
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.stop_words = {
-            'the', 'and', 'was', 'with', 'found', 'on', 'in', 'at', 'of', 'for', 'to', 'is', 'has', 
-            'unknown', 'unsure', 'uncertain', 'years', 'old', 'male', 'female', 'white', 'black', 
-            'caucasian', 'american', 'african', 'hispanic', 'asian', 'native', 'race', 'sex', 
-            'estimated', 'approximately', 'approx', 'about', 'inches', 'pounds', 'cm', 'kg', 'lbs',
-            'body', 'description', 'subject', 'case', 'number', 'discovery', 'location', 'found',
-            'sighting', 'last', 'seen', 'contact', 'date', 'remains', 'charred', 'skeletonized',
-            'burned', 'discovered', 'debris', 'underneath', 'after', 'before', 'around', 'above',
-            'below', 'where', 'which', 'there', 'their', 'them', 'they', 'this', 'that', 'from',
-            'into', 'been', 'were', 'also', 'some', 'many', 'very', 'small', 'large', 'water',
-            'side', 'both', 'between', 'area', 'name', 'time', 'well', 'worn', 'long', 'size',
-            'brand', 'color', 'black', 'white', 'blue', 'red', 'green', 'yellow', 'brown', 'gray'
-        }
+        self.stop_words = STOP_WORDS
         self.idf_cache = {}
         self.uhr_total = 0
         self.mp_total = 0
         self.uhr_df = Counter()
         self.mp_df = Counter()
+        # Word ids and per-id specificity, built once by load_stats
+        self.vocab: Dict[str, int] = {}
+        self.spec_uhr = np.empty(0)
+        self.spec_mp = np.empty(0)
 
-    def _get_words(self, text: str) -> Set[str]:
-        if not text: return set()
-        words = set(WORD_PATTERN.findall(text.lower()))
+    def _get_words(self, text: str) -> frozenset:
+        """Content words of a description, with stop words already removed."""
+        if not text: return frozenset()
+        text = text.lower()
+        if text.isascii():
+            tokens = text.translate(ASCII_NON_WORD_TO_SPACE).split()
+        else:
+            tokens = WORD_PATTERN.findall(text)
         # Filter: Min 3 chars, and avoid pure numeric IDs unless very specific
-        filtered = {w for w in words if len(w) > 2 and not w.isdigit()}
-        return filtered
+        stop_words = self.stop_words
+        return frozenset(w for w in tokens if len(w) > 2 and not w.isdigit() and w not in stop_words)
+
+    def _document_frequencies(self, texts: Iterable[str]) -> Tuple[int, Counter]:
+        """
+        Count, per word, how many of the texts contain it.
+        
+        The texts are consumed in a single pass, so a streaming cursor can be
+        passed straight in without materializing the table.
+        
+        Returns:
+            (number of texts, document frequency per word)
+        """
+        n_docs = 0
+        
+        def counted(items: Iterable[str]) -> Iterator[str]:
+            nonlocal n_docs
+            for item in items:
+                n_docs += 1
+                yield item
+        
+        if HAS_SKLEARN:
+            # Tokenize and count in C; stop words and numbers are dropped afterwards
+            vectorizer = CountVectorizer(binary=True, lowercase=True, token_pattern=TOKEN_PATTERN, dtype=np.int32)
+            try:
+                counts = np.asarray(vectorizer.fit_transform(counted(texts)).sum(axis=0)).ravel()
+            except ValueError:  # No tokens at all
+                return n_docs, Counter()
+            return n_docs, Counter({
+                word: int(counts[i]) for word, i in vectorizer.vocabulary_.items()
+                if word not in self.stop_words and not word.isdigit()
+            })
+        
+        df = Counter()
+        for text in counted(texts):
+            df.update(self._get_words(text))
+        return n_docs, df
+
+    def _stream_descriptions(self, conn: sqlite3.Connection, table: str) -> Iterator[str]:
+        """Yield non-empty descriptions one row at a time from the cursor."""
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT description FROM {table}")
+        return (row[0] for row in cursor if row[0])
 
     def load_stats(self, conn: sqlite3.Connection):
-        """Pre-calculate global statistics for TF-IDF."""
+        """
+        Pre-calculate global statistics for TF-IDF.
+        
+        Descriptions are streamed from the cursor, so peak memory is bounded
+        by the vocabulary and one row rather than the whole table.
+        """
         print("Loading global TF-IDF statistics")
-        cursor = conn.cursor()
         
         # UHR stats
-        cursor.execute("SELECT description FROM unidentified_cases")
-        for i, row in enumerate(cursor.fetchall()):
-            if row[0]:
-                self.uhr_total += 1
-                words = self._get_words(row[0]) - self.stop_words
-                for word in words:
-                    self.uhr_df[word] += 1
-            if i % 5000 == 0 and i > 0: print(f"  Summarized {i} UHR cases")
+        n_docs, df = self._document_frequencies(self._stream_descriptions(conn, "unidentified_cases"))
+        self.uhr_total += n_docs
+        self.uhr_df.update(df)
         
         # MP stats
-        cursor.execute("SELECT description FROM missing_persons")
-        for i, row in enumerate(cursor.fetchall()):
-            if row[0]:
-                self.mp_total += 1
-                words = self._get_words(row[0]) - self.stop_words
-                for word in words:
-                    self.mp_df[word] += 1
-            if i % 10000 == 0 and i > 0: print(f"  Summarized {i} MP cases")
+        n_docs, df = self._document_frequencies(self._stream_descriptions(conn, "missing_persons"))
+        self.mp_total += n_docs
+        self.mp_df.update(df)
+        
+        words = dict.fromkeys([*self.uhr_df, *self.mp_df])
+        self.vocab = {word: i for i, word in enumerate(words)}
+        self.spec_uhr = np.empty(0)
+        self.spec_mp = np.empty(0)
+        self._extend_specificity()
         print(f"Stats loaded. UHR: {self.uhr_total}, MP: {self.mp_total}")
 
     def calculate_specificity(self, word: str, df: Counter, total_docs: int) -> float:
@@ -82,6 +234,29 @@ class CompositeMatcher:
         if count <= 0: return 2.5 # Extremely rare
         return math.log10(total_docs / count)
 
+    def word_specificity(self, word: str) -> float:
+        """Average UHR/MP specificity of a word, from the id arrays or idf_cache."""
+        word_id = self.vocab.get(word)
+        if word_id is not None and word_id < len(self.spec_uhr):
+            return float((self.spec_uhr[word_id] + self.spec_mp[word_id]) / 2)
+        if word not in self.idf_cache:
+            spec1 = self.calculate_specificity(word, self.uhr_df, self.uhr_total)
+            spec2 = self.calculate_specificity(word, self.mp_df, self.mp_total)
+            self.idf_cache[word] = (spec1 + spec2) / 2
+        return self.idf_cache[word]
+
+    def overlap_features(self, common: Set[str]) -> List[str]:
+        """Label shared words that are specific enough to report."""
+        matched_features = []
+        for word in common:
+            specificity = self.word_specificity(word)
+            # Hardened thresholds. Rare: >2.2, Normal: >1.5
+            if specificity > 2.2:
+                matched_features.append(f"{word} (Rare)")
+            elif specificity > 1.5:
+                matched_features.append(word)
+        return matched_features
+
     def score_text_overlap(
         self, 
         words1: Set[str], 
@@ -91,24 +266,70 @@ class CompositeMatcher:
         if not common:
             return 0.0, []
         
-        total_score = 0.0
-        matched_features = []
-        for word in common:
-            if word not in self.idf_cache:
-                spec1 = self.calculate_specificity(word, self.uhr_df, self.uhr_total)
-                spec2 = self.calculate_specificity(word, self.mp_df, self.mp_total)
-                self.idf_cache[word] = (spec1 + spec2) / 2
-            
-            specificity = self.idf_cache[word]
-            total_score += specificity
-            
-            # Hardened thresholds. Rare: >2.2, Normal: >1.5
-            if specificity > 2.2:
-                matched_features.append(f"{word} (Rare)")
-            elif specificity > 1.5:
-                matched_features.append(word)
+        total_score = sum(self.word_specificity(word) for word in common)
+        return min(1.0, total_score / 35), self.overlap_features(common)
+
+    def _encode_words(self, words: Set[str], vocab: Dict[str, int]):
+        """
+        Intern words as integer ids for _overlap_score.
         
-        return min(1.0, total_score / 35), matched_features
+        Returns a sorted int32 array for the Numba kernel, or a frozenset
+        of ids for the pure-Python fallback.
+        """
+        ids = [vocab.setdefault(word, len(vocab)) for word in words]
+        if HAS_NUMBA:
+            return np.array(sorted(ids), dtype=np.int32)
+        return frozenset(ids)
+
+    def _specificity_array(self, words: List[str], df: Counter, total_docs: int) -> np.ndarray:
+        """Vectorized calculate_specificity over a list of words."""
+        counts = np.array([df.get(word, 0) for word in words], dtype=np.float64)
+        spec = np.full(len(words), 2.5)  # Extremely rare
+        seen = counts > 0
+        spec[seen] = np.log10(total_docs / counts[seen])
+        spec[[word in self.stop_words for word in words]] = 0.0
+        return spec
+
+    def _extend_specificity(self) -> None:
+        """
+        Compute specificity for vocab ids that have none yet.
+        
+        load_stats fills every corpus word at once; words interned later
+        (absent from both corpora) get the unseen-word constant appended.
+        """
+        words = list(self.vocab)[len(self.spec_uhr):]
+        if not words:
+            return
+        self.spec_uhr = np.concatenate([self.spec_uhr, self._specificity_array(words, self.uhr_df, self.uhr_total)])
+        self.spec_mp = np.concatenate([self.spec_mp, self._specificity_array(words, self.mp_df, self.mp_total)])
+
+    def _overlap_blocks(self, uhr_ids: list, mp_ids: list, idf, n_words: int) -> Iterator["sparse.csr_matrix"]:
+        """
+        Yield summed IDF of shared words for every UHR x MP pair, in row blocks.
+        
+        Documents become binary CSR rows over the word ids, so
+        (U * idf) @ M.T sums the weights of the words each pair shares.
+        
+        Returns:
+            Sparse (UHR_BLOCK_SIZE x n_mp) CSR blocks with sorted indices, one per
+            block of UHR rows; pairs sharing no words have no entry, so memory
+            follows the number of overlapping pairs rather than n_mp.
+        """
+        def binary_csr(docs: list) -> "sparse.csr_matrix":
+            indptr = np.zeros(len(docs) + 1, dtype=np.int64)
+            np.cumsum([len(doc) for doc in docs], out=indptr[1:])
+            indices = np.fromiter(
+                (word_id for doc in docs for word_id in sorted(doc)), dtype=np.int32, count=indptr[-1]
+            )
+            data = np.ones(len(indices), dtype=np.float64)
+            return sparse.csr_matrix((data, indices, indptr), shape=(len(docs), n_words))
+        
+        weighted_uhr = binary_csr(uhr_ids) @ sparse.diags(np.asarray(idf, dtype=np.float64))
+        mp_t = binary_csr(mp_ids).T.tocsr()
+        for start in range(0, len(uhr_ids), UHR_BLOCK_SIZE):
+            block = (weighted_uhr[start:start + UHR_BLOCK_SIZE] @ mp_t).tocsr()
+            block.sort_indices()
+            yield block
 
     def calculate_phenotypic_score(self, u_race: str, m_race: str) -> float:
         score = 0.0
@@ -120,8 +341,24 @@ class CompositeMatcher:
                 score -= 0.5 
         return max(-1.0, min(1.0, score * 2))
 
-    def calculate_traits_penalty(self, u: Dict[str, Any], m_age: int, m_desc: str) -> float:
-        """Calculates penalties for explicit contradictions in traits."""
+    def _phenotypic_scores(self, u_race: str, m_races: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_phenotypic_score over MP races ("" = missing)."""
+        if not u_race:
+            return np.zeros(len(m_races))
+        return np.where(m_races == "", 0.0, np.where(m_races == u_race, 1.0, -1.0))
+
+    def calculate_traits_penalty(
+        self,
+        u: Dict[str, Any],
+        m_age: int,
+        m_desc: str,
+        m_words: Set[str] | None = None
+    ) -> float:
+        """
+        Calculates penalties for explicit contradictions in traits.
+        
+        m_words may be passed in when the MP description was already tokenized.
+        """
         penalty = 0.0
         
         # 1. Age Range Penalty (Soft)
@@ -133,10 +370,11 @@ class CompositeMatcher:
 
         # 2. Rare Feature Absence (Surgical/Permanent Marks)
         # If one case has a rare indicator and the other is descriptive but lacks it
-        m_words = self._get_words(m_desc) - self.stop_words
+        if m_words is None:
+            m_words = self._get_words(m_desc)
         u_words = u["u_words"]
         
-        for word in ("tattoo", "scar", "piercing", "surgical", "fracture"):
+        for word in RARE_TRAIT_WORDS:
             if word in u_words and word not in m_words and len(m_words) > 50:
                 penalty += 0.1
             elif word in m_words and word not in u_words and len(u_words) > 50:
@@ -144,6 +382,34 @@ class CompositeMatcher:
                 
         return penalty
 
+    def _traits_penalties(
+        self,
+        u: Dict[str, Any],
+        candidates: np.ndarray,
+        pool: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Vectorized calculate_traits_penalty over the candidate MP rows."""
+        penalties = np.zeros(len(candidates))
+        
+        # 1. Age Range Penalty (Soft); missing MP ages are NaN and never compare true
+        if u["u_age_min"]:
+            age = pool["age"][candidates]
+            outside = age < u["u_age_min"] - 5
+            if u["u_age_max"]:
+                outside |= age > u["u_age_max"] + 5
+            penalties += np.where(outside, 0.2, 0.0)
+        
+        # 2. Rare Feature Absence, added word by word as in the scalar version
+        u_words = u["u_words"]
+        m_has = pool["rare_traits"][candidates]
+        m_descriptive = pool["n_words"][candidates] > 50
+        for j, word in enumerate(RARE_TRAIT_WORDS):
+            if word in u_words:
+                penalties += np.where(~m_has[:, j] & m_descriptive, 0.1, 0.0)
+            elif len(u_words) > 50:
+                penalties += np.where(m_has[:, j], 0.1, 0.0)
+        return penalties
+
     def calculate_bio_multiplier(self, u_dna: str, u_dental: str, m_dna: str, m_dental: str) -> float:
         dna_ready = u_dna == 'Complete' and m_dna == 'Complete'
         dental_ready = u_dental == 'Complete' and m_dental == 'Complete'
@@ -151,6 +417,21 @@ class CompositeMatcher:
             return 1.5
         return 1.0
 
+    def _bio_multipliers(
+        self,
+        u_dna: str,
+        u_dental: str,
+        candidates: np.ndarray,
+        pool: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Vectorized calculate_bio_multiplier over the candidate MP rows."""
+        ready = np.zeros(len(candidates), dtype=bool)
+        if u_dna == 'Complete':
+            ready |= pool["dna_complete"][candidates]
+        if u_dental == 'Complete':
+            ready |= pool["dental_complete"][candidates]
+        return np.where(ready, 1.5, 1.0)
+
     def find_leads(
         self, 
         min_score: float = 0.35, 
@@ -173,7 +454,7 @@ class CompositeMatcher:
             processed_uhr = []
             for uhr in uhr_cases:
                 u_num, u_sex, u_age_min, u_age_max, u_date, u_desc, u_lat, u_lon, u_race, u_dna, u_dental = uhr
-                u_words = self._get_words(u_desc) - self.stop_words
+                u_words = self._get_words(u_desc)
                 
                 processed_uhr.append({
                     "u_num": u_num, "u_sex": u_sex, "u_age_min": u_age_min, "u_age_max": u_age_max,
@@ -181,11 +462,12 @@ class CompositeMatcher:
                     "u_race": u_race, "u_dna": u_dna, "u_dental": u_dental
                 })
 
-            # Stats to share with workers (to avoid recalculating IDF)
+            # Stats to share with workers (to avoid recalculating IDF). The DF
+            # Counters stay behind: every corpus word is covered by the arrays.
             stats = {
-                "uhr_df": self.uhr_df, "mp_df": self.mp_df,
                 "uhr_total": self.uhr_total, "mp_total": self.mp_total,
-                "idf_cache": self.idf_cache
+                "idf_cache": self.idf_cache,
+                "vocab": self.vocab, "spec_uhr": self.spec_uhr, "spec_mp": self.spec_mp
             }
 
             if parallel:
@@ -194,11 +476,25 @@ class CompositeMatcher:
                 chunks = [processed_uhr[i:i + chunk_size] for i in range(0, len(processed_uhr), chunk_size)]
                 
                 all_leads = []
-                with ProcessPoolExecutor(max_workers=num_workers) as executor:
-                    # Pass stats dictionary to workers
-                    futures = [executor.submit(self._match_chunk, chunk, stats, min_score) for chunk in chunks]
-                    for future in futures:
-                        all_leads.extend(future.result())
+                if HAS_JOBLIB:
+                    # loky memory-maps the large NumPy arrays in stats read-only
+                    # instead of pickling a copy to every worker
+                    chunk_results = Parallel(n_jobs=num_workers, backend="loky", mmap_mode="r")(
+                        delayed(_match_chunk_task)(self.db_path, chunk, stats, min_score) for chunk in chunks
+                    )
+                    for leads in chunk_results:
+                        all_leads.extend(leads)
+                else:
+                    with ProcessPoolExecutor(
+                        max_workers=num_workers, initializer=_init_worker, initargs=(self.db_path,)
+                    ) as executor:
+                        # Pass stats dictionary to workers
+                        futures = [
+                            executor.submit(_match_chunk_task, self.db_path, chunk, stats, min_score)
+                            for chunk in chunks
+                        ]
+                        for future in futures:
+                            all_leads.extend(future.result())
             else:
                 all_leads = self._match_chunk(processed_uhr, stats, min_score)
                 
@@ -207,88 +503,181 @@ class CompositeMatcher:
         finally:
             conn.close()
 
+    def _load_mp_pool(self, conn: sqlite3.Connection) -> Tuple[List[tuple], Dict[str, np.ndarray]]:
+        """Load all MP candidate rows plus column arrays used for filtering."""
+        rows = conn.execute(MP_CANDIDATE_QUERY).fetchall()
+        
+        def column(i: int) -> list:
+            return [row[i] for row in rows]
+        
+        def as_float(values: list) -> np.ndarray:
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        
+        ages, dates, sexes = column(2), column(3), column(7)
+        # Missing dates become "" so they sort first and always pass the date cut
+        date = np.array([d or "" for d in dates], dtype=str)
+        date_order = np.argsort(date, kind="stable")
+        pool = {
+            # Age 0 is treated like a missing age, as in the original truthiness check
+            "age": as_float([a or None for a in ages]),
+            "date_order": date_order,
+            "date_sorted": date[date_order],
+            "sex": np.array([x or "" for x in sexes], dtype=str),
+            "sex_null": np.array([x is None for x in sexes], dtype=bool),
+            "lat": as_float(column(5)),
+            "lon": as_float(column(6)),
+            "race": np.array([r or "" for r in column(8)], dtype=str),
+            "dna_complete": np.array([v == 'Complete' for v in column(9)], dtype=bool),
+            "dental_complete": np.array([v == 'Complete' for v in column(10)], dtype=bool),
+        }
+        return rows, pool
+
+    def _candidate_mask(self, u: Dict[str, Any], pool: Dict[str, np.ndarray]) -> np.ndarray:
+        """Vectorized date, sex, bounding-box and age filters for one UHR case."""
+        u_date_limit = u["u_date"] if u["u_date"] else '9999-12-31'
+        cut = np.searchsorted(pool["date_sorted"], u_date_limit, side="right")
+        mask = np.zeros(len(pool["date_order"]), dtype=bool)
+        mask[pool["date_order"][:cut]] = True
+        
+        if u["u_sex"] and u["u_sex"] not in ('Uncertain', 'Unknown'):
+            mask &= pool["sex_null"] | np.isin(pool["sex"], ['Unknown', 'Uncertain', u["u_sex"]])
+        
+        if u["u_lat"] is not None and u["u_lon"] is not None:
+            lat, lon = pool["lat"], pool["lon"]
+            in_box = (
+                (lat >= u["u_lat"] - 8) & (lat <= u["u_lat"] + 8)
+                & (lon >= u["u_lon"] - 8) & (lon <= u["u_lon"] + 8)
+            )
+            mask &= np.isnan(lat) | in_box
+        
+        # 4. Age Filter (Hard exclusion)
+        if u["u_age_min"]:
+            age = pool["age"]
+            too_far = age < u["u_age_min"] - 10
+            if u["u_age_max"]:
+                too_far |= age > u["u_age_max"] + 10
+            mask &= ~too_far
+        
+        return mask
+
     def _match_chunk(self, uhr_subset: List[Dict[str, Any]], stats: Dict[str, Any], min_score: float) -> List[Dict[str, Any]]:
         """Worker function for parallel matching with database streaming."""
         # Update worker instance with shared stats
-        self.uhr_df = stats["uhr_df"]
-        self.mp_df = stats["mp_df"]
         self.uhr_total = stats["uhr_total"]
         self.mp_total = stats["mp_total"]
         self.idf_cache = stats["idf_cache"]
+        self.vocab = stats["vocab"]
+        self.spec_uhr = stats["spec_uhr"]
+        self.spec_mp = stats["spec_mp"]
         
         results = []
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Workers reuse the connection from _init_worker; serial runs open their own
+        owns_conn = _worker_conn is None
+        conn = _connect_readonly(self.db_path) if owns_conn else _worker_conn
         
         try:
-            for u in uhr_subset:
-                u_date_limit = u["u_date"] if u["u_date"] else '9999-12-31'
+            # Fetch the MP table once; per-UHR filters run as NumPy masks
+            mp_rows, mp_pool = self._load_mp_pool(conn)
+            
+            # Tokenize every MP description once; reused for every UHR case
+            mp_words = [self._get_words(row[4]) for row in mp_rows]
+            mp_pool["n_words"] = np.array([len(words) for words in mp_words], dtype=np.int64)
+            mp_pool["rare_traits"] = np.array(
+                [[word in words for word in RARE_TRAIT_WORDS] for words in mp_words], dtype=bool
+            ).reshape(len(mp_words), len(RARE_TRAIT_WORDS))
+            
+            # Word ids from load_stats; specificity is a lookup by id
+            mp_ids = [self._encode_words(words, self.vocab) for words in mp_words]
+            uhr_ids = [self._encode_words(u["u_words"], self.vocab) for u in uhr_subset]
+            self._extend_specificity()
+            idf = (self.spec_uhr + self.spec_mp) / 2
+            if not HAS_NUMBA:
+                idf = idf.tolist()
+            overlap_blocks = self._overlap_blocks(uhr_ids, mp_ids, idf, len(self.vocab)) if HAS_SCIPY else None
+            
+            for i, (u, u_ids) in enumerate(zip(uhr_subset, uhr_ids)):
+                candidates = np.flatnonzero(self._candidate_mask(u, mp_pool))
                 
-                # Build SQL filter for candidates
-                # Initial filter: Date, Sex, and Bounding Box
-                query = """
-                    SELECT file_number, name, age_at_disappearance, last_seen_date, 
-                           description, last_seen_lat, last_seen_lon, sex, race, dna_status, dental_status
-                    FROM missing_persons
-                    WHERE (last_seen_date IS NULL OR last_seen_date <= ?)
-                """
-                params = [u_date_limit]
+                # 6. Geographic Decay, computed for all candidates at once
+                if u["u_lat"] is not None and u["u_lon"] is not None:
+                    distances = haversine_distance_batch(
+                        u["u_lat"], u["u_lon"], mp_pool["lat"][candidates], mp_pool["lon"][candidates]
+                    )
+                else:
+                    distances = np.full(len(candidates), np.nan)
+                geo_scores = calculate_geo_score_batch(distances)
                 
-                if u["u_sex"] and u["u_sex"] not in ('Uncertain', 'Unknown'):
-                    query += " AND (sex IS NULL OR sex IN ('Unknown', 'Uncertain', ?))"
-                    params.append(u["u_sex"])
+                # 7. Phenotypic Matching
+                pheno_scores = self._phenotypic_scores(u["u_race"], mp_pool["race"][candidates])
                 
-                if u["u_lat"] is not None and u["u_lon"] is not None:
-                    query += " AND (last_seen_lat IS NULL OR (last_seen_lat BETWEEN ? AND ? AND last_seen_lon BETWEEN ? AND ?))"
-                    params.extend([u["u_lat"] - 8, u["u_lat"] + 8, u["u_lon"] - 8, u["u_lon"] + 8])
-
-                cursor.execute(query, params)
+                # Skip pairs that cannot reach min_score even with a perfect text
+                # score, no penalty and the best biological multiplier
+                upper = np.minimum(1.0, np.maximum(0.0, (1.0 * 0.4) + (geo_scores * 0.3) + (pheno_scores * 0.3)) * 1.5)
+                reachable = upper >= min_score
+                candidates = candidates[reachable]
+                distances = distances[reachable]
+                geo_scores = geo_scores[reachable]
+                pheno_scores = pheno_scores[reachable]
                 
-                for row in cursor.fetchall():
-                    m_num, m_name, m_age, m_date, m_desc, m_lat, m_lon, m_sex, m_race, m_dna, m_dental = row
-                    
-                    # 4. Age Filter (Hard exclusion)
-                    if u["u_age_min"] and m_age and (m_age < u["u_age_min"] - 10 or (u["u_age_max"] and m_age > u["u_age_max"] + 10)):
-                        continue
-                    
-                    # 5. Keyword Overlap (TF-IDF)
-                    m_words = self._get_words(m_desc) - self.stop_words
-                    text_score, features = self.score_text_overlap(u["u_words"], m_words)
-                    
-                    # 6. Geographic Decay
-                    dist = haversine_distance(u["u_lat"], u["u_lon"], m_lat, m_lon)
-                    geo_score = calculate_geo_score(dist)
-                    
-                    # 7. Phenotypic Matching
-                    pheno_score = self.calculate_phenotypic_score(u["u_race"], m_race)
-                    
-                    # 8. Traits Penalty (Negative Scoring)
-                    traits_penalty = self.calculate_traits_penalty(u, m_age, m_desc)
-                    
-                    # 9. Composite Scoring (Incorporating penalties)
-                    # Weights: Text(40%), Geo(30%), Pheno(30%) minus Traits Penalty
-                    composite_score = (text_score * 0.4) + (geo_score * 0.3) + (pheno_score * 0.3)
-                    composite_score -= traits_penalty
-                    
-                    # 10. Biological Multiplier
-                    multiplier = self.calculate_bio_multiplier(u["u_dna"], u["u_dental"], m_dna, m_dental)
-                    final_score = min(1.0, max(0.0, composite_score * multiplier))
+                # 5. Keyword Overlap (TF-IDF), computed for the remaining candidates at once
+                if overlap_blocks is not None:
+                    if i % UHR_BLOCK_SIZE == 0:
+                        overlap_block = next(overlap_blocks)
+                    overlaps = _sparse_row_values(overlap_block, i % UHR_BLOCK_SIZE, candidates)
+                else:
+                    overlaps = np.array(
+                        [_overlap_score(u_ids, mp_ids[idx], idf) for idx in candidates], dtype=np.float64
+                    )
+                text_scores = np.minimum(1.0, overlaps / 35)
+                
+                # 8. Traits Penalty (Negative Scoring)
+                traits_penalties = self._traits_penalties(u, candidates, mp_pool)
+                
+                # 9. Composite Scoring (Incorporating penalties)
+                # Weights: Text(40%), Geo(30%), Pheno(30%) minus Traits Penalty
+                composite_scores = (text_scores * 0.4) + (geo_scores * 0.3) + (pheno_scores * 0.3)
+                composite_scores -= traits_penalties
+                
+                # 10. Biological Multiplier
+                multipliers = self._bio_multipliers(u["u_dna"], u["u_dental"], candidates, mp_pool)
+                final_scores = np.minimum(1.0, np.maximum(0.0, composite_scores * multipliers))
+                
+                # Lead dicts and shared words are only built for reported pairs
+                passed = np.flatnonzero(final_scores >= min_score)
+                for idx, final_score, dist in zip(
+                    candidates[passed].tolist(), final_scores[passed].tolist(), distances[passed].tolist()
+                ):
+                    m_num, m_name, m_age, m_date, m_desc = mp_rows[idx][:5]
+                    report_features = self.overlap_features(u["u_words"] & mp_words[idx])
+                    if not math.isnan(dist):
+                        report_features.append(f"{int(dist)} miles away")
                     
-                    if final_score >= min_score:
-                        report_features = features.copy()
-                        if dist is not None:
-                            report_features.append(f"{int(dist)} miles away")
-                        
-                        results.append({
-                            "uhr_case": u["u_num"],
-                            "mp_file": m_num,
-                            "mp_name": m_name,
-                            "score": round(final_score, 3),
-                            "shared_features": report_features,
-                            "uhr_desc_preview": u["u_desc"][:200],
-                            "mp_desc_preview": m_desc[:200]
-                        })
+                    results.append({
+                        "uhr_case": u["u_num"],
+                        "mp_file": m_num,
+                        "mp_name": m_name,
+                        "score": round(final_score, 3),
+                        "shared_features": report_features,
+                        "uhr_desc_preview": u["u_desc"][:200],
+                        "mp_desc_preview": m_desc[:200]
+                    })
         finally:
-            conn.close()
+            if owns_conn:
+                conn.close()
             
         return results
+
+
+def _match_chunk_task(
+    db_path: str,
+    uhr_subset: List[Dict[str, Any]],
+    stats: Dict[str, Any],
+    min_score: float
+) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: match one chunk on a fresh CompositeMatcher.
+    
+    Submitting this instead of the bound _match_chunk keeps the parent's
+    DF Counters out of every task's pickle; stats carries all workers need.
+    """
+    return CompositeMatcher(db_path)._match_chunk(uhr_subset, stats, min_score)
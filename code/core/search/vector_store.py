@@ -4,9 +4,22 @@ Vector Store using SQLite with the sqlite-vss extension.
 
 import sqlite3
 import json
-from typing import Any
+from typing import Any, Iterable
 import numpy as np
 
+# Stay well under SQLite's bound-parameter limit in IN (...) lookups
+ROWID_LOOKUP_CHUNK = 500
+
+
+def _vector_blob(embedding: np.ndarray) -> bytes:
+    """
+    Pack an embedding as a raw float32 BLOB.
+    
+    vss0 accepts packed little-endian float32 buffers in place of JSON
+    arrays, which is ~4x smaller and skips JSON parsing on both sides.
+    """
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
 
 class VectorStore:
     """
@@ -15,6 +28,7 @@ class VectorStore:
     Usage:
         store = VectorStore(db_path)
         store.insert("doc1", "description text", embedding)
+        store.insert_many("cases", [("doc2", "other text", embedding, None)])
         results = store.search(query_embedding, limit=10)
     """
     
@@ -112,7 +126,55 @@ class VectorStore:
             
             self.conn.execute(
                 f"INSERT INTO vss_{table_name}(rowid, embedding) VALUES (?, ?)",
-                (rowid, json.dumps(embedding.tolist()))
+                (rowid, _vector_blob(embedding))
+            )
+    
+    def insert_many(
+        self,
+        table_name: str,
+        docs: Iterable[tuple[str, str, np.ndarray, dict[str, Any] | None]]
+    ) -> None:
+        """
+        Insert many documents in a single transaction.
+        
+        Args:
+            table_name: Target logical table.
+            docs: (doc_id, content, embedding, metadata) tuples.
+        """
+        # Later duplicates win, as with repeated insert() calls
+        docs = list({doc[0]: doc for doc in docs}.values())
+        if not docs:
+            return
+        
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO vector_metadata (id, table_name, content, metadata)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (doc_id, table_name, content, json.dumps(metadata or {}))
+                    for doc_id, content, _, metadata in docs
+                ]
+            )
+            
+            # Resolve rowids in chunks instead of one SELECT per document
+            rowids = {}
+            doc_ids = [doc[0] for doc in docs]
+            for start in range(0, len(doc_ids), ROWID_LOOKUP_CHUNK):
+                chunk = doc_ids[start:start + ROWID_LOOKUP_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rowids.update(self.conn.execute(
+                    f"SELECT id, rowid FROM vector_metadata WHERE id IN ({placeholders})",
+                    chunk
+                ))
+            
+            self.conn.executemany(
+                f"INSERT INTO vss_{table_name}(rowid, embedding) VALUES (?, ?)",
+                [
+                    (rowids[doc_id], _vector_blob(embedding))
+                    for doc_id, _, embedding, _ in docs
+                ]
             )
     
     def search(
@@ -135,47 +197,113 @@ class VectorStore:
             List of matching documents with similarity scores.
         """
         # vss_search returns distance (L2 or similar). 
-        # Similarity = 1 / (1 + distance) or similar mapping if needed.
-        # But we'll just return distance as 'score' or similar.
+        # Similarity = 1 / (1 + distance), so similarity >= threshold is
+        # distance <= 1 / threshold - 1 and can be filtered inside SQLite.
+        max_distance = (1.0 / threshold - 1.0) if threshold > 0 else float("inf")
         
-        query_json = json.dumps(query_embedding.tolist())
+        query_blob = _vector_blob(query_embedding)
         
         try:
             cursor = self.conn.execute(
-                f"""
-                SELECT 
-                    m.id, 
-                    m.content, 
-                    m.metadata,
-                    v.distance
-                FROM vss_{table_name} v
-                JOIN vector_metadata m ON v.rowid = m.rowid
-                WHERE vss_search(v.embedding, vss_search_params(?, ?))
-                ORDER BY v.distance ASC
-                """,
-                (query_json, limit)
+                self._search_sql(table_name),
+                (query_blob, limit, max_distance, limit)
             )
             
-            results = []
-            for row in cursor.fetchall():
-                # Convert distance to a pseudo-similarity score [0, 1]
-                # Note: vss0 typically uses L2 distance.
-                distance = row[3]
-                similarity = 1.0 / (1.0 + distance)
-                
-                if similarity >= threshold:
-                    results.append({
-                        "id": row[0],
-                        "content": row[1],
-                        "metadata": json.loads(row[2]),
-                        "similarity": round(similarity, 4)
-                    })
-            
-            return results
+            # Convert distance to a pseudo-similarity score [0, 1]
+            # Note: vss0 typically uses L2 distance.
+            return [
+                {
+                    "id": row[0],
+                    "content": row[1],
+                    "metadata": json.loads(row[2]),
+                    "similarity": round(1.0 / (1.0 + row[3]), 4)
+                }
+                for row in cursor
+            ]
         except sqlite3.OperationalError as e:
             print(f"Search failed: {e}")
             return []
     
+    def search_batch(
+        self,
+        table_name: str,
+        query_embeddings: np.ndarray,
+        limit: int = 10,
+        threshold: float = 0.0
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search for similar documents for many queries at once.
+        
+        All queries run inside one read transaction against the same cached
+        statement, and distances are converted to similarities in one
+        vectorized step.
+        
+        Args:
+            table_name: Table to search.
+            query_embeddings: Query matrix (n_queries x dimension).
+            limit: Maximum results per query.
+            threshold: Minimum similarity score (converted to distance).
+            
+        Returns:
+            One list of matching documents per query, in query order.
+        """
+        max_distance = (1.0 / threshold - 1.0) if threshold > 0 else float("inf")
+        sql = self._search_sql(table_name)
+        
+        queries = np.atleast_2d(query_embeddings)
+        
+        # One read transaction: a consistent snapshot and a single lock
+        # acquisition for every query
+        owns_transaction = not self.conn.in_transaction
+        try:
+            if owns_transaction:
+                self.conn.execute("BEGIN")
+            rows_per_query = [
+                self.conn.execute(sql, (_vector_blob(query), limit, max_distance, limit)).fetchall()
+                for query in queries
+            ]
+        except sqlite3.OperationalError as e:
+            print(f"Search failed: {e}")
+            return [[] for _ in queries]
+        finally:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.execute("COMMIT")
+        
+        distances = np.array([row[3] for rows in rows_per_query for row in rows], dtype=np.float64)
+        similarities = [round(s, 4) for s in (1.0 / (1.0 + distances)).tolist()]
+        
+        results = []
+        position = 0
+        for rows in rows_per_query:
+            results.append([
+                {
+                    "id": row[0],
+                    "content": row[1],
+                    "metadata": json.loads(row[2]),
+                    "similarity": similarity
+                }
+                for row, similarity in zip(rows, similarities[position:position + len(rows)])
+            ])
+            position += len(rows)
+        return results
+    
+    @staticmethod
+    def _search_sql(table_name: str) -> str:
+        """KNN query over vss_<table_name>, filtered by a maximum distance."""
+        return f"""
+            SELECT 
+                m.id, 
+                m.content, 
+                m.metadata,
+                v.distance
+            FROM vss_{table_name} v
+            JOIN vector_metadata m ON v.rowid = m.rowid
+            WHERE vss_search(v.embedding, vss_search_params(?, ?))
+              AND v.distance <= ?
+            ORDER BY v.distance ASC
+            LIMIT ?
+        """
+    
     def close(self) -> None:
         """Close database connection."""
         self.conn.close()
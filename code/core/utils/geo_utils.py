@@ -1,5 +1,10 @@
 import math
 
+import numpy as np
+
+# Radius of Earth in miles
+EARTH_RADIUS_MILES = 3958.8
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the great-circle distance between two points on the Earth 
@@ -10,8 +15,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     if None in (lat1, lon1, lat2, lon2):
         return None
 
-    # Radius of Earth in miles
-    R = 3958.8
+    R = EARTH_RADIUS_MILES
     
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
@@ -24,6 +28,63 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     
     return R * c
 
+def haversine_distance_batch(
+    lat1: float,
+    lon1: float,
+    lat2: np.ndarray,
+    lon2: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized haversine_distance from one point to arrays of points.
+    
+    Returns distances in miles; NaN where coordinates are missing.
+    """
+    lat2 = np.asarray(lat2, dtype=np.float64)
+    lon2 = np.asarray(lon2, dtype=np.float64)
+    
+    phi1 = math.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = np.radians(lat2 - lat1)
+    dlambda = np.radians(lon2 - lon1)
+    
+    a = np.sin(dphi / 2) ** 2 + \
+        math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return EARTH_RADIUS_MILES * c
+
+def bounding_box(lat: float, lon: float, distance_miles: float) -> tuple[float, float, float, float]:
+    """
+    Return (lat_min, lat_max, lon_min, lon_max) enclosing every point within
+    distance_miles of (lat, lon), for cheap SQL prefiltering before an exact
+    haversine check. Longitude is left unbounded near the poles.
+    
+    Near the antimeridian lon_min/lon_max can fall outside [-180, 180];
+    pass them through longitude_ranges() to get the wrapped SQL ranges.
+    """
+    dlat = math.degrees(distance_miles / EARTH_RADIUS_MILES)
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6 or abs(lat) + dlat >= 90:
+        return lat - dlat, lat + dlat, -180.0, 180.0
+    dlon = dlat / cos_lat
+    if dlon >= 180:
+        return lat - dlat, lat + dlat, -180.0, 180.0
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+def longitude_ranges(lon_min: float, lon_max: float) -> list[tuple[float, float]]:
+    """
+    Split a bounding_box longitude span into ranges inside [-180, 180].
+    
+    A span crossing the antimeridian becomes two ranges, e.g. (179, 181)
+    -> [(179, 180), (-180, -179)]; otherwise the span is returned as is.
+    """
+    if lon_min < -180:
+        return [(lon_min + 360, 180.0), (-180.0, lon_max)]
+    if lon_max > 180:
+        return [(lon_min, 180.0), (-180.0, lon_max - 360)]
+    return [(lon_min, lon_max)]
+
 def calculate_geo_score(distance_miles: float) -> float:
     """
     Calculate a geographic score (0.0 to 1.0) using exponential decay.
@@ -38,3 +99,11 @@ def calculate_geo_score(distance_miles: float) -> float:
     # k = 500 means at 500 miles, the score is ~0.36
     k = 300 
     return math.exp(-distance_miles / k)
+
+def calculate_geo_score_batch(distances_miles: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_geo_score; NaN distances get the neutral 0.5.
+    """
+    distances_miles = np.asarray(distances_miles, dtype=np.float64)
+    k = 300
+    return np.where(np.isnan(distances_miles), 0.5, np.exp(-distances_miles / k))
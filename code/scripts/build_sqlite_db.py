@@ -1,9 +1,16 @@
 
-import json
 import sqlite3
 import os
 from pathlib import Path
 
+import orjson
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 # Paths relative to project root
 DB_PATH = Path("data/filament.db")
 UHR_FILE = Path("data/raw/namus_unidentified.json")
@@ -13,10 +20,17 @@ def init_db(conn):
     """Initialize the SQLite database with the required schema."""
     cursor = conn.cursor()
     
+    # Bulk-load friendly settings: WAL journal, no fsync per statement
+    cursor.execute("PRAGMA journal_mode=WAL;")
+    cursor.execute("PRAGMA synchronous=NORMAL;")
+    cursor.execute("PRAGMA temp_store=MEMORY;")
+    
     # Enable JSON support (built-in for modern SQLite)
     
     # Drop existing tables to ensure clean schema with new columns
     print("Dropping existing tables for clean rebuild")
+    cursor.execute("DROP TABLE IF EXISTS uhr_fts;")
+    cursor.execute("DROP TABLE IF EXISTS mp_fts;")
     cursor.execute("DROP TABLE IF EXISTS unidentified_cases;")
     cursor.execute("DROP TABLE IF EXISTS missing_persons;")
     
@@ -70,55 +84,115 @@ def init_db(conn):
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_mp_date_sex ON missing_persons(last_seen_date, sex);")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_mp_geo ON missing_persons(last_seen_lat, last_seen_lon);")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_uhr_geo ON unidentified_cases(discovery_lat, discovery_lon);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_mp_sex ON missing_persons(sex);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_uhr_sex ON unidentified_cases(estimated_sex);")
+    
+    # External-content full-text indexes over description (filled by rebuild_fts).
+    # Trigram tokens make MATCH a case-insensitive substring search, the same
+    # semantics as the LIKE / scan fallbacks in eda_leads.py.
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS uhr_fts USING fts5(
+        description, content='unidentified_cases', content_rowid='rowid', tokenize='trigram'
+    );
+    """)
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS mp_fts USING fts5(
+        description, content='missing_persons', content_rowid='rowid', tokenize='trigram'
+    );
+    """)
     
     conn.commit()
     print(f"Initialized SQLite database at {DB_PATH}")
 
-def get_text_description(obj, c_type='uhr'):
-    """Simplified text description for SQLite (matches the original logic)."""
-    parts = []
+def rebuild_fts(conn, fts_table, table):
+    """
+    Re-index an external-content FTS5 table from its base table, then keep it in sync.
     
-    # Sex, Race, Age
-    subject_desc = obj.get('subjectDescription', {})
-    sex = subject_desc.get('sex', {}).get('name')
-    race = subject_desc.get('primaryEthnicity', {}).get('name')
-    if not race and 'ethnicities' in subject_desc:
-        eths = subject_desc['ethnicities']
+    The bulk load runs without triggers and re-indexes once; the triggers
+    installed afterwards keep the index current for any later writer.
+    INSERT OR REPLACE only fires the delete trigger with
+    PRAGMA recursive_triggers=ON, so such writers must enable it.
+    """
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')")
+    conn.executescript(f"""
+    CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts_table}(rowid, description) VALUES (new.rowid, new.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts_table}({fts_table}, rowid, description) VALUES ('delete', old.rowid, old.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF description ON {table} BEGIN
+        INSERT INTO {fts_table}({fts_table}, rowid, description) VALUES ('delete', old.rowid, old.description);
+        INSERT INTO {fts_table}(rowid, description) VALUES (new.rowid, new.description);
+    END;
+    """)
+    conn.commit()
+
+def iter_cases(path):
+    """Yield cases from a NamUs JSON array, streamed with ijson when installed."""
+    with open(path, 'rb') as f:
+        if HAS_IJSON:
+            # use_float keeps numbers as float (not Decimal) so orjson can encode them
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from orjson.loads(f.read())
+
+def extract_demographics(obj):
+    """Return (sex, race, age_min, age_max) from a case's subjectDescription."""
+    subject_desc = obj.get('subjectDescription') or {}
+    sex = (subject_desc.get('sex') or {}).get('name')
+    race = (subject_desc.get('primaryEthnicity') or {}).get('name')
+    if not race:
+        eths = subject_desc.get('ethnicities')
         if eths: race = eths[0].get('name')
-        
-    age = ""
+    return sex, race, subject_desc.get('estimatedAgeFrom'), subject_desc.get('estimatedAgeTo')
+
+def json_text(path):
+    """SQL for a raw_data field, NULL when missing or empty (Python-falsy)."""
+    return f"nullif(nullif(json_extract(raw_data, '{path}'), ''), 0)"
+
+def json_list(path, sep):
+    """SQL joining the truthy 'description' of each element of a raw_data array."""
+    return f"""(SELECT group_concat(d, '{sep}') FROM (
+        SELECT json_extract(value, '$.description') AS d
+        FROM json_each(raw_data, '{path}')
+        WHERE nullif(d, '') IS NOT NULL
+        ORDER BY key))"""
+
+def description_sql(c_type='uhr'):
+    """
+    SQL expression building the description column from raw_data.
+    
+    Same text as the per-case Python builder it replaces: a
+    "sex race age" header, then Features / Tattoos (MP) / Clothing /
+    Circumstances lines when present, joined with newlines.
+    """
+    sex = json_text('$.subjectDescription.sex.name')
+    race = f"""coalesce({json_text('$.subjectDescription.primaryEthnicity.name')},
+                        {json_text('$.subjectDescription.ethnicities[0].name')})"""
     if c_type == 'uhr':
-         min_age = subject_desc.get('estimatedAgeFrom')
-         max_age = subject_desc.get('estimatedAgeTo')
-         if min_age: age = f"{min_age} to {max_age} years old"
+        min_age = json_text('$.subjectDescription.estimatedAgeFrom')
+        max_age = "coalesce(json_extract(raw_data, '$.subjectDescription.estimatedAgeTo'), 'None')"
+        age = f"coalesce({min_age} || ' to ' || {max_age} || ' years old', '')"
+        circ = json_text('$.circumstances.circumstancesOfRecovery')
     else:
-         age_val = obj.get('subjectIdentification', {}).get('computedMissingMinAge')
-         if age_val: age = f"{age_val} years old"
-            
-    header = f"{sex or 'Unknown'} {race or 'Unknown'} {age}".strip()
-    if header: parts.append(header)
+        age_val = json_text('$.subjectIdentification.computedMissingMinAge')
+        age = f"coalesce({age_val} || ' years old', '')"
+        circ = json_text('$.circumstances.circumstancesOfDisappearance')
     
-    # Features
-    feats = [f.get('description') for f in obj.get('physicalFeatureDescriptions', []) if f.get('description')]
-    if feats:
-        parts.append("Features: " + "; ".join(feats))
-        
+    lines = [f"char(10) || 'Features: ' || {json_list('$.physicalFeatureDescriptions', '; ')}"]
     if c_type == 'mp':
-        tattoos = obj.get('tattoosDescription')
-        if tattoos: parts.append(f"Tattoos: {tattoos}")
+        lines.append(f"char(10) || 'Tattoos: ' || {json_text('$.tattoosDescription')}")
+    lines.append(f"char(10) || 'Clothing: ' || {json_list('$.clothingAndAccessoriesArticles', '; ')}")
+    lines.append(f"char(10) || 'Circumstances: ' || {circ}")
+    
+    header = f"trim(coalesce({sex}, 'Unknown') || ' ' || coalesce({race}, 'Unknown') || ' ' || {age})"
+    return " || ".join([header] + [f"coalesce({line}, '')" for line in lines])
 
-    # Clothing
-    clothes = [c.get('description') for c in obj.get('clothingAndAccessoriesArticles', []) if c.get('description')]
-    if clothes:
-        parts.append("Clothing: " + "; ".join(clothes))
-        
-    # Circumstances
-    circ_obj = obj.get('circumstances', {})
-    circ = circ_obj.get('circumstancesOfRecovery' if c_type == 'uhr' else 'circumstancesOfDisappearance')
-    if circ:
-        parts.append(f"Circumstances: {circ}")
-        
-    return "\n".join(parts)
+def fill_descriptions(conn, table, c_type):
+    """Compute every row's description from raw_data in one UPDATE."""
+    conn.execute(f"UPDATE {table} SET description = {description_sql(c_type)}")
+    conn.commit()
 
 def load_uhr(conn):
     if not UHR_FILE.exists():
@@ -126,65 +200,61 @@ def load_uhr(conn):
         return
 
     print(f"Loading Unidentified Cases from {UHR_FILE}")
-    with open(UHR_FILE) as f:
-        data = json.load(f)
+    # Cases are parsed one at a time while executemany consumes rows()
+    data = iter_cases(UHR_FILE)
         
-    cursor = conn.cursor()
     count = 0
-    for case in data:
-        case_num = case.get('idFormatted')
-        if not case_num: continue
-        
-        desc = get_text_description(case, 'uhr')
-        circ = case.get('circumstances', {})
-        discovery_date = circ.get('dateFound')
-        
-        geo = circ.get('publicGeolocation', {}).get('coordinates', {})
-        lat = geo.get('lat')
-        lon = geo.get('lon')
-        
-        # UUID generation or use NamUs ID as primary key? 
-        # For simplicity, using idFormatted as unique key and a simple hash/id for PK.
-        internal_id = str(case.get('id')) 
-
-        subject_desc = case.get('subjectDescription', {})
-        sex = subject_desc.get('sex', {}).get('name')
-        race = subject_desc.get('primaryEthnicity', {}).get('name')
-        if not race and 'ethnicities' in subject_desc:
-            eths = subject_desc['ethnicities']
-            if eths: race = eths[0].get('name')
+    
+    def rows():
+        nonlocal count
+        for case in data:
+            case_num = case.get('idFormatted')
+            if not case_num: continue
             
-        age_min = subject_desc.get('estimatedAgeFrom')
-        age_max = subject_desc.get('estimatedAgeTo')
-        
-        evidence = case.get('evidence', {})
-        dna_status = evidence.get('dna')
-        dental_status = evidence.get('dental')
+            sex, race, age_min, age_max = extract_demographics(case)
+            circ = case.get('circumstances', {})
+            discovery_date = circ.get('dateFound')
+            
+            geo = circ.get('publicGeolocation', {}).get('coordinates', {})
+            lat = geo.get('lat')
+            lon = geo.get('lon')
+            
+            # UUID generation or use NamUs ID as primary key? 
+            # For simplicity, using idFormatted as unique key and a simple hash/id for PK.
+            internal_id = str(case.get('id')) 
+            
+            evidence = case.get('evidence', {})
+            dna_status = evidence.get('dna')
+            dental_status = evidence.get('dental')
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO unidentified_cases 
-            (id, case_number, source, discovery_date, description, discovery_lat, discovery_lon, 
-             estimated_age_min, estimated_age_max, estimated_sex, race, dna_status, dental_status, raw_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            internal_id,
-            case_num,
-            'NamUs',
-            discovery_date,
-            desc,
-            lat,
-            lon,
-            age_min,
-            age_max,
-            sex,
-            race,
-            dna_status,
-            dental_status,
-            json.dumps(case)
-        ))
-        count += 1
+            count += 1
+            yield (
+                internal_id,
+                case_num,
+                'NamUs',
+                discovery_date,
+                lat,
+                lon,
+                age_min,
+                age_max,
+                sex,
+                race,
+                dna_status,
+                dental_status,
+                orjson.dumps(case).decode()
+            )
     
+    # One transaction for the whole file instead of a journal write per row
+    conn.execute("BEGIN")
+    conn.executemany("""
+        INSERT OR REPLACE INTO unidentified_cases 
+        (id, case_number, source, discovery_date, discovery_lat, discovery_lon, 
+         estimated_age_min, estimated_age_max, estimated_sex, race, dna_status, dental_status, raw_data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows())
     conn.commit()
+    fill_descriptions(conn, 'unidentified_cases', 'uhr')
+    rebuild_fts(conn, 'uhr_fts', 'unidentified_cases')
     print(f"Loaded {count} unidentified cases.")
 
 def load_mp(conn):
@@ -193,65 +263,64 @@ def load_mp(conn):
         return
 
     print(f"Loading Missing Persons from {MP_FILE}")
-    with open(MP_FILE) as f:
-        data = json.load(f)
+    # Cases are parsed one at a time while executemany consumes rows()
+    data = iter_cases(MP_FILE)
         
-    cursor = conn.cursor()
     count = 0
-    for case in data:
-        case_num = case.get('idFormatted')
-        if not case_num: continue
-        
-        desc = get_text_description(case, 'mp')
-        sighting = case.get('sighting', {})
-        last_seen_date = sighting.get('date')
-        
-        geo = sighting.get('publicGeolocation', {}).get('coordinates', {})
-        lat = geo.get('lat')
-        lon = geo.get('lon')
-        
-        ident = case.get('subjectIdentification', {})
-        name = f"{ident.get('firstName', '')} {ident.get('lastName', '')}".strip()
-        
-        internal_id = str(case.get('id'))
-
-        subject_desc = case.get('subjectDescription', {})
-        sex = subject_desc.get('sex', {}).get('name')
-        race = subject_desc.get('primaryEthnicity', {}).get('name')
-        if not race and 'ethnicities' in subject_desc:
-            eths = subject_desc['ethnicities']
-            if eths: race = eths[0].get('name')
+    
+    def rows():
+        nonlocal count
+        for case in data:
+            case_num = case.get('idFormatted')
+            if not case_num: continue
+            
+            sex, race, _, _ = extract_demographics(case)
+            sighting = case.get('sighting', {})
+            last_seen_date = sighting.get('date')
+            
+            geo = sighting.get('publicGeolocation', {}).get('coordinates', {})
+            lat = geo.get('lat')
+            lon = geo.get('lon')
+            
+            ident = case.get('subjectIdentification', {})
+            name = f"{ident.get('firstName', '')} {ident.get('lastName', '')}".strip()
+            
+            internal_id = str(case.get('id'))
 
-        age = ident.get('computedMissingMinAge')
-        
-        evidence = case.get('evidence', {})
-        dna_status = evidence.get('dna')
-        dental_status = evidence.get('dental')
+            age = ident.get('computedMissingMinAge')
+            
+            evidence = case.get('evidence', {})
+            dna_status = evidence.get('dna')
+            dental_status = evidence.get('dental')
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO missing_persons 
-            (id, file_number, source, name, last_seen_date, description, last_seen_lat, last_seen_lon, 
-             sex, race, dna_status, dental_status, age_at_disappearance, raw_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            internal_id,
-            case_num,
-            'NamUs',
-            name,
-            last_seen_date,
-            desc,
-            lat,
-            lon,
-            sex,
-            race,
-            dna_status,
-            dental_status,
-            age,
-            json.dumps(case)
-        ))
-        count += 1
-        
+            count += 1
+            yield (
+                internal_id,
+                case_num,
+                'NamUs',
+                name,
+                last_seen_date,
+                lat,
+                lon,
+                sex,
+                race,
+                dna_status,
+                dental_status,
+                age,
+                orjson.dumps(case).decode()
+            )
+    
+    # One transaction for the whole file instead of a journal write per row
+    conn.execute("BEGIN")
+    conn.executemany("""
+        INSERT OR REPLACE INTO missing_persons 
+        (id, file_number, source, name, last_seen_date, last_seen_lat, last_seen_lon, 
+         sex, race, dna_status, dental_status, age_at_disappearance, raw_data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows())
     conn.commit()
+    fill_descriptions(conn, 'missing_persons', 'mp')
+    rebuild_fts(conn, 'mp_fts', 'missing_persons')
     print(f"Loaded {count} missing persons.")
 
 def main():
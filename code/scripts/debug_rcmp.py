@@ -1,19 +1,32 @@
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+import asyncio
+import sys
 
-options = Options()
-options.add_argument("--headless")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-driver = webdriver.Chrome(options=options)
+import httpx
 
-url = "https://www.services.rcmp-grc.gc.ca/missing-disparus/case-dossier.jsf?case=2014006179&lang=en"
-print(f"Fetching {url}")
-driver.get(url)
+# Case pages are server-rendered JSF, so a plain GET returns the full HTML
+CASE_URL = "https://www.services.rcmp-grc.gc.ca/missing-disparus/case-dossier.jsf?case={}&lang=en"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 
-with open("data/raw/debug_case.html", "w") as f:
-    f.write(driver.page_source)
+async def fetch_all(case_ids):
+    """Fetch all case pages concurrently on one client."""
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30, follow_redirects=True) as client:
+        return await asyncio.gather(*[client.get(CASE_URL.format(cid)) for cid in case_ids])
 
-print("Dumped HTML to debug_case.html")
-driver.quit()
+def main():
+    case_ids = sys.argv[1:] or ["2014006179"]
+    for cid in case_ids:
+        print(f"Fetching {CASE_URL.format(cid)}")
+
+    responses = asyncio.run(fetch_all(case_ids))
+
+    for cid, resp in zip(case_ids, responses):
+        path = f"data/raw/debug_case_{cid}.html"
+        with open(path, "w") as f:
+            f.write(resp.text)
+        print(f"Dumped HTML ({resp.status_code}) to {path}")
+
+if __name__ == "__main__":
+    main()
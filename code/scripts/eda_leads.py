@@ -6,87 +6,213 @@ import os
 from collections import Counter
 from datetime import datetime
 
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
 DB_PATH = "data/filament.db"
 REPORT_PATH = "data/reports/significant_leads.md"
 
+LEAD_KEYWORDS = ['tattoo', 'scar', 'glasses', 'denture', 'prosthetic']
+
+# Base table -> date column summarized by summarize_table
+DATE_COLUMNS = {
+    "unidentified_cases": "discovery_date",
+    "missing_persons": "last_seen_date",
+}
+
+# Base table -> FTS5 trigram index built by build_sqlite_db.py. Keyword
+# matching is a case-insensitive substring test on every path ('scar' also
+# matches 'oscar'), whether or not the database has these indexes.
+FTS_TABLES = {
+    "unidentified_cases": "uhr_fts",
+    "missing_persons": "mp_fts",
+}
+
 def get_connection():
     return sqlite3.connect(DB_PATH)
 
+def trigram_index(conn, table, keywords):
+    """
+    Name of the table's trigram FTS5 index if it can answer these keywords, else None.
+    
+    Only a trigram index gives the same substring semantics as the LIKE /
+    scan fallbacks, and trigrams need keywords of at least 3 characters.
+    Indexes from older builds (word tokenizer) are ignored.
+    """
+    fts_table = FTS_TABLES[table]
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (fts_table,)).fetchone()
+    if row is None or 'trigram' not in row[0]:
+        return None
+    if any(len(kw) < 3 for kw in keywords):
+        return None
+    return fts_table
+
+def fts_phrase(keyword):
+    """Quote a keyword as one FTS5 phrase (a substring query on a trigram index)."""
+    return '"' + keyword.replace('"', '""') + '"'
+
+def count_keyword_mentions(conn, table, keywords):
+    """
+    Count descriptions containing each keyword, in one query per table.
+    
+    Uses the trigram FTS5 index when the database has one, otherwise falls
+    back to a single substring pass over the descriptions (see
+    scan_keyword_mentions). Both count case-insensitive substrings.
+    """
+    fts_table = trigram_index(conn, table, keywords)
+    if fts_table is None:
+        return scan_keyword_mentions(conn, table, keywords)
+    
+    values = ", ".join("(?, ?)" for _ in keywords)
+    query = f"""
+        WITH kw(word, phrase) AS (VALUES {values})
+        SELECT word, (SELECT count(*) FROM {fts_table}
+                      WHERE {fts_table} MATCH phrase)
+        FROM kw
+    """
+    params = [value for kw in keywords for value in (kw, fts_phrase(kw))]
+    return dict(conn.execute(query, params))
+
+def scan_keyword_mentions(conn, table, keywords):
+    """
+    Case-insensitive substring counts for all keywords in one table scan.
+    
+    With hyperscan installed the keywords are compiled into one database and
+    each description is scanned once for all of them; otherwise each row is
+    lowered once and checked with `in`.
+    """
+    counts = Counter({kw: 0 for kw in keywords})
+    rows = conn.execute(f"SELECT description FROM {table} WHERE description IS NOT NULL")
+    
+    if HAS_HYPERSCAN:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(kw).encode() for kw in keywords],
+            ids=list(range(len(keywords))),
+            elements=len(keywords),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(keywords),
+        )
+        
+        def on_match(kw_id, start, end, flags, context):
+            counts[keywords[kw_id]] += 1
+        
+        for (desc,) in rows:
+            db.scan(desc.encode(), match_event_handler=on_match)
+    else:
+        lowered = [kw.lower() for kw in keywords]
+        for (desc,) in rows:
+            desc = desc.lower()
+            for kw, low in zip(keywords, lowered):
+                if low in desc:
+                    counts[kw] += 1
+    return dict(counts)
+
+def keyword_sample_rows(conn, table, columns, sex_column, sex, keyword, limit):
+    """
+    Cursor over the first `limit` rows of one sex whose description mentions keyword.
+    
+    With the trigram FTS5 index the keyword is resolved to rowids first and
+    joined back to the base table by rowid (CROSS JOIN pins that order; left to
+    itself the planner drives from the sex index and re-runs MATCH per row).
+    Otherwise a LIKE scan is used. Both match case-insensitive substrings and
+    return rows in rowid order.
+    """
+    select = ", ".join(f"t.{col}" for col in columns)
+    fts_table = trigram_index(conn, table, [keyword])
+    if fts_table is not None:
+        query = f"""
+            SELECT {select}
+            FROM {fts_table} f
+            CROSS JOIN {table} t ON t.rowid = f.rowid
+            WHERE {fts_table} MATCH ? AND t.{sex_column} = ?
+            ORDER BY f.rowid
+            LIMIT ?
+        """
+        return conn.execute(query, (fts_phrase(keyword), sex, limit))
+    
+    query = f"""
+        SELECT {select}
+        FROM {table} t
+        WHERE t.description LIKE ? AND t.{sex_column} = ?
+        ORDER BY t.rowid
+        LIMIT ?
+    """
+    return conn.execute(query, (f"%{keyword}%", sex, limit))
+
+def summarize_table(conn, table):
+    """(count, min date, max date) for a base table in one scan."""
+    date_column = DATE_COLUMNS[table]
+    return conn.execute(
+        f"SELECT count(*), min({date_column}), max({date_column}) FROM {table}"
+    ).fetchone()
+
 def analyze_summary_stats(conn):
+    """Print per-table counts and date ranges; returns {table: summary row}."""
     print("=" * 80)
     print("SUMMARY STATISTICS")
     print("=" * 80)
     
-    cursor = conn.cursor()
+    summary = {table: summarize_table(conn, table) for table in DATE_COLUMNS}
     
     # UHR Summary
-    cursor.execute("SELECT count(*), min(discovery_date), max(discovery_date) FROM unidentified_cases")
-    uhr_count, uhr_min_date, uhr_max_date = cursor.fetchone()
+    uhr_count, uhr_min_date, uhr_max_date = summary["unidentified_cases"]
     print(f"Unidentified Human Remains (UHR): {uhr_count:,} cases")
     print(f"  Date Range: {uhr_min_date} to {uhr_max_date}")
     
     # MP Summary
-    cursor.execute("SELECT count(*), min(last_seen_date), max(last_seen_date) FROM missing_persons")
-    mp_count, mp_min_date, mp_max_date = cursor.fetchone()
+    mp_count, mp_min_date, mp_max_date = summary["missing_persons"]
     print(f"Missing Persons (MP): {mp_count:,} cases")
     print(f"  Date Range: {mp_min_date} to {mp_max_date}")
     print()
+    return summary
+
+def top_years(conn, table, limit=10):
+    """Cursor over (year, count) for the busiest years of a table's date column."""
+    date_column = DATE_COLUMNS[table]
+    return conn.execute(f"""
+        SELECT substr({date_column}, 1, 4) as year, count(*) 
+        FROM {table} 
+        WHERE {date_column} IS NOT NULL 
+        GROUP BY year 
+        ORDER BY count(*) DESC 
+        LIMIT ?
+    """, (limit,))
 
 def analyze_temporal_trends(conn):
     print("=" * 80)
     print("TEMPORAL TRENDS (Top Years)")
     print("=" * 80)
     
-    cursor = conn.cursor()
-    
     # UHR Top Years
-    cursor.execute("""
-        SELECT substr(discovery_date, 1, 4) as year, count(*) 
-        FROM unidentified_cases 
-        WHERE discovery_date IS NOT NULL 
-        GROUP BY year 
-        ORDER BY count(*) DESC 
-        LIMIT 10
-    """)
     print("UHR - Top Years Found:")
-    for year, count in cursor.fetchall():
+    for year, count in top_years(conn, "unidentified_cases"):
         print(f"  {year}: {count}")
     
     # MP Top Years
-    cursor.execute("""
-        SELECT substr(last_seen_date, 1, 4) as year, count(*) 
-        FROM missing_persons 
-        WHERE last_seen_date IS NOT NULL 
-        GROUP BY year 
-        ORDER BY count(*) DESC 
-        LIMIT 10
-    """)
     print("\nMP - Top Years Last Seen:")
-    for year, count in cursor.fetchall():
+    for year, count in top_years(conn, "missing_persons"):
         print(f"  {year}: {count}")
     print()
 
 def analyze_keyword_leads(conn, keywords):
+    """Print UHR/MP mention counts per keyword; returns {table: {keyword: count}}."""
     print("=" * 80)
     print(f"KEYWORD OVERLAP: {', '.join(keywords)}")
     print("=" * 80)
     
-    cursor = conn.cursor()
+    uhr_counts = count_keyword_mentions(conn, "unidentified_cases", keywords)
+    mp_counts = count_keyword_mentions(conn, "missing_persons", keywords)
     
     for kw in keywords:
-        # Search UHR
-        cursor.execute("SELECT count(*) FROM unidentified_cases WHERE description LIKE ?", (f'%{kw}%',))
-        uhr_mentions = cursor.fetchone()[0]
-        
-        # Search MP
-        cursor.execute("SELECT count(*) FROM missing_persons WHERE description LIKE ?", (f'%{kw}%',))
-        mp_mentions = cursor.fetchone()[0]
-        
         print(f"'{kw}':")
-        print(f"  UHR Mentions: {uhr_mentions}")
-        print(f"  MP Mentions:  {mp_mentions}")
+        print(f"  UHR Mentions: {uhr_counts[kw]}")
+        print(f"  MP Mentions:  {mp_counts[kw]}")
         print(f"  Lead potential: High if both datasets have specific details.")
     print()
+    return {"unidentified_cases": uhr_counts, "missing_persons": mp_counts}
 
 def analyze_candidate_overlaps(conn):
     """Simple filter for cases with distinct tags like tattoos and specific demographics."""
@@ -94,30 +220,20 @@ def analyze_candidate_overlaps(conn):
     print("POTENTIAL CANDIDATE PAIRS (Demographic + Keyword Filter)")
     print("=" * 80)
     
-    cursor = conn.cursor()
-    
     # Example: Females with tattoos in both datasets
     # This is demo-level filtering, real RAG would use embeddings
     
-    uhr_query = """
-        SELECT case_number, estimated_sex, estimated_age_min, estimated_age_max, description 
-        FROM unidentified_cases 
-        WHERE description LIKE '%tattoo%' AND estimated_sex = 'Female'
-        LIMIT 5
-    """
+    uhr_leads = keyword_sample_rows(
+        conn, "unidentified_cases",
+        ["case_number", "estimated_sex", "estimated_age_min", "estimated_age_max", "description"],
+        "estimated_sex", "Female", "tattoo", 5,
+    )
     
-    mp_query = """
-        SELECT file_number, name, sex, age_at_disappearance, description 
-        FROM missing_persons 
-        WHERE description LIKE '%tattoo%' AND sex = 'Female'
-        LIMIT 5
-    """
-    
-    cursor.execute(uhr_query)
-    uhr_leads = cursor.fetchall()
-    
-    cursor.execute(mp_query)
-    mp_leads = cursor.fetchall()
+    mp_leads = keyword_sample_rows(
+        conn, "missing_persons",
+        ["file_number", "name", "sex", "age_at_disappearance", "description"],
+        "sex", "Female", "tattoo", 5,
+    )
     
     print("Sample UHR Females with Tattoos:")
     for l in uhr_leads:
@@ -128,27 +244,38 @@ def analyze_candidate_overlaps(conn):
         print(f"  {l[0]}: {l[1]}, Age {l[3]}, Desc: {l[4][:100]}")
     print()
 
-def generate_markdown_report(conn):
+def generate_markdown_report(conn, summary=None, keyword_counts=None):
+    """
+    Write the markdown report.
+    
+    `summary` and `keyword_counts` are the results of analyze_summary_stats and
+    analyze_keyword_leads(LEAD_KEYWORDS); passing them in skips re-querying the
+    same tables. Whatever is missing is computed here.
+    """
     print(f"Generating Markdown report at {REPORT_PATH}")
     
+    if summary is None:
+        summary = {table: summarize_table(conn, table) for table in DATE_COLUMNS}
+    if keyword_counts is None:
+        keyword_counts = {
+            table: count_keyword_mentions(conn, table, LEAD_KEYWORDS)
+            for table in FTS_TABLES
+        }
+    
     # Load advanced leads if available
     advanced_leads = []
     if os.path.exists("data/processed/leads_advanced.json"):
         with open("data/processed/leads_advanced.json", "r") as f:
             advanced_leads = json.load(f)
     
-    cursor = conn.cursor()
-    
     with open(REPORT_PATH, 'w') as f:
         f.write("# Significant Leads Report\n\n")
         f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         
         # Summary Stats
         f.write("## Summary Statistics\n")
-        cursor.execute("SELECT count(*) FROM unidentified_cases")
-        uhr_count = cursor.fetchone()[0]
-        cursor.execute("SELECT count(*) FROM missing_persons")
-        mp_count = cursor.fetchone()[0]
+        uhr_count = summary["unidentified_cases"][0]
+        mp_count = summary["missing_persons"][0]
         f.write(f"- **Unidentified Human Remains (UHR)**: {uhr_count:,} cases\n")
         f.write(f"- **Missing Persons (MP)**: {mp_count:,} cases\n\n")
         
@@ -183,52 +310,48 @@ def generate_markdown_report(conn):
         f.write("| Case Number | Sex | Age Range | Description snippet |\n")
         f.write("|-------------|-----|-----------|---------------------|\n")
         
-        uhr_query = """
-            SELECT case_number, estimated_sex, estimated_age_min, estimated_age_max, description 
-            FROM unidentified_cases 
-            WHERE description LIKE '%tattoo%' AND estimated_sex = 'Female'
-            LIMIT 10
-        """
-        cursor.execute(uhr_query)
-        for row in cursor.fetchall():
-            desc = row[4][:100].replace('\n', ' ') + ""
-            f.write(f"| {row[0]} | {row[1]} | {row[2]}-{row[3]} | {desc} |\n")
+        uhr_rows = keyword_sample_rows(
+            conn, "unidentified_cases",
+            ["case_number", "estimated_sex", "estimated_age_min", "estimated_age_max", "description"],
+            "estimated_sex", "Female", "tattoo", 10,
+        )
+        # Rows are formatted and written as the cursor yields them
+        f.writelines(
+            f"| {row[0]} | {row[1]} | {row[2]}-{row[3]} | {row[4][:100].replace(chr(10), ' ')} |\n"
+            for row in uhr_rows
+        )
         
         f.write("\n### Sample MP Females with Tattoos\n\n")
         f.write("| File Number | Name | Age | Description snippet |\n")
         f.write("|-------------|------|-----|---------------------|\n")
         
-        mp_query = """
-            SELECT file_number, name, age_at_disappearance, description 
-            FROM missing_persons 
-            WHERE description LIKE '%tattoo%' AND sex = 'Female'
-            LIMIT 10
-        """
-        cursor.execute(mp_query)
-        for row in cursor.fetchall():
-            desc = row[3][:100].replace('\n', ' ') + ""
-            f.write(f"| {row[0]} | {row[1]} | {row[2]} | {desc} |\n")
+        mp_rows = keyword_sample_rows(
+            conn, "missing_persons",
+            ["file_number", "name", "age_at_disappearance", "description"],
+            "sex", "Female", "tattoo", 10,
+        )
+        f.writelines(
+            f"| {row[0]} | {row[1]} | {row[2]} | {row[3][:100].replace(chr(10), ' ')} |\n"
+            for row in mp_rows
+        )
             
         f.write("\n## Keyword Analysis\n")
         f.write("| Keyword | UHR Mentions | MP Mentions |\n")
         f.write("|---------|--------------|-------------|\n")
-        for kw in ['tattoo', 'scar', 'glasses', 'denture', 'prosthetic']:
-            cursor.execute("SELECT count(*) FROM unidentified_cases WHERE description LIKE ?", (f'%{kw}%',))
-            uhr_mentions = cursor.fetchone()[0]
-            cursor.execute("SELECT count(*) FROM missing_persons WHERE description LIKE ?", (f'%{kw}%',))
-            mp_mentions = cursor.fetchone()[0]
-            f.write(f"| {kw} | {uhr_mentions} | {mp_mentions} |\n")
+        uhr_counts = keyword_counts["unidentified_cases"]
+        mp_counts = keyword_counts["missing_persons"]
+        f.writelines(f"| {kw} | {uhr_counts[kw]} | {mp_counts[kw]} |\n" for kw in LEAD_KEYWORDS)
 
     print("Report generated successfully.")
 
 def main():
     conn = get_connection()
     try:
-        analyze_summary_stats(conn)
+        summary = analyze_summary_stats(conn)
         analyze_temporal_trends(conn)
-        analyze_keyword_leads(conn, ['tattoo', 'scar', 'glasses', 'denture', 'prosthetic'])
+        keyword_counts = analyze_keyword_leads(conn, LEAD_KEYWORDS)
         analyze_candidate_overlaps(conn)
-        generate_markdown_report(conn)
+        generate_markdown_report(conn, summary, keyword_counts)
     finally:
         conn.close()
 
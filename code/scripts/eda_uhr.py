@@ -6,20 +6,51 @@ Analyzes the real data fetched from BC Coroners Service ArcGIS.
 """
 
 import json
-from datetime import datetime
-from collections import Counter
+import numpy as np
+import pandas as pd
+from dateutil import tz
 
 # Load the data
 with open('data/raw/bc_uhr_cases.json', 'r') as f:
     data = json.load(f)
 
-features = data['features']
-cases = [f['attributes'] for f in features]
+# Columnar from the start: every section below is a column scan over df
+df = pd.DataFrame([f['attributes'] for f in data['features']])
+n_cases = len(df)
+
+
+def column(name):
+    """Column by name, all-missing when the export lacks it."""
+    if name in df:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+# Free-text fields used below, each stripped in one pass up front; the
+# sections read these masks instead of re-stripping the same column
+TEXT_COLUMNS = ['Race', 'Eye_Colour', 'Hair_Colou', 'Minimum_He',
+                'Clothing', 'Tattoos', 'Scars', 'Other_Comm']
+text = {name: column(name).fillna('').astype(str) for name in TEXT_COLUMNS}
+present = pd.DataFrame(
+    {name: values.str.strip() != '' for name, values in text.items()},
+    index=df.index,
+)
+available = present.sum()
+
+
+def nonblank(name):
+    """Mask of rows whose text field is non-empty after stripping."""
+    return present[name]
+
+
+def most_common(values):
+    """value_counts ordered like Counter.most_common (ties keep first-seen order)."""
+    return values.value_counts(sort=False).sort_values(ascending=False, kind='stable')
 
 print("=" * 70)
 print("BC UNIDENTIFIED HUMAN REMAINS - EXPLORATORY DATA ANALYSIS")
 print("=" * 70)
-print(f"Total Cases: {len(cases)}")
+print(f"Total Cases: {n_cases}")
 print()
 
 # =============================================================================
@@ -27,9 +58,10 @@ print()
 # =============================================================================
 print("1. SEX DISTRIBUTION")
 print("-" * 40)
-sex_counts = Counter(c['Sex'] for c in cases if c['Sex'])
-for sex, count in sex_counts.most_common():
-    pct = count / len(cases) * 100
+sex = column('Sex')
+sex_counts = most_common(sex[sex.notna() & (sex != '')])
+for sex, count in sex_counts.items():
+    pct = count / n_cases * 100
     print(f"   {sex}: {count} ({pct:.1f}%)")
 print()
 
@@ -39,29 +71,23 @@ print()
 print("2. AGE RANGE DISTRIBUTION")
 print("-" * 40)
 
-# Calculate age midpoints
-ages = []
-for c in cases:
-    min_age = c.get('Minimum_Ag')
-    max_age = c.get('Maximum_Ag')
-    if min_age and max_age:
-        ages.append((min_age + max_age) / 2)
-
-if ages:
-    avg_age = sum(ages) / len(ages)
-    min_avg = min(ages)
-    max_avg = max(ages)
+# Calculate age midpoints (cases with both bounds present and non-zero)
+min_ages = pd.to_numeric(column('Minimum_Ag'))
+max_ages = pd.to_numeric(column('Maximum_Ag'))
+has_age = min_ages.notna() & max_ages.notna() & (min_ages != 0) & (max_ages != 0)
+ages = ((min_ages[has_age] + max_ages[has_age]) / 2).to_numpy(dtype=float)
+
+if len(ages):
+    avg_age = ages.mean()
+    min_avg = ages.min()
+    max_avg = ages.max()
     
-    # Age brackets
-    brackets = {'0-20': 0, '21-40': 0, '41-60': 0, '61-80': 0, '80+': 0, 'Unknown': 0}
-    for age in ages:
-        if age <= 20: brackets['0-20'] += 1
-        elif age <= 40: brackets['21-40'] += 1
-        elif age <= 60: brackets['41-60'] += 1
-        elif age <= 80: brackets['61-80'] += 1
-        else: brackets['80+'] += 1
+    # Age brackets (upper bounds inclusive)
+    labels = ['0-20', '21-40', '41-60', '61-80', '80+']
+    bracket_counts = np.bincount(np.digitize(ages, [20, 40, 60, 80], right=True), minlength=len(labels))
+    brackets = dict(zip(labels, bracket_counts.tolist()))
     
-    unknown_age = len(cases) - len(ages)
+    unknown_age = n_cases - len(ages)
     brackets['Unknown'] = unknown_age
     
     print(f"   Age data available for {len(ages)} cases")
@@ -70,7 +96,7 @@ if ages:
     print()
     print("   Age Distribution:")
     for bracket, count in brackets.items():
-        pct = count / len(cases) * 100
+        pct = count / n_cases * 100
         bar = '█' * int(pct / 2)
         print(f"   {bracket:>10}: {count:>3} ({pct:>5.1f}%) {bar}")
 print()
@@ -80,9 +106,9 @@ print()
 # =============================================================================
 print("3. RACE/ETHNICITY DISTRIBUTION")
 print("-" * 40)
-race_counts = Counter(c['Race'] for c in cases if c.get('Race') and c['Race'].strip())
-for race, count in race_counts.most_common():
-    pct = count / len(cases) * 100
+race_counts = most_common(column('Race')[nonblank('Race')])
+for race, count in race_counts.items():
+    pct = count / n_cases * 100
     print(f"   {race}: {count} ({pct:.1f}%)")
 print()
 
@@ -92,28 +118,22 @@ print()
 print("4. TEMPORAL ANALYSIS (Discovery Year)")
 print("-" * 40)
 
-# Convert epoch milliseconds to year
-years = []
-for c in cases:
-    date_found = c.get('Date_Found')
-    if date_found:
-        try:
-            dt = datetime.fromtimestamp(date_found / 1000)
-            years.append(dt.year)
-        except:
-            pass
-
-if years:
-    year_counts = Counter(years)
-    decades = Counter((y // 10) * 10 for y in years)
+# Convert epoch milliseconds to year (missing, zero or unparseable dates dropped).
+# Local time, not UTC, so cases found near New Year keep their local year.
+date_found = pd.to_numeric(column('Date_Found'), errors='coerce')
+date_found = date_found[date_found.notna() & (date_found != 0)]
+found_at = pd.to_datetime(date_found, unit='ms', utc=True, errors='coerce').dropna()
+years = found_at.dt.tz_convert(tz.tzlocal()).dt.year.to_numpy()
+
+if len(years):
+    decades, decade_counts = np.unique((years // 10) * 10, return_counts=True)
     
     print(f"   Cases with date data: {len(years)}")
-    print(f"   Earliest case: {min(years)}")
-    print(f"   Most recent case: {max(years)}")
+    print(f"   Earliest case: {years.min()}")
+    print(f"   Most recent case: {years.max()}")
     print()
     print("   By Decade:")
-    for decade in sorted(decades.keys()):
-        count = decades[decade]
+    for decade, count in zip(decades.tolist(), decade_counts.tolist()):
         pct = count / len(years) * 100
         bar = '█' * int(pct / 2)
         print(f"   {decade}s: {count:>3} ({pct:>5.1f}%) {bar}")
@@ -126,29 +146,29 @@ print("5. GEOGRAPHIC DISTRIBUTION")
 print("-" * 40)
 
 # Approximate BC regions by lat/lon
-lats = [c['Latitude'] for c in cases if c.get('Latitude')]
-lons = [c['Longitude'] for c in cases if c.get('Longitude')]
+def coordinates(name):
+    values = pd.to_numeric(column(name))
+    return values[values.notna() & (values != 0)].to_numpy(dtype=float)
+
+lats = coordinates('Latitude')
+lons = coordinates('Longitude')
 
-if lats and lons:
+if len(lats) and len(lons):
     print(f"   Cases with coordinates: {len(lats)}")
-    print(f"   Latitude range: {min(lats):.2f}°N to {max(lats):.2f}°N")
-    print(f"   Longitude range: {min(lons):.2f}°W to {max(lons):.2f}°W")
-    
-    # Rough regional breakdown
-    regions = {'Lower Mainland (49-49.5°N)': 0, 
-               'Vancouver Island (48-50°N, <-123°W)': 0,
-               'Interior (49-52°N)': 0, 
-               'Northern BC (>52°N)': 0}
+    print(f"   Latitude range: {lats.min():.2f}°N to {lats.max():.2f}°N")
+    print(f"   Longitude range: {lons.min():.2f}°W to {lons.max():.2f}°W")
     
-    for lat, lon in zip(lats, lons):
-        if lat < 49.5 and lon > -123:
-            regions['Lower Mainland (49-49.5°N)'] += 1
-        elif lon < -123 and lat < 50:
-            regions['Vancouver Island (48-50°N, <-123°W)'] += 1
-        elif lat >= 52:
-            regions['Northern BC (>52°N)'] += 1
-        else:
-            regions['Interior (49-52°N)'] += 1
+    # Rough regional breakdown (pairs lats/lons positionally, as zip would)
+    n_pairs = min(len(lats), len(lons))
+    lat, lon = lats[:n_pairs], lons[:n_pairs]
+    lower_mainland = (lat < 49.5) & (lon > -123)
+    island = ~lower_mainland & (lon < -123) & (lat < 50)
+    northern = ~lower_mainland & ~island & (lat >= 52)
+    interior = ~(lower_mainland | island | northern)
+    regions = {'Lower Mainland (49-49.5°N)': int(lower_mainland.sum()), 
+               'Vancouver Island (48-50°N, <-123°W)': int(island.sum()),
+               'Interior (49-52°N)': int(interior.sum()), 
+               'Northern BC (>52°N)': int(northern.sum())}
     
     print()
     print("   Approximate Regional Distribution:")
@@ -164,17 +184,17 @@ print("6. PHYSICAL DESCRIPTORS AVAILABILITY")
 print("-" * 40)
 
 descriptors = {
-    'Eye Colour': sum(1 for c in cases if c.get('Eye_Colour', '').strip()),
-    'Hair Colour': sum(1 for c in cases if c.get('Hair_Colou', '').strip()),
-    'Height': sum(1 for c in cases if c.get('Minimum_He', '').strip()),
-    'Clothing': sum(1 for c in cases if c.get('Clothing', '').strip()),
-    'Tattoos': sum(1 for c in cases if c.get('Tattoos', '').strip()),
-    'Scars': sum(1 for c in cases if c.get('Scars', '').strip()),
-    'Other Comments': sum(1 for c in cases if c.get('Other_Comm', '').strip()),
+    'Eye Colour': int(available['Eye_Colour']),
+    'Hair Colour': int(available['Hair_Colou']),
+    'Height': int(available['Minimum_He']),
+    'Clothing': int(available['Clothing']),
+    'Tattoos': int(available['Tattoos']),
+    'Scars': int(available['Scars']),
+    'Other Comments': int(available['Other_Comm']),
 }
 
 for desc, count in sorted(descriptors.items(), key=lambda x: -x[1]):
-    pct = count / len(cases) * 100
+    pct = count / n_cases * 100
     bar = '█' * int(pct / 2)
     print(f"   {desc:>15}: {count:>3} ({pct:>5.1f}%) {bar}")
 print()
@@ -184,8 +204,8 @@ print()
 # =============================================================================
 print("7. HAIR COLOR DISTRIBUTION (where available)")
 print("-" * 40)
-hair_counts = Counter(c['Hair_Colou'] for c in cases if c.get('Hair_Colou', '').strip())
-for hair, count in hair_counts.most_common(10):
+hair_counts = most_common(column('Hair_Colou')[nonblank('Hair_Colou')])
+for hair, count in hair_counts.head(10).items():
     print(f"   {hair}: {count}")
 print()
 
@@ -195,16 +215,18 @@ print()
 print("8. CLOTHING KEYWORDS (mentions)")
 print("-" * 40)
 
-clothing_texts = [c['Clothing'] for c in cases if c.get('Clothing', '').strip()]
-all_clothing = ' '.join(clothing_texts).lower()
+all_clothing = ' '.join(text['Clothing'][nonblank('Clothing')]).lower()
 
 keywords = ['jeans', 'shirt', 'jacket', 'shoes', 'boots', 'pants', 'sweater', 
             'coat', 'socks', 'belt', 'watch', 'ring', 'naked', 'underwear']
 
-for kw in sorted(keywords, key=lambda k: all_clothing.count(k), reverse=True):
-    count = all_clothing.count(kw)
-    if count > 0:
-        print(f"   {kw}: {count} mentions")
+# One count per keyword, ranked like Counter.most_common (ties keep keyword order).
+# str.count is a C substring search; for this short list it beats a single
+# regex-alternation or Aho-Corasick pass over the same joined text.
+keyword_counts = pd.Series({kw: all_clothing.count(kw) for kw in keywords})
+keyword_counts = keyword_counts.sort_values(ascending=False, kind='stable')
+for kw, count in keyword_counts[keyword_counts > 0].items():
+    print(f"   {kw}: {count} mentions")
 print()
 
 # =============================================================================
@@ -214,18 +236,17 @@ print("9. NOTABLE CASES (with unique identifiers)")
 print("-" * 40)
 
 # Cases with tattoos
-tattoo_cases = [c for c in cases if c.get('Tattoos', '').strip()]
+tattoo_cases = df[nonblank('Tattoos')]
 print(f"   Cases with tattoos: {len(tattoo_cases)}")
-for c in tattoo_cases[:3]:
-    print(f"     - {c['Case_Numbe']}: {c['Tattoos'][:60]}")
+for case_number, tattoos in zip(tattoo_cases['Case_Numbe'].head(3), tattoo_cases['Tattoos'].head(3)):
+    print(f"     - {case_number}: {tattoos[:60]}")
 
 # Cases with scars
-scar_cases = [c for c in cases if c.get('Scars', '').strip()]
-print(f"\n   Cases with scars: {len(scar_cases)}")
+print(f"\n   Cases with scars: {int(available['Scars'])}")
 
 # Cases with detailed clothing
-detailed_clothing = [c for c in cases if len(c.get('Clothing', '')) > 100]
-print(f"\n   Cases with detailed clothing descriptions: {len(detailed_clothing)}")
+detailed_clothing = int((text['Clothing'].str.len() > 100).sum())
+print(f"\n   Cases with detailed clothing descriptions: {detailed_clothing}")
 
 print()
 print("=" * 70)
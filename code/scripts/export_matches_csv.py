@@ -1,59 +1,86 @@
+import argparse
+import heapq
 import json
 import csv
-import pandas as pd
 import os
+import tempfile
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+MATCHES_FILE = 'data/processed/potential_matches.json'
+MP_FILE = 'data/raw/rcmp_missing_persons.json'
 
 def flatten_dict(d, prefix=''):
-    items = []
-    for k, v in d.items():
-        new_key = f"{prefix}{k}" if prefix else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key + '_').items())
+    """
+    Flatten nested dicts into one level, joining keys with '_'.
+    
+    Iterative: a stack of (prefix, item iterator) replaces recursion, so no
+    intermediate dict is built per level. Keys come out in depth-first order.
+    """
+    out = {}
+    stack = [(prefix, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}{k}" if prefix else k
+            if isinstance(v, dict):
+                # Descend now; this level's iterator resumes afterwards
+                stack.append((new_key + '_', iter(v.items())))
+                break
+            out[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    return out
 
-def main():
-    print("Loading data")
-    
-    # Load Matches
-    try:
-        with open('data/processed/potential_matches.json', 'r') as f:
-            matches_data = json.load(f)
-    except FileNotFoundError:
-        print("No matches file found.")
-        return
+def iter_matches(path):
+    """Yield traveler entries from the matches JSON array, streamed with ijson when installed."""
+    with open(path, 'rb') as f:
+        if HAS_IJSON:
+            # use_float keeps scores as float (not Decimal)
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from json.load(f)
 
-    # Load Full MP Data for lookups
-    try:
-        with open('data/raw/rcmp_missing_persons.json', 'r') as f:
-            mp_list = json.load(f)
-            mp_dict = {m['case_id']: m for m in mp_list}
-    except FileNotFoundError:
-        print("No missing persons file found.")
-        return
+PRE_COLS = ['Match_Score', 'Traveler_ID', 'Match_Reasons', 'MP_title', 'MP_case_id', 'MP_url', 'UHR_Case_Numbe', 'UHR_Date_Found']
+OUTPUT_PATH = 'data/processed/matches_full.csv'
 
-    rows = []
-    
-    print(f"Processing {len(matches_data)} travelers with matches")
-    
-    for item in matches_data:
+def cached_flat(cache, key, d, prefix):
+    """Flatten d with prefix once per key; records without a key are flattened every time."""
+    if key is None:
+        return flatten_dict(d, prefix=prefix)
+    flat = cache.get(key)
+    if flat is None:
+        flat = cache[key] = flatten_dict(d, prefix=prefix)
+    return flat
+
+def iter_rows(matches, mp_dict, stats):
+    """Yield one flattened CSV row per potential match; counts travelers into stats."""
+    # The same UHR record recurs across many travelers' match lists, so
+    # each MP / UHR record is flattened only the first time it is seen
+    mp_cache = {}
+    uhr_cache = {}
+
+    for item in matches:
+        stats['travelers'] += 1
         t_id = item['traveler_id']
-        mp_full = mp_dict.get(t_id, {})
-        
+
         # Flatten MP data
         # Prefix with MP_ to distinguish
-        mp_flat = flatten_dict(mp_full, prefix='MP_')
-        
+        mp_flat = cached_flat(mp_cache, t_id, mp_dict.get(t_id, {}), 'MP_')
+
         for match in item['potential_matches']:
             score = match['score']
             reasons = "; ".join(match['reasons'])
             uhr_details = match.get('uhr_details', {})
-            
+
             # Flatten UHR data
             # Prefix with UHR_
-            uhr_flat = flatten_dict(uhr_details, prefix='UHR_')
-            
+            uhr_flat = cached_flat(uhr_cache, match.get('uhr_case'), uhr_details, 'UHR_')
+
             # Combine all
             row = {
                 'Match_Score': score,
@@ -62,34 +89,109 @@ def main():
             }
             row.update(mp_flat)
             row.update(uhr_flat)
-            
-            rows.append(row)
-            
-    if not rows:
-        print("No matches to export.")
-        return
 
-    print(f"Generating CSV with {len(rows)} rows")
-    df = pd.DataFrame(rows)
-    
-    # Sort by Match Score Descending
-    df = df.sort_values(by='Match_Score', ascending=False)
-    
-    # Reorder columns to have Score first, then ID, then MP cols, then UHR cols
-    cols = list(df.columns)
-    # Simple sort or prioritize specific ones
-    pre_cols = ['Match_Score', 'Traveler_ID', 'Match_Reasons', 'MP_title', 'MP_case_id', 'MP_url', 'UHR_Case_Numbe', 'UHR_Date_Found']
-    
+            yield row
+
+def column_order(columns):
+    """Score first, then ID, then MP cols, then UHR cols (first-seen order otherwise)."""
     # Filter pre_cols that actually exist
-    pre_cols = [c for c in pre_cols if c in cols]
-    other_cols = [c for c in cols if c not in pre_cols]
+    pre_cols = [c for c in PRE_COLS if c in columns]
+    other_cols = [c for c in columns if c not in pre_cols]
+    return pre_cols + other_cols
+
+def write_csv(columns, rows):
+    with open(OUTPUT_PATH, 'w', newline='') as out:
+        writer = csv.DictWriter(out, fieldnames=column_order(columns))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def export_all(rows):
+    """
+    Write every row, by Match Score descending. Returns the row count.
     
-    final_cols = pre_cols + other_cols
-    df = df[final_cols]
+    Rows are spooled to a temp file as JSON lines while the matches stream in;
+    only (score, offset) pairs and the column set stay in memory.
+    """
+    columns = {}
+    index = []
+
+    with tempfile.TemporaryFile() as spool:
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+            index.append((row['Match_Score'], spool.tell()))
+            spool.write(json.dumps(row).encode() + b'\n')
+
+        if not index:
+            return 0
+
+        print(f"Generating CSV with {len(index)} rows")
+        # Sort by Match Score Descending
+        index.sort(key=lambda entry: entry[0], reverse=True)
+
+        def reread():
+            for _, offset in index:
+                spool.seek(offset)
+                yield json.loads(spool.readline())
+
+        write_csv(columns, reread())
+    return len(index)
+
+def export_top(rows, top):
+    """
+    Write only the `top` highest-scoring rows. Returns the row count.
     
-    output_path = 'data/processed/matches_full.csv'
-    df.to_csv(output_path, index=False)
-    print(f"Successfully exported to {output_path}")
+    heapq.nlargest keeps at most `top` rows in memory (O(N log top)) and
+    breaks score ties by input order, like the full sort.
+    """
+    # Columns are collected from every row, so the header matches a full export
+    columns = {}
+
+    def tracked():
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+            yield row
+
+    best = heapq.nlargest(top, tracked(), key=lambda row: row['Match_Score'])
+    if not best:
+        return 0
+
+    print(f"Generating CSV with the top {len(best)} rows")
+    write_csv(columns, best)
+    return len(best)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export potential traveler matches to CSV")
+    parser.add_argument("--top", type=int, default=None,
+                        help="Only export the N highest-scoring matches")
+    args = parser.parse_args()
+
+    print("Loading data")
+
+    if not os.path.exists(MATCHES_FILE):
+        print("No matches file found.")
+        return
+
+    # Load Full MP Data for lookups
+    try:
+        with open(MP_FILE, 'r') as f:
+            mp_list = json.load(f)
+            mp_dict = {m['case_id']: m for m in mp_list}
+    except FileNotFoundError:
+        print("No missing persons file found.")
+        return
+
+    stats = {'travelers': 0}
+    rows = iter_rows(iter_matches(MATCHES_FILE), mp_dict, stats)
+    if args.top is not None:
+        written = export_top(rows, args.top)
+    else:
+        written = export_all(rows)
+
+    print(f"Processed {stats['travelers']} travelers with matches")
+    if not written:
+        print("No matches to export.")
+        return
+    print(f"Successfully exported to {OUTPUT_PATH}")
 
 if __name__ == "__main__":
     main()
@@ -1,30 +1,64 @@
 
-import json
 import re
+import string
+
+import orjson
 
 LEADS_FILE = "data/processed/leads.json"
 UHR_FILE = "data/raw/namus_unidentified.json"
 MP_FILE = "data/raw/namus_missing.json"
 
+WORD_PATTERN = re.compile(r'\w+')
+# For ASCII text \w+ is [a-z0-9_]+ after lowercasing, so tokens can be split
+# out with one translate() call instead of a regex scan
+ASCII_WORD_CHARS = set(string.ascii_lowercase + string.digits + '_')
+ASCII_NON_WORD_TO_SPACE = str.maketrans({chr(i): ' ' for i in range(128) if chr(i) not in ASCII_WORD_CHARS})
+
+# Common English/Descriptive stopwords to ignore
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 
+    'is', 'was', 'are', 'were', 'be', 'been', 'has', 'have', 'had', 'do', 'does', 'did',
+    'he', 'she', 'it', 'they', 'his', 'her', 'its', 'their', 'him', 'them',
+    'missing', 'unidentified', 'person', 'remains', 'found', 'seen', 'last', 'date',
+    'wear', 'wearing', 'wore', 'description', 'subject', 'male', 'female', 'white', 'black',
+    'left', 'right', 'upper', 'lower', 'side', 'front', 'back', 'top', 'bottom',
+    'shirt', 'pants', 'shoes', 'socks', 'jacket', 'coat', 'hat', 'cap',
+    'inch', 'cm', 'lbs', 'foot', 'feet', 'hair', 'eyes', 'brown', 'blue', 'green', 'short', 'long',
+    'size', 'medium', 'large', 'small', 'color', 'colored', 'unknown', 'approximate', 'possible',
+    'scar', 'tattoo', 'piercing', 'brand' # generic terms
+})
+
+def load_json(path):
+    """Parse a JSON file with orjson (C parser, one read of the raw bytes)."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def mp_key(value):
+    """Normalized MP lookup key: 'MP12345', '12345' and 12345 all map to '12345'."""
+    return str(value).removeprefix('MP')
+
 def load_data():
     print("Loading data")
-    leads = json.load(open(LEADS_FILE))
+    leads = load_json(LEADS_FILE)
     
+    # The parsed lists are dropped once the maps are built, so only the
+    # records (shared with the maps) stay alive
     uhr_map = {}
     try:
-        uhr_data = json.load(open(UHR_FILE))
+        uhr_data = load_json(UHR_FILE)
         for u in uhr_data:
             uhr_map[u.get('idFormatted')] = u
+        del uhr_data
     except: pass
     
     mp_map = {}
     try:
-        mp_data = json.load(open(MP_FILE))
+        mp_data = load_json(MP_FILE)
         print(f"Loaded {len(mp_data)} MPs")
-        # Map by numeric ID and Formatted ID to be safe
+        # One entry per MP under its normalized ID (idFormatted is 'MP' + namus2Number)
         for m in mp_data:
-            mp_map[str(m.get('namus2Number'))] = m
-            mp_map[m.get('idFormatted')] = m
+            mp_map[mp_key(m.get('namus2Number') or m.get('idFormatted'))] = m
+        del mp_data
     except: pass
             
     return leads, mp_map, uhr_map
@@ -43,10 +77,29 @@ def get_text_content(obj):
         
     return text.lower()
 
+def tokenize(obj):
+    """Rare-word candidates of a record: its word tokens minus stopwords and pure numbers."""
+    text = get_text_content(obj)
+    if text.isascii():
+        words = text.translate(ASCII_NON_WORD_TO_SPACE).split()
+    else:
+        words = WORD_PATTERN.findall(text)
+    # Stopwords and purely numeric tokens dropped in the same pass
+    return frozenset(t for t in words if t not in STOPWORDS and not t.isdigit())
+
+def cached_tokens(cache, key, obj):
+    """tokenize(obj), computed once per key; records recur across many leads."""
+    tokens = cache.get(key)
+    if tokens is None:
+        tokens = cache[key] = tokenize(obj)
+    return tokens
+
 def main():
     leads, mp_map, uhr_map = load_data()
     
     rich_leads = []
+    uhr_tokens_by_id = {}
+    mp_tokens_by_id = {}
     
     print(f"Scanning {len(leads)} leads for RICH matches")
     
@@ -58,8 +111,8 @@ def main():
         uhr = uhr_map.get(uhr_id)
         
         # Handle MP ID formats
-        cleaned_mp_id = mp_id.replace('MP', '')
-        mp = mp_map.get(cleaned_mp_id) or mp_map.get(mp_id)
+        mp_norm = mp_key(mp_id)
+        mp = mp_map.get(mp_norm)
         
         if not uhr or not mp:
             continue
@@ -81,33 +134,11 @@ def main():
              if uhr_race != mp_race:
                  continue
 
-        # 2. RARE WORD OVERLAP
-        
-        uhr_text = get_text_content(uhr)
-        mp_text = get_text_content(mp)
-
-        # Common English/Descriptive stopwords to ignore
-        stopwords = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 
-            'is', 'was', 'are', 'were', 'be', 'been', 'has', 'have', 'had', 'do', 'does', 'did',
-            'he', 'she', 'it', 'they', 'his', 'her', 'its', 'their', 'him', 'them',
-            'missing', 'unidentified', 'person', 'remains', 'found', 'seen', 'last', 'date',
-            'wear', 'wearing', 'wore', 'description', 'subject', 'male', 'female', 'white', 'black',
-            'left', 'right', 'upper', 'lower', 'side', 'front', 'back', 'top', 'bottom',
-            'shirt', 'pants', 'shoes', 'socks', 'jacket', 'coat', 'hat', 'cap',
-            'inch', 'cm', 'lbs', 'foot', 'feet', 'hair', 'eyes', 'brown', 'blue', 'green', 'short', 'long',
-            'size', 'medium', 'large', 'small', 'color', 'colored', 'unknown', 'approximate', 'possible',
-            'scar', 'tattoo', 'piercing', 'brand' # generic terms
-        }
-        
-        uhr_tokens = set(re.findall(r'\w+', uhr_text)) - stopwords
-        mp_tokens = set(re.findall(r'\w+', mp_text)) - stopwords
-        
-        # Filter purely numeric tokens
-        uhr_tokens = {t for t in uhr_tokens if not t.isdigit()}
-        mp_tokens = {t for t in mp_tokens if not t.isdigit()}
+        # 2. RARE WORD OVERLAP (tokens cached per record)
+        uhr_tokens = cached_tokens(uhr_tokens_by_id, uhr_id, uhr)
+        mp_tokens = cached_tokens(mp_tokens_by_id, mp_norm, mp)
         
-        common = uhr_tokens.intersection(mp_tokens)
+        common = uhr_tokens & mp_tokens
         
         # Boost score heavily for count of unique intersecting words
         if len(common) >= 2:
@@ -14,42 +14,46 @@ def main():
     with open(input_file, 'r') as f:
         leads = json.load(f)
         
-    with open(output_file, 'w') as f:
-        f.write(f"# Hybrid RAG Matching Report\n")
-        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-        f.write(f"**Total Leads:** {len(leads)}\n\n")
+    # Collect the report in memory and write it once
+    parts = []
+    parts.append(f"# Hybrid RAG Matching Report\n")
+    parts.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    parts.append(f"**Total Leads:** {len(leads)}\n\n")
+    
+    parts.append("## Top Candidates (Score > 0.85)\n\n")
+    
+    parts.append("| Rank | MP Name | Case IDs | Score | Vector Sim | Key Reasons |\n")
+    parts.append("|---|---|---|---|---|---|\n")
+    
+    for i, lead in enumerate(leads):
+        if i >= 50: break # Top 50 in table
+        
+        uhr_link = f"[{lead['uhr_id']}](https://www.namus.gov/UnidentifiedPersons/Case#/{lead['uhr_id'].replace('UP','')})"
+        mp_link = f"[{lead['mp_name']}](https://www.namus.gov/MissingPersons/Case#/{lead['mp_id'].replace('MP','')})"
         
-        f.write("## Top Candidates (Score > 0.85)\n\n")
+        reasons = "<br>".join(lead['reasons'])
         
-        f.write("| Rank | MP Name | Case IDs | Score | Vector Sim | Key Reasons |\n")
-        f.write("|---|---|---|---|---|---|\n")
+        parts.append(f"| {i+1} | {mp_link} | {lead['mp_id']} ↔ {uhr_link} | **{lead['score']:.3f}** | {lead['vector_score']:.3f} | {reasons} |\n")
         
-        for i, lead in enumerate(leads):
-            if i >= 50: break # Top 50 in table
-            
-            uhr_link = f"[{lead['uhr_id']}](https://www.namus.gov/UnidentifiedPersons/Case#/{lead['uhr_id'].replace('UP','')})"
-            mp_link = f"[{lead['mp_name']}](https://www.namus.gov/MissingPersons/Case#/{lead['mp_id'].replace('MP','')})"
-            
-            reasons = "<br>".join(lead['reasons'])
-            
-            f.write(f"| {i+1} | {mp_link} | {lead['mp_id']} ↔ {uhr_link} | **{lead['score']:.3f}** | {lead['vector_score']:.3f} | {reasons} |\n")
-            
-        f.write("\n## Analysis of Top 5 Matches\n")
-        for i, lead in enumerate(leads[:5]):
-            f.write(f"\n### {i+1}. {lead['mp_name']} ({lead['mp_id']}) ↔ {lead['uhr_id']}\n")
-            f.write(f"- **Composite Score:** {lead['score']}\n")
-            f.write(f"- **Semantic Similarity:** {lead['vector_score']} (Very High)\n")
-            f.write(f"- **Validation Logic:**\n")
-            for r in lead['reasons']:
-                f.write(f"  - {r}\n")
-            
-            # Story Line
-            narr = lead.get('narratives', {})
-            if narr:
-                f.write(f"- **Story Line:**\n")
-                f.write(f"  - *Missing:* \"{narr.get('mp')}\"\n")
-                f.write(f"  - *Found:* \"{narr.get('uhr')}\"\n")
-                
+    parts.append("\n## Analysis of Top 5 Matches\n")
+    for i, lead in enumerate(leads[:5]):
+        parts.append(f"\n### {i+1}. {lead['mp_name']} ({lead['mp_id']}) ↔ {lead['uhr_id']}\n")
+        parts.append(f"- **Composite Score:** {lead['score']}\n")
+        parts.append(f"- **Semantic Similarity:** {lead['vector_score']} (Very High)\n")
+        parts.append(f"- **Validation Logic:**\n")
+        for r in lead['reasons']:
+            parts.append(f"  - {r}\n")
+        
+        # Story Line
+        narr = lead.get('narratives', {})
+        if narr:
+            parts.append(f"- **Story Line:**\n")
+            parts.append(f"  - *Missing:* \"{narr.get('mp')}\"\n")
+            parts.append(f"  - *Found:* \"{narr.get('uhr')}\"\n")
+
+    with open(output_file, 'w') as f:
+        f.write(''.join(parts))
+
     print(f"Report generated at {output_file}")
 
 if __name__ == "__main__":
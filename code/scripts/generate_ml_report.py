@@ -14,42 +14,46 @@ def main():
     with open(input_file, 'r') as f:
         leads = json.load(f)
         
-    with open(output_file, 'w') as f:
-        f.write(f"# Machine Learning Matching Report\n")
-        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-        f.write(f"**Total Leads:** {len(leads)}\n\n")
+    # Collect the report in memory and write it once
+    parts = []
+    parts.append(f"# Machine Learning Matching Report\n")
+    parts.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    parts.append(f"**Total Leads:** {len(leads)}\n\n")
+    
+    parts.append("> [!NOTE]\n")
+    parts.append("> Scores represent probability (0.0 - 1.0) from RandomForest Model trained on synthetic data.\n")
+    parts.append("> Key Factors: Keyword Overlap & Timeline Plausibility.\n\n")
+    
+    parts.append("## Top Candidates (Prob > 0.5)\n")
+    
+    parts.append("| Rank | MP Name | Case IDs | Score | Key Factors |\n")
+    parts.append("|---|---|---|---|---|\n")
+    
+    for i, lead in enumerate(leads):
+        if i >= 50: break
         
-        f.write("> [!NOTE]\n")
-        f.write("> Scores represent probability (0.0 - 1.0) from RandomForest Model trained on synthetic data.\n")
-        f.write("> Key Factors: Keyword Overlap & Timeline Plausibility.\n\n")
+        uhr_link = f"[{lead['uhr_id']}](https://www.namus.gov/UnidentifiedPersons/Case#/{lead['uhr_id'].replace('UP','')})"
+        mp_link = f"[{lead['mp_name']}](https://www.namus.gov/MissingPersons/Case#/{lead['mp_id'].replace('MP','')})"
         
-        f.write("## Top Candidates (Prob > 0.5)\n")
+        feats = lead['features']
+        factors = []
+        if feats['keyword_overlap'] > 0:
+            factors.append(f"**Keywords: {int(feats['keyword_overlap'])}**")
+        if feats['days_diff'] < 365:
+            factors.append(f"Time Gap: {int(feats['days_diff'])}d")
+        elif feats['days_diff'] < 1095: # 3 years
+             factors.append(f"Time Gap: {int(feats['days_diff']/365)}y")
+             
+        if feats['vector_sim'] > 0.7:
+             factors.append(f"Sim: {feats['vector_sim']:.2f}")
         
-        f.write("| Rank | MP Name | Case IDs | Score | Key Factors |\n")
-        f.write("|---|---|---|---|---|\n")
+        factor_str = ", ".join(factors)
         
-        for i, lead in enumerate(leads):
-            if i >= 50: break
-            
-            uhr_link = f"[{lead['uhr_id']}](https://www.namus.gov/UnidentifiedPersons/Case#/{lead['uhr_id'].replace('UP','')})"
-            mp_link = f"[{lead['mp_name']}](https://www.namus.gov/MissingPersons/Case#/{lead['mp_id'].replace('MP','')})"
-            
-            feats = lead['features']
-            factors = []
-            if feats['keyword_overlap'] > 0:
-                factors.append(f"**Keywords: {int(feats['keyword_overlap'])}**")
-            if feats['days_diff'] < 365:
-                factors.append(f"Time Gap: {int(feats['days_diff'])}d")
-            elif feats['days_diff'] < 1095: # 3 years
-                 factors.append(f"Time Gap: {int(feats['days_diff']/365)}y")
-                 
-            if feats['vector_sim'] > 0.7:
-                 factors.append(f"Sim: {feats['vector_sim']:.2f}")
-            
-            factor_str = ", ".join(factors)
-            
-            f.write(f"| {i+1} | {mp_link} | {lead['mp_id']} ↔ {uhr_link} | **{lead['score']:.4f}** | {factor_str} |\n")
-            
+        parts.append(f"| {i+1} | {mp_link} | {lead['mp_id']} ↔ {uhr_link} | **{lead['score']:.4f}** | {factor_str} |\n")
+
+    with open(output_file, 'w') as f:
+        f.write(''.join(parts))
+
     print(f"Report generated at {output_file}")
 
 if __name__ == "__main__":
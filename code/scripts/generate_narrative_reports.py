@@ -1,7 +1,7 @@
 
 import sqlite3
-import json
 import os
+import orjson
 import sys
 from datetime import datetime
 
@@ -19,24 +19,32 @@ REPORTS_DIR = "data/reports/lead_narratives"
 
 def get_full_case_details(conn, case_number, table):
     cursor = conn.cursor()
+    # sqlite3.Row carries the column names, so no PRAGMA table_info round trip
+    cursor.row_factory = sqlite3.Row
     col = "case_number" if table == "unidentified_cases" else "file_number"
     cursor.execute(f"SELECT * FROM {table} WHERE {col} = ?", (case_number,))
     row = cursor.fetchone()
     if not row:
         return {}
-    
-    # Get column names
-    cursor.execute(f"PRAGMA table_info({table})")
-    cols = [c[1] for c in cursor.fetchall()]
-    return dict(zip(cols, row))
+    return dict(row)
+
+def generate_reports(leads_path=None, leads=None, db_path=None):
+    """
+    Write narrative reports for the top leads.
 
-def generate_reports():
-    if not os.path.exists(LEADS_PATH):
-        print(f"Error: Leads file not found at {LEADS_PATH}")
-        return
+    Uses `leads` when given (already loaded by the caller), otherwise reads
+    `leads_path` (default LEADS_PATH). Case details come from `db_path`
+    (default DB_PATH).
+    """
+    leads_path = leads_path or LEADS_PATH
+    db_path = db_path or DB_PATH
+    if leads is None:
+        if not os.path.exists(leads_path):
+            print(f"Error: Leads file not found at {leads_path}")
+            return
 
-    with open(LEADS_PATH, 'r') as f:
-        leads = json.load(f)
+        with open(leads_path, 'rb') as f:
+            leads = orjson.loads(f.read())
 
     # Use localhost as Ollama runs in the same container
     generator = NarrativeGenerator(ollama_host="http://localhost:11434") 
@@ -45,7 +53,7 @@ def generate_reports():
     # I'll try to detect or just use a robust default.
     
     os.makedirs(REPORTS_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     
     try:
         # Generate reports for top 5 leads
@@ -2,13 +2,14 @@
 Ingest podcast transcripts from YouTube channels.
 """
 
-import json
 import logging
 import os
 import sys
-from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import orjson
+
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -33,50 +34,57 @@ DATA_DIR = Path("data/raw/podcasts")
 def ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
+def ingest_channel(client: YouTubePodcastClient, channel_name: str, channel_url: str, limit: int) -> int:
+    """
+    Fetch and save transcripts for one channel. Returns the number saved.
+    """
+    logger.info(f"Starting ingestion for: {channel_name}")
+    
+    transcripts = client.fetch_channel_transcripts(channel_url=channel_url, limit=limit)
+    
+    count = 0
+    for transcript in transcripts:
+        # Create filename: channel_name_videoid.json
+        safe_name = channel_name.lower().replace(" ", "_")
+        filename = f"{safe_name}_{transcript.video_id}.json"
+        file_path = DATA_DIR / filename
+        
+        # Enrich with channel name since scraper returns generic
+        transcript.channel_name = channel_name
+        
+        logger.info(f"Saving transcript: {transcript.title} ({transcript.video_id})")
+        
+        # Save to JSON (UTF-8; orjson serializes the dataclass, its UUID id and any datetime natively)
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(transcript, option=orjson.OPT_INDENT_2))
+        
+        count += 1
+    
+    logger.info(f"Completed {channel_name}: {count} transcripts saved.")
+    return count
+
 def ingest_podcasts(limit: int = 10):
     """
     Fetch and save transcripts for configuring channels.
+    
+    Channels are network-bound and independent, so each one is ingested on
+    its own thread; a failing channel is logged without stopping the others.
     """
     ensure_dir(DATA_DIR)
     
     client = YouTubePodcastClient()
     
-    for channel_name, channel_url in CHANNELS.items():
-        logger.info(f"Starting ingestion for: {channel_name}")
-        
-        try:
-            transcripts = client.fetch_channel_transcripts(channel_url=channel_url, limit=limit)
-            
-            count = 0
-            for transcript in transcripts:
-                # Create filename: channel_name_videoid.json
-                safe_name = channel_name.lower().replace(" ", "_")
-                filename = f"{safe_name}_{transcript.video_id}.json"
-                file_path = DATA_DIR / filename
-                
-                # Enrich with channel name since scraper returns generic
-                transcript.channel_name = channel_name
-                
-                logger.info(f"Saving transcript: {transcript.title} ({transcript.video_id})")
-                
-                # Save to JSON
-                with open(file_path, "w", encoding="utf-8") as f:
-                    # Convert dataclass to dict, handle datetime serializing if needed (currently none in model)
-                    data = asdict(transcript)
-                    # Convert UUID to str
-                    data['id'] = str(data['id'])
-                    # date handling if we add it later
-                    if data.get('published_at'):
-                         data['published_at'] = data['published_at'].isoformat()
-                         
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                
-                count += 1
-            
-            logger.info(f"Completed {channel_name}: {count} transcripts saved.")
-            
-        except Exception as e:
-            logger.error(f"Failed to ingest channel {channel_name}: {e}")
+    with ThreadPoolExecutor(max_workers=len(CHANNELS)) as executor:
+        futures = {
+            executor.submit(ingest_channel, client, channel_name, channel_url, limit): channel_name
+            for channel_name, channel_url in CHANNELS.items()
+        }
+        for future in as_completed(futures):
+            channel_name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Failed to ingest channel {channel_name}: {e}")
 
 if __name__ == "__main__":
     import argparse
@@ -30,7 +30,8 @@ def ingest_reddit():
     search = SemanticSearch("data/filament.db")
     search.store.create_table("reddit_narratives", 384) # 384 dimensions for all-MiniLM-L6-v2
     
-    for i, post in enumerate(posts):
+    docs = []
+    for post in posts:
         metadata = {
             "title": post.get("title"),
             "url": post.get("url"),
@@ -40,10 +41,10 @@ def ingest_reddit():
         text = f"{post.get('title', '')}\n{post.get('selftext', '')}"
         
         # doc_id must be a string for semantic_search index_document mapping
-        search.index_document("reddit_narratives", str(post.get("id")), text, metadata)
-        
-        if (i + 1) % 10 == 0:
-            print(f"  -> Indexed {i+1}/{len(posts)} posts.")
+        docs.append((str(post.get("id")), text, metadata))
+    
+    search.index_documents("reddit_narratives", docs)
+    print(f"  -> Indexed {len(docs)} posts.")
             
     # Close connection
     search.close()
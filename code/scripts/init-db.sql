@@ -35,8 +35,8 @@ CREATE TABLE IF NOT EXISTS unidentified_cases (
     -- Full text description
     description TEXT,
     
-    -- Vector embedding for semantic search
-    embedding vector(384),
+    -- Vector embedding for semantic search (fp16 halves storage and scan bandwidth)
+    embedding halfvec(384),
     
     -- Metadata
     raw_data JSONB,
@@ -75,8 +75,8 @@ CREATE TABLE IF NOT EXISTS missing_persons (
     -- Full text description
     description TEXT,
     
-    -- Vector embedding for semantic search
-    embedding vector(384),
+    -- Vector embedding for semantic search (fp16 halves storage and scan bandwidth)
+    embedding halfvec(384),
     
     -- Metadata
     raw_data JSONB,
@@ -136,16 +136,41 @@ CREATE TABLE IF NOT EXISTS match_candidates (
     UNIQUE(unidentified_case_id, missing_person_id)
 );
 
+-- =============================================================================
+-- Migration: vector(384) -> halfvec(384) for databases created before the switch
+-- =============================================================================
+-- CREATE TABLE IF NOT EXISTS leaves older tables untouched, so convert their
+-- embedding columns here. The old vector_cosine_ops indexes cannot survive the
+-- type change; they are dropped first and recreated below with halfvec ops.
+DO $$
+BEGIN
+    IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'unidentified_cases'::regclass AND attname = 'embedding') <> 'halfvec(384)' THEN
+        DROP INDEX IF EXISTS idx_unidentified_embedding;
+        ALTER TABLE unidentified_cases ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+    END IF;
+
+    IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'missing_persons'::regclass AND attname = 'embedding') <> 'halfvec(384)' THEN
+        DROP INDEX IF EXISTS idx_missing_embedding;
+        ALTER TABLE missing_persons ALTER COLUMN embedding TYPE halfvec(384) USING embedding::halfvec(384);
+    END IF;
+END $$;
+
 -- =============================================================================
 -- Indexes
 -- =============================================================================
 
 -- Vector similarity indexes
 CREATE INDEX IF NOT EXISTS idx_unidentified_embedding 
-ON unidentified_cases USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
-
-CREATE INDEX IF NOT EXISTS idx_missing_embedding 
-ON missing_persons USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+ON unidentified_cases USING ivfflat (embedding halfvec_cosine_ops) WITH (lists = 100);
+
+-- HNSW for missing persons: match_hybrid runs a top-20 KNN per UHR against it.
+-- Must stay below the halfvec migration: halfvec_cosine_ops rejects a vector
+-- column. The DROP removes a halfvec ivfflat index left by an earlier init.
+DROP INDEX IF EXISTS idx_missing_embedding;
+CREATE INDEX IF NOT EXISTS idx_missing_embedding_hnsw 
+ON missing_persons USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);
 
 CREATE INDEX IF NOT EXISTS idx_clothing_embedding 
 ON clothing USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50);
@@ -1,17 +1,23 @@
 
+import io
 import json
 import os
 import sys
 import psycopg2
-from psycopg2.extras import execute_values
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import torch
 
 # Configuration
 UHR_FILE = 'data/raw/namus_unidentified.json'
 MP_FILE = 'data/raw/namus_missing.json'
 MODEL_NAME = 'all-MiniLM-L6-v2'
-BATCH_SIZE = 100
+COPY_BATCH_SIZE = 1000
+ENCODE_BATCH_SIZE = 128
+
+# Columns loaded by COPY; the first one is the upsert key
+UHR_COLUMNS = ['case_number', 'source', 'discovery_date', 'description', 'discovery_lat', 'discovery_lon', 'raw_data', 'embedding']
+MP_COLUMNS = ['file_number', 'source', 'name', 'last_seen_date', 'description', 'last_seen_lat', 'last_seen_lon', 'raw_data', 'embedding']
 
 def get_db_connection():
     return psycopg2.connect(
@@ -22,6 +28,27 @@ def get_db_connection():
         password=os.getenv('POSTGRES_PASSWORD', 'filament_dev')
     )
 
+def detect_device():
+    """Pick the fastest available torch device for SentenceTransformer."""
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    # On CPU, let torch use every core for the encoder matmuls
+    torch.set_num_threads(os.cpu_count())
+    return "cpu"
+
+_MODEL = None
+
+def get_model():
+    """Load the SentenceTransformer once per process and reuse it."""
+    global _MODEL
+    if _MODEL is None:
+        device = detect_device()
+        print(f"Loading model {MODEL_NAME} on {device}")
+        _MODEL = SentenceTransformer(MODEL_NAME, device=device)
+    return _MODEL
+
 def get_text_description(obj, c_type='uhr'):
     """Create a rich text description for embedding."""
     parts = []
@@ -73,10 +100,9 @@ def load_uhr(conn, model):
         
     print(f"Found {len(data)} UHR cases. Processing")
     
-    cursor = conn.cursor()
     batch = []
     
-    for i, case in enumerate(data):
+    for case in data:
         case_num = case.get('idFormatted')
         if not case_num: continue
         
@@ -101,23 +127,73 @@ def load_uhr(conn, model):
             'raw': json.dumps(case)
         })
         
-        if len(batch) >= BATCH_SIZE:
-            process_batch_uhr(cursor, batch, model)
-            conn.commit()
-            batch = []
-            print(f"Processed {i+1}/{len(data)} UHRs")
-            
-    if batch:
-        process_batch_uhr(cursor, batch, model)
-        conn.commit()
+    embeddings = encode_descriptions(model, batch)
+    copy_upsert(conn, 'unidentified_cases', 'case_number', UHR_COLUMNS, uhr_rows(batch, embeddings), 'UHRs')
 
-def process_batch_uhr(cursor, batch, model):
+def encode_descriptions(model, batch):
+    """
+    Embed every description in one encode call.
+    
+    SentenceTransformer sorts texts by length inside a single call, so
+    encoding the whole file at once pads far less than per-batch calls.
+    """
     texts = [b['description'] for b in batch]
-    embeddings = model.encode(texts)
+    return model.encode(texts, batch_size=ENCODE_BATCH_SIZE, show_progress_bar=True, convert_to_numpy=True)
+
+def vector_literal(vec):
+    """
+    Format an embedding in pgvector's text input form: [v1,v2,...].
+    
+    Values are rounded to float16 for the halfvec(384) columns; the shortest
+    fp16 repr also keeps the COPY payload small.
+    """
+    return '[' + ','.join(map(str, vec.astype(np.float16))) + ']'
+
+def copy_field(value):
+    """Render one value for COPY text format (\\N for NULL, escaped separators)."""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def copy_upsert(conn, table, key, columns, rows, label):
+    """
+    Bulk-load rows into table with COPY instead of per-row INSERTs.
+    
+    Rows are COPYed into a temp staging table with the same column types,
+    then merged with a single INSERT ... SELECT ... ON CONFLICT.
+    """
+    cols = ', '.join(columns)
+    staging = f"staging_{table}"
+    
+    # Later records win on duplicate keys, as with the old per-batch upserts
+    rows = list({row[0]: row for row in rows}.values())
+    
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {cols} FROM {table} WITH NO DATA")
     
-    rows = []
-    for i, item in enumerate(batch):
-        rows.append((
+    for start in range(0, len(rows), COPY_BATCH_SIZE):
+        end = start + COPY_BATCH_SIZE
+        buf = io.StringIO()
+        buf.writelines('\t'.join(map(copy_field, row)) + '\n' for row in rows[start:end])
+        buf.seek(0)
+        cursor.copy_expert(f"COPY {staging} ({cols}) FROM STDIN WITH (FORMAT text)", buf)
+        print(f"Copied {min(end, len(rows))}/{len(rows)} {label}")
+        
+    cursor.execute(f"""
+        INSERT INTO {table} ({cols})
+        SELECT {cols} FROM {staging}
+        ON CONFLICT ({key}) 
+        DO UPDATE SET 
+            description = EXCLUDED.description,
+            embedding = EXCLUDED.embedding,
+            raw_data = EXCLUDED.raw_data;
+    """)
+    conn.commit()
+
+def uhr_rows(batch, embeddings):
+    for item, emb in zip(batch, embeddings):
+        yield (
             item['case_number'],
             item['source'],
             item['discovery_date'],
@@ -125,20 +201,8 @@ def process_batch_uhr(cursor, batch, model):
             item['lat'],
             item['lon'],
             item['raw'],
-            embeddings[i].tolist()
-        ))
-        
-    sql = """
-        INSERT INTO unidentified_cases 
-        (case_number, source, discovery_date, description, discovery_lat, discovery_lon, raw_data, embedding)
-        VALUES %s
-        ON CONFLICT (case_number) 
-        DO UPDATE SET 
-            description = EXCLUDED.description,
-            embedding = EXCLUDED.embedding,
-            raw_data = EXCLUDED.raw_data;
-    """
-    execute_values(cursor, sql, rows)
+            vector_literal(emb)
+        )
 
 def load_mp(conn, model):
     print(f"Loading MP from {MP_FILE}")
@@ -147,10 +211,9 @@ def load_mp(conn, model):
         
     print(f"Found {len(data)} MP cases. Processing")
     
-    cursor = conn.cursor()
     batch = []
     
-    for i, case in enumerate(data):
+    for case in data:
         case_num = case.get('idFormatted')
         if not case_num: continue
         
@@ -175,23 +238,12 @@ def load_mp(conn, model):
             'raw': json.dumps(case)
         })
         
-        if len(batch) >= BATCH_SIZE:
-            process_batch_mp(cursor, batch, model)
-            conn.commit()
-            batch = []
-            print(f"Processed {i+1}/{len(data)} MPs")
-            
-    if batch:
-        process_batch_mp(cursor, batch, model)
-        conn.commit()
+    embeddings = encode_descriptions(model, batch)
+    copy_upsert(conn, 'missing_persons', 'file_number', MP_COLUMNS, mp_rows(batch, embeddings), 'MPs')
 
-def process_batch_mp(cursor, batch, model):
-    texts = [b['description'] for b in batch]
-    embeddings = model.encode(texts)
-    
-    rows = []
-    for i, item in enumerate(batch):
-        rows.append((
+def mp_rows(batch, embeddings):
+    for item, emb in zip(batch, embeddings):
+        yield (
             item['file_number'],
             item['source'],
             item['name'],
@@ -200,27 +252,14 @@ def process_batch_mp(cursor, batch, model):
             item['lat'],
             item['lon'],
             item['raw'],
-            embeddings[i].tolist()
-        ))
-        
-    sql = """
-        INSERT INTO missing_persons 
-        (file_number, source, name, last_seen_date, description, last_seen_lat, last_seen_lon, raw_data, embedding)
-        VALUES %s
-        ON CONFLICT (file_number) 
-        DO UPDATE SET 
-            description = EXCLUDED.description,
-            embedding = EXCLUDED.embedding,
-            raw_data = EXCLUDED.raw_data;
-    """
-    execute_values(cursor, sql, rows)
+            vector_literal(emb)
+        )
 
 def main():
     print("Initializing Database Loader with RAG Embeddings")
     conn = get_db_connection()
     
-    print(f"Loading model {MODEL_NAME}")
-    model = SentenceTransformer(MODEL_NAME)
+    model = get_model()
     
     load_uhr(conn, model)
     load_mp(conn, model)
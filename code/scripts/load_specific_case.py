@@ -3,17 +3,14 @@ import json
 import os
 import psycopg2
 from psycopg2.extras import execute_values
-from sentence_transformers import SentenceTransformer
 
 # Reuse logic
-from load_namus_to_db import get_text_description, get_db_connection
-
-MODEL_NAME = 'all-MiniLM-L6-v2'
+from load_namus_to_db import get_text_description, get_db_connection, get_model
 
 def main():
     print("Loading specific cases")
     conn = get_db_connection()
-    model = SentenceTransformer(MODEL_NAME)
+    model = get_model()
     cursor = conn.cursor()
     
     # Load UHR 77011
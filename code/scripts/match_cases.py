@@ -22,6 +22,8 @@ import unicodedata
 import difflib
 import re
 
+import numpy as np
+
 try:
     from tqdm import tqdm
     HAS_TQDM = True
@@ -38,6 +40,20 @@ except ImportError:
 DATA_DIR = "data/raw"
 OUTPUT_DIR = "data/processed"
 
+MP_DATE_FIELDS = ['dateOfLastContact', 'dateMissing', 'sighting.date']
+DATETIME_EPOCH = datetime(1, 1, 1)
+
+# Common stopwords to ignore in feature matching
+FEATURE_STOPWORDS = {'no', 'none', 'unknown', 'the', 'a', 'and', 'or', 'on', 'left', 'right', 'upper', 'lower', 'arm', 'leg', 'body', 'description', 'tattoo', 'scar'}
+
+TATTOO_KEYWORDS = ['eagle', 'cross', 'heart', 'skull', 'dragon', 'rose', 'star', 'name', 
+                   'tribal', 'butterfly', 'angel', 'snake', 'lion', 'tiger', 'flower']
+
+CLOTHING_BRANDS = ['nike', 'adidas', 'levis', 'wrangler', 'hanes', 'old navy', 'gap', 'champion']
+
+# Height tolerance (cm) used by the height filter and score
+HEIGHT_TOLERANCE = 15
+
 # State adjacency for nearby matching (simplified - US states)
 NEARBY_STATES = {
     'AL': ['FL', 'GA', 'MS', 'TN'], 'AK': [], 'AZ': ['CA', 'NM', 'NV', 'UT'],
@@ -311,7 +327,7 @@ def get_height_range(case, is_uhr=True):
 
 
 def build_mp_index(mp_cases, geo_filter=True):
-    """Build index for fast lookup."""
+    """Build index for fast lookup. Buckets hold positions into mp_cases."""
     if geo_filter:
         print("Building MP index (sex × state)")
     else:
@@ -320,14 +336,14 @@ def build_mp_index(mp_cases, geo_filter=True):
     # Index structure: sex -> state -> list of MPs (or sex -> None -> all)
     index = defaultdict(lambda: defaultdict(list))
     
-    for mp in mp_cases:
+    for i, mp in enumerate(mp_cases):
         sex = normalize_sex(mp.get('gender') or mp.get('sex') or mp.get('details', {}).get('Gender'))
         
         if geo_filter:
             state = get_state(mp)
-            index[sex][state].append(mp)
+            index[sex][state].append(i)
         
-        index[sex][None].append(mp)  # Always add to "any state" bucket
+        index[sex][None].append(i)  # Always add to "any state" bucket
     
     # Stats
     print(f"  Indexed {len(mp_cases)} MPs into {len(index)} sex buckets")
@@ -336,7 +352,7 @@ def build_mp_index(mp_cases, geo_filter=True):
 
 
 def get_candidate_mps(mp_index, uhr_sex, uhr_state):
-    """Get candidate MPs for a UHR based on sex and nearby states."""
+    """Get candidate MP positions for a UHR based on sex and nearby states."""
     candidates = []
     
     # Same sex candidates
@@ -365,17 +381,140 @@ def get_candidate_mps(mp_index, uhr_sex, uhr_state):
     return candidates
 
 
+def feature_words(text):
+    """Lowercased word set of a feature text, minus FEATURE_STOPWORDS."""
+    return set(re.findall(r'\w+', text.lower())) - FEATURE_STOPWORDS
+
+
+def prepare_uhr(uhr):
+    """Derive the UHR fields score_prepared needs, once per UHR."""
+    features = uhr.get('featureText', '') or ''
+    clothing = uhr.get('clothingText', '') or ''
+    dod_min, dod_max = get_estimated_dod(uhr)
+    return {
+        'case': uhr,
+        'dod_min': dod_min,
+        'dod_max': dod_max,
+        'age': get_age_range(uhr, True),
+        'height': get_height_range(uhr, True),
+        'features': features,
+        'words': feature_words(features) if features else set(),
+        'features_lower': features.lower(),
+        'clothing': clothing,
+        'clothing_lower': clothing.lower(),
+    }
+
+
+def prepare_mp(mp):
+    """Derive the MP fields score_prepared needs, once per MP."""
+    mp_date = get_date(mp, MP_DATE_FIELDS)
+    mp_dt = None
+    if mp_date:
+        try:
+            mp_dt = datetime(mp_date[0], mp_date[1], mp_date[2])
+        except ValueError:
+            pass  # score_prepared re-raises if the date is ever used
+    features = (mp.get('tattoos', '') or '') + ' ' + (mp.get('scarsMarks', '') or '')
+    clothing = (mp.get('clothingDescription', '') or '') + ' ' + (mp.get('lastSeenWearing', '') or '')
+    return {
+        'case': mp,
+        'date': mp_date,
+        'dt': mp_dt,
+        'age': get_age_range(mp, False),
+        'height': get_height_range(mp, False),
+        'features': features,
+        'words': feature_words(features),
+        'tattoos_lower': (mp.get('tattoos', '') or '').lower(),
+        'clothing': clothing,
+        'clothing_lower': clothing.lower(),
+    }
+
+
+def build_mp_columns(mp_records):
+    """
+    Transpose prepared MPs into NumPy columns for the hard filters.
+    
+    Missing values are NaN; dates that cannot be compared exactly as numbers
+    (invalid calendar dates, out-of-range parts) are marked unusable so those
+    pairs are left to the scalar checks in score_prepared.
+    """
+    n = len(mp_records)
+    cols = {
+        'age_min': np.empty(n, dtype=np.float64),
+        'age_max': np.empty(n, dtype=np.float64),
+        'height_min': np.full(n, np.nan),
+        'height_max': np.full(n, np.nan),
+        'dt_days': np.full(n, np.nan),
+        'date_key': np.full(n, np.nan),
+    }
+    for i, m in enumerate(mp_records):
+        cols['age_min'][i], cols['age_max'][i] = m['age']
+        if m['height'][0]:
+            cols['height_min'][i], cols['height_max'][i] = m['height']
+        if m['dt'] is not None:
+            cols['dt_days'][i] = (m['dt'] - DATETIME_EPOCH).days
+        cols['date_key'][i] = date_key(m['date'])
+    return cols
+
+
+def date_key(date_tuple):
+    """(year, month, day) as a number with the same ordering, or NaN."""
+    if not date_tuple:
+        return np.nan
+    year, month, day = date_tuple
+    if not (0 <= month < 100 and 0 <= day < 100 and abs(year) < 10**9):
+        return np.nan
+    return float(year * 10000 + month * 100 + day)
+
+
+def prefilter_candidates(u, uhr_date, cols, idx):
+    """
+    Drop candidates that score_prepared would reject on date, age or height.
+    
+    Vectorized over the candidate positions `idx`; conservative, so any pair
+    it keeps is still checked (and scored) by score_prepared.
+    """
+    age_min = cols['age_min'][idx]
+    age_max = cols['age_max'][idx]
+    keep = ~((u['age'][1] < age_min - 10) | (u['age'][0] > age_max + 15))
+    
+    if u['dod_min'] and u['dod_max']:
+        dod_max_days = (u['dod_max'] - DATETIME_EPOCH).total_seconds() / 86400
+        # Small slack so float rounding never drops a pair the datetime check keeps
+        keep &= ~(cols['dt_days'][idx] - 30 > dod_max_days + 1e-6)
+    elif uhr_date:
+        uhr_key = date_key(uhr_date)
+        if not np.isnan(uhr_key):
+            keep &= ~(cols['date_key'][idx] > uhr_key)
+    
+    uhr_height = u['height']
+    if uhr_height[0]:
+        height_min = cols['height_min'][idx]
+        height_max = cols['height_max'][idx]
+        keep &= ~((uhr_height[1] + HEIGHT_TOLERANCE < height_min) |
+                  (uhr_height[0] - HEIGHT_TOLERANCE > height_max))
+    
+    return idx[keep]
+
+
 def score_pair(uhr, mp, uhr_date):
     """Score a candidate pair. Returns (score, reasons) or None."""
+    return score_prepared(prepare_uhr(uhr), prepare_mp(mp), uhr_date)
+
+
+def score_prepared(u, m, uhr_date):
+    """score_pair over prepare_uhr / prepare_mp records."""
+    uhr = u['case']
+    mp = m['case']
     reasons = []
     
     # Date filter: MP must be missing BEFORE UHR found (full date comparison)
     # New: Use PMI for Estimated Date of Death (DoD)
-    dod_min, dod_max = get_estimated_dod(uhr)
-    mp_date = get_date(mp, ['dateOfLastContact', 'dateMissing', 'sighting.date'])
+    dod_min, dod_max = u['dod_min'], u['dod_max']
+    mp_date = m['date']
     
     if mp_date and dod_min and dod_max:
-        mp_dt = datetime(mp_date[0], mp_date[1], mp_date[2])
+        mp_dt = m['dt'] or datetime(mp_date[0], mp_date[1], mp_date[2])
         
         # If MP went missing significantly AFTER the estimated latest DoD, it's impossible
         # Margin of error: 30 days
@@ -386,8 +525,8 @@ def score_pair(uhr, mp, uhr_date):
         return None
     
     # Age filter
-    uhr_age = get_age_range(uhr, True)
-    mp_age = get_age_range(mp, False)
+    uhr_age = u['age']
+    mp_age = m['age']
     
     # Check overlap with tolerance
     if uhr_age[1] < mp_age[0] - 10 or uhr_age[0] > mp_age[1] + 15:
@@ -403,13 +542,13 @@ def score_pair(uhr, mp, uhr_date):
         reasons.append(f"Age: UHR {uhr_age[0]}-{uhr_age[1]}, MP ~{mp_age[0]}")
     
     # Height filter (±15cm tolerance)
-    uhr_height = get_height_range(uhr, True)
-    mp_height = get_height_range(mp, False)
+    uhr_height = u['height']
+    mp_height = m['height']
     height_score = 0.5  # Default neutral
     
     if uhr_height[0] and mp_height[0]:
         # Both have height data - check overlap
-        tolerance = 15  # cm
+        tolerance = HEIGHT_TOLERANCE  # cm
         if uhr_height[1] + tolerance < mp_height[0] or uhr_height[0] - tolerance > mp_height[1]:
             return None  # Heights don't overlap
         
@@ -494,15 +633,13 @@ def score_pair(uhr, mp, uhr_date):
     
     # Feature matching (Jaccard + Fuzzy)
     feature_score = 0.5  # Default neutral
-    uhr_features = uhr.get('featureText', '') or ''
-    mp_features = (mp.get('tattoos', '') or '') + ' ' + (mp.get('scarsMarks', '') or '')
-    
-    # Common stopwords to ignore
-    STOPWORDS = {'no', 'none', 'unknown', 'the', 'a', 'and', 'or', 'on', 'left', 'right', 'upper', 'lower', 'arm', 'leg', 'body', 'description', 'tattoo', 'scar'}
+    uhr_features = u['features']
+    mp_features = m['features']
     
     if uhr_features and mp_features:
-        uhr_words = set(re.findall(r'\w+', uhr_features.lower())) - STOPWORDS
-        mp_words = set(re.findall(r'\w+', mp_features.lower())) - STOPWORDS
+        # Precomputed word sets; only read here, never mutated
+        uhr_words = u['words']
+        mp_words = m['words']
         
         if uhr_words and mp_words:
             # Jaccard Similarity
@@ -524,21 +661,18 @@ def score_pair(uhr, mp, uhr_date):
             
             if final_score > 0.1:
                 feature_score = min(1.0, 0.5 + final_score * 2) # Boost score
-                cleaned_matches = intersection - STOPWORDS
+                cleaned_matches = intersection - FEATURE_STOPWORDS
                 if cleaned_matches:
                     reasons.append(f"Features: {', '.join(list(cleaned_matches)[:3])}")
     
     tattoo_bonus = 0
     # Tattoo Keyword Bonus (remains same)
     if uhr.get('hasTattoo'):
-        uhr_tattoo_text = uhr_features.lower()
-        mp_tattoo_text = (mp.get('tattoos', '') or '').lower()
+        uhr_tattoo_text = u['features_lower']
+        mp_tattoo_text = m['tattoos_lower']
         
         # Look for specific tattoo keywords
-        tattoo_keywords = ['eagle', 'cross', 'heart', 'skull', 'dragon', 'rose', 'star', 'name', 
-                          'tribal', 'butterfly', 'angel', 'snake', 'lion', 'tiger', 'flower']
-        
-        for keyword in tattoo_keywords:
+        for keyword in TATTOO_KEYWORDS:
             if keyword in uhr_tattoo_text and keyword in mp_tattoo_text:
                 tattoo_bonus = 0.15
                 reasons.append(f"Tattoo: {keyword}")
@@ -546,14 +680,13 @@ def score_pair(uhr, mp, uhr_date):
     
     # Clothing text matching
     clothing_score = 0.5
-    uhr_clothing = uhr.get('clothingText', '') or ''
-    mp_clothing = (mp.get('clothingDescription', '') or '') + ' ' + (mp.get('lastSeenWearing', '') or '')
+    uhr_clothing = u['clothing']
+    mp_clothing = m['clothing']
     
     if uhr_clothing and mp_clothing:
         # Look for brand matches
-        brands = ['nike', 'adidas', 'levis', 'wrangler', 'hanes', 'old navy', 'gap', 'champion']
-        for brand in brands:
-            if brand in uhr_clothing.lower() and brand in mp_clothing.lower():
+        for brand in CLOTHING_BRANDS:
+            if brand in u['clothing_lower'] and brand in m['clothing_lower']:
                 clothing_score = 0.8
                 reasons.append(f"Clothing: {brand}")
                 break
@@ -572,6 +705,9 @@ def score_pair(uhr, mp, uhr_date):
 def match_all(uhr_cases, mp_cases, min_score=0.4, max_per_uhr=5, geo_filter=True):
     """Match with smart filtering."""
     mp_index = build_mp_index(mp_cases, geo_filter=geo_filter)
+    # Derive MP fields once (not per pair) and transpose them for the filters
+    mp_records = [prepare_mp(mp) for mp in mp_cases]
+    mp_cols = build_mp_columns(mp_records)
     
     all_matches = []
     skipped = 0
@@ -595,12 +731,20 @@ def match_all(uhr_cases, mp_cases, min_score=0.4, max_per_uhr=5, geo_filter=True
             # No geo filter - get all MPs of same/unknown sex
             candidates = mp_index.get(uhr_sex, {}).get(None, []) + mp_index.get('U', {}).get(None, [])
         compared += len(candidates)
+        if not candidates:
+            continue
+        
+        # Only derived once there is something to score: get_estimated_dod
+        # raises on unparseable found dates, as score_pair did per pair
+        u = prepare_uhr(uhr)
+        candidates = prefilter_candidates(u, uhr_date, mp_cols, np.asarray(candidates, dtype=np.intp))
         
         matches = []
-        for mp in candidates:
-            result = score_pair(uhr, mp, uhr_date)
+        for j in candidates.tolist():
+            result = score_prepared(u, mp_records[j], uhr_date)
             if result and result[0] >= min_score:
                 score, reasons = result
+                mp = mp_cases[j]
                 mp_id = mp.get('idFormatted') or mp.get('namus2Number') or mp.get('case_id')
                 mp_name = f"{mp.get('firstName', '')} {mp.get('lastName', '')}".strip()
                 matches.append({
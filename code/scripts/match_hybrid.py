@@ -37,6 +37,25 @@ DB_PORT = os.getenv('POSTGRES_PORT', '5432')
 DB_NAME = os.getenv('POSTGRES_DB', 'filament')
 DB_USER = os.getenv('POSTGRES_USER', 'filament')
 DB_PASS = os.getenv('POSTGRES_PASSWORD', 'filament_dev')
+HNSW_EF_SEARCH = 100
+
+# KNN + Hard Filters (Sex) for every UHR in one round-trip: the LATERAL
+# subquery runs a top-20 HNSW search per (case_number, target_sex) pair.
+# A NULL target sex skips the filter.
+MP_KNN_SQL = """
+    SELECT q.case_number, mp.file_number, mp.similarity
+    FROM unnest(%s::text[], %s::text[]) WITH ORDINALITY AS q(case_number, target_sex, ord)
+    JOIN unidentified_cases u ON u.case_number = q.case_number
+    CROSS JOIN LATERAL (
+        SELECT m.file_number,
+               1 - (m.embedding <=> u.embedding) as similarity
+        FROM missing_persons m
+        WHERE m.embedding IS NOT NULL
+          AND (q.target_sex IS NULL OR m.sex IS NULL OR m.sex = 'Unknown' OR m.sex = 'Uncertain' OR m.sex = q.target_sex)
+        ORDER BY m.embedding <=> u.embedding LIMIT 20
+    ) mp
+    ORDER BY q.ord, mp.similarity DESC
+"""
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS ai_note(
@@ -300,13 +319,43 @@ def main():
     # 1. Get UHR cases (embedding for search, raw_data for scoring)
     print("Fetching UHR cases")
     cursor.execute("""
-        SELECT case_number, discovery_date, estimated_sex, raw_data, embedding
+        SELECT case_number, discovery_date, estimated_sex, raw_data
         FROM unidentified_cases
         WHERE embedding IS NOT NULL
     """)
     uhr_cases = cursor.fetchall()
     print(f"Loaded {len(uhr_cases)} UHR cases.")
     
+    # 2. KNN candidates for all UHRs at once
+    print("Fetching KNN candidates")
+    case_numbers = []
+    target_sexes = []
+    for uhr in uhr_cases:
+        # Strict Sex Filter (DB Side)
+        uhr_sex = normalize_sex(uhr['estimated_sex'])
+        target_sex = None
+        if uhr_sex != 'U':
+            target_sex = 'Female' if uhr_sex == 'F' else 'Male'
+        case_numbers.append(uhr['case_number'])
+        target_sexes.append(target_sex)
+    
+    # Use the HNSW index with a wider candidate list than the default 40
+    cursor.execute(f"SET hnsw.ef_search = {HNSW_EF_SEARCH}")
+    cursor.execute(MP_KNN_SQL, (case_numbers, target_sexes))
+    knn = {}
+    for row in cursor.fetchall():
+        knn.setdefault(row['case_number'], []).append((row['file_number'], row['similarity']))
+    
+    # Fetch raw_data once per candidate MP to pass to score_pair
+    candidate_ids = list({fn for hits in knn.values() for fn, _ in hits})
+    cursor.execute("""
+        SELECT file_number, name, raw_data
+        FROM missing_persons
+        WHERE file_number = ANY(%s)
+    """, (candidate_ids,))
+    mp_by_id = {row['file_number']: row for row in cursor.fetchall()}
+    print(f"Loaded {len(mp_by_id)} candidate MPs.")
+    
     matches = []
     
     print("Matching")
@@ -317,37 +366,12 @@ def main():
             print(f"Processed {count}/{len(uhr_cases)}")
         count += 1
         
-        uhr_emb = uhr['embedding']
         uhr_raw = uhr['raw_data']
-        uhr_sex = normalize_sex(uhr['estimated_sex'])
         uhr_date = get_date(uhr_raw, ['circumstances.dateFound']) # Use helper on raw
         
-        # Build Query: KNN + Hard Filters (Sex)
-        # Fetch raw_data for MPs to pass to score_pair
-        
-        sql = """
-            SELECT file_number, name, raw_data,
-                   1 - (embedding <=> %s::vector) as similarity
-            FROM missing_persons
-            WHERE embedding IS NOT NULL
-        """
-        params = [uhr_emb]
-        
-        # Strict Sex Filter (DB Side)
-        if uhr_sex != 'U':
-            target_sex = 'Female' if uhr_sex == 'F' else 'Male'
-            sql += " AND (sex IS NULL OR sex = 'Unknown' OR sex = 'Uncertain' OR sex = %s)"
-            params.append(target_sex)
-            
-        sql += " ORDER BY embedding <=> %s::vector LIMIT 20"
-        params.append(uhr_emb)
-        
-        cursor.execute(sql, params)
-        candidates = cursor.fetchall()
-        
-        for mp in candidates:
+        for file_number, vector_score in knn.get(uhr['case_number'], []):
+            mp = mp_by_id[file_number]
             mp_raw = mp['raw_data']
-            vector_score = mp['similarity']
             
             # Extract Narratives for Story Line
             uhr_circ = uhr_raw.get('circumstances', {}).get('circumstancesOfRecovery', '')
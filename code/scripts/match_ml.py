@@ -8,7 +8,6 @@ import sqlite3
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import numpy as np
-from sklearn.neighbors import NearestNeighbors
 from datetime import datetime
 
 # Add current dir to path to import local modules
@@ -21,6 +20,7 @@ if code_dir not in sys.path:
 
 from train_matching_model import extract_features, FEATURES
 from core.knowledge_note import content_hash, normalize_note, serialize_metadata
+from core.search.embedding_index import EmbeddingIndex
 from knowledge_review import insert_review
 
 # Config
@@ -30,6 +30,7 @@ DB_NAME = os.getenv('POSTGRES_DB', 'filament')
 DB_USER = os.getenv('POSTGRES_USER', 'filament')
 DB_PASS = os.getenv('POSTGRES_PASSWORD', 'filament_dev')
 MODEL_PATH = 'data/processed/match_classifier.pkl'
+N_NEIGHBORS = 50
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS ai_note(
@@ -243,9 +244,21 @@ def get_db():
         host=DB_HOST, port=DB_PORT, dbname=DB_NAME, user=DB_USER, password=DB_PASS
     )
 
-def parse_emb(e):
-    if e is None: return None
-    return np.array(json.loads(e) if isinstance(e, str) else e)
+def embedding_matrix(values):
+    """
+    Stack embeddings into one float64 matrix (one row per value).
+    
+    pgvector returns text like '[v1,v2,...]'; all rows are joined and parsed
+    by a single np.fromstring call instead of a json.loads per row. float64
+    matches train_matching_model's json.loads parsing, so extract_features
+    computes vector_sim at the precision the classifier was trained on.
+    """
+    if not values:
+        return np.empty((0, 0), dtype=np.float64)
+    if all(isinstance(v, str) for v in values):
+        flat = np.fromstring(','.join(v[1:-1] for v in values), dtype=np.float64, sep=',')
+        return flat.reshape(len(values), -1)
+    return np.array([json.loads(v) if isinstance(v, str) else v for v in values], dtype=np.float64)
 
 def main():
     parser = argparse.ArgumentParser(description="Optimized ML Matching Inference (In-Memory)")
@@ -276,30 +289,26 @@ def main():
     """)
     mp_rows = cursor.fetchall()
     
+    mp_matrix = embedding_matrix([row['embedding'] for row in mp_rows])
     mp_data = []
-    mp_vectors = []
     
-    for row in mp_rows:
-        vec = parse_emb(row['embedding'])
-        if vec is not None:
-            mp_vectors.append(vec)
-            mp_data.append({
-                'last_seen_date': row['last_seen_date'],
-                'age_at_disappearance': row['age_at_disappearance'],
-                'sex': row['sex'],
-                'description': row['description'],
-                'embedding': vec, # Keep as array
-                'file_number': row['file_number'],
-                'name': row['name']
-            })
+    for row, vec in zip(mp_rows, mp_matrix):
+        mp_data.append({
+            'last_seen_date': row['last_seen_date'],
+            'age_at_disappearance': row['age_at_disappearance'],
+            'sex': row['sex'],
+            'description': row['description'],
+            'embedding': vec, # Row view of mp_matrix
+            'file_number': row['file_number'],
+            'name': row['name']
+        })
             
-    mp_matrix = np.array(mp_vectors)
     print(f"Loaded {len(mp_data)} MPs. Matrix shape: {mp_matrix.shape}")
     
-    # 2. Build KNN Index
-    print("Building NearestNeighbors Index")
-    nbrs = NearestNeighbors(n_neighbors=50, metric='cosine', algorithm='brute')
-    nbrs.fit(mp_matrix)
+    # 2. Build KNN Index (FAISS HNSW when installed, exact NumPy otherwise)
+    print("Building Embedding Index")
+    index = EmbeddingIndex(mp_matrix.shape[1])
+    index.add(mp_matrix)
     
     # 3. Load All UHRs
     print("Loading UHR cases")
@@ -317,49 +326,47 @@ def main():
     # 4. Batch Processing
     # We can query all UHRs at once!
     
-    uhr_vectors = []
+    uhr_matrix = embedding_matrix([row['embedding'] for row in uhr_rows])
     uhr_data = []
     
-    for row in uhr_rows:
-        vec = parse_emb(row['embedding'])
-        if vec is not None:
-            uhr_vectors.append(vec)
-            uhr_data.append({
-                'discovery_date': row['discovery_date'],
-                'estimated_age_min': row['estimated_age_min'],
-                'estimated_age_max': row['estimated_age_max'],
-                'sex': row['estimated_sex'],
-                'description': row['description'],
-                'embedding': vec,
-                'case_number': row['case_number']
-            })
+    for row, vec in zip(uhr_rows, uhr_matrix):
+        uhr_data.append({
+            'discovery_date': row['discovery_date'],
+            'estimated_age_min': row['estimated_age_min'],
+            'estimated_age_max': row['estimated_age_max'],
+            'sex': row['estimated_sex'],
+            'description': row['description'],
+            'embedding': vec,
+            'case_number': row['case_number']
+        })
             
-    if not uhr_vectors:
+    if not uhr_data:
         print("No UHR vectors found.")
         return
         
-    uhr_matrix = np.array(uhr_vectors)
     print(f"Querying KNN for {uhr_matrix.shape[0]} cases")
     
-    # Calculate Distances (batch)
-    # n_neighbors=50
-    # Note: sklearn returns DISTANCE (cosine distance = 1 - sim).
-    # Higher sim = Lower distance.
-    distances, indices = nbrs.kneighbors(uhr_matrix)
+    # Calculate Similarities (batch)
+    # Note: the index returns cosine SIMILARITY, best first.
+    # Unfilled slots (fewer MPs than N_NEIGHBORS) have index -1.
+    similarities, indices = index.search(uhr_matrix, k=N_NEIGHBORS)
     
     print("Scoring candidates")
     
     # Process only a subset for demo speed
     uhr_data = uhr_data[:100]
     
+    pairs = []
+    feats_all = []
+    
     for i, uhr in enumerate(uhr_data):
         neighbor_idxs = indices[i]
         
         # Hard Filter Logic (Sex)
         uhr_sex = uhr['sex']
         
-        candidates = []
         for idx in neighbor_idxs:
+            if idx < 0: continue
             mp = mp_data[idx]
             
             # Check Sex Filter
@@ -370,31 +377,24 @@ def main():
                 
             # Date Check? Model handles it, but maybe pre-filter? 
             # Let model handle it.
-            candidates.append(mp)
             
-        if not candidates: continue
-        
-        # Extract Features for surviving candidates
-        feats_batch = []
-        for mp in candidates:
-            f = extract_features(uhr, mp)
-            feats_batch.append(f)
+            # Extract Features for surviving candidates
+            pairs.append((uhr, mp))
+            feats_all.append(extract_features(uhr, mp))
             
-        if not feats_batch: continue
-        
-        # Bulk Predict
-        probs = clf.predict_proba(feats_batch)[:, 1] # Class 1
+    # Bulk Predict: one predict_proba over every (UHR, MP) pair
+    if feats_all:
+        probs = clf.predict_proba(np.asarray(feats_all, dtype=np.float64))[:, 1] # Class 1
         
-        for j, prob in enumerate(probs):
-            if prob > 0.6: # Configurable Threshold
-                mp = candidates[j]
-                matches.append({
-                    'uhr_id': uhr['case_number'],
-                    'mp_id': mp['file_number'],
-                    'mp_name': mp['name'],
-                    'score': round(float(prob), 4),
-                    'features': dict(zip(FEATURES, feats_batch[j]))
-                })
+        for j in np.flatnonzero(probs > 0.6): # Configurable Threshold
+            uhr, mp = pairs[j]
+            matches.append({
+                'uhr_id': uhr['case_number'],
+                'mp_id': mp['file_number'],
+                'mp_name': mp['name'],
+                'score': round(float(probs[j]), 4),
+                'features': dict(zip(FEATURES, feats_all[j]))
+            })
                 
     matches.sort(key=lambda x: x['score'], reverse=True)
     
@@ -58,7 +58,7 @@ def find_matches(uhr_id, limit=20):
             name, 
             description, 
             last_seen_date, 
-            embedding <-> %s::vector AS distance,
+            embedding <-> %s::halfvec AS distance,
             raw_data->'subjectDescription'->'sex'->>'name' as sex,
             (raw_data->'subjectDescription'->>'heightFrom')::numeric as height
         FROM missing_persons
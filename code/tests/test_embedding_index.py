@@ -0,0 +1,78 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.search import embedding_index
+from core.search.embedding_index import EmbeddingIndex
+
+
+def _vectors():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(20, 8)).astype(np.float32)
+
+
+def test_numpy_save_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_index, "HAS_FAISS", False)
+    vectors = _vectors()
+    index = EmbeddingIndex(8)
+    index.add(vectors)
+    path = str(tmp_path / "index.bin")
+    index.save(path)
+
+    loaded = EmbeddingIndex.load(path)
+
+    assert len(loaded) == 20
+    scores, ids = loaded.search(vectors[3], k=1)
+    assert ids[0, 0] == 3
+    assert scores[0, 0] == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.skipif(not embedding_index.HAS_FAISS, reason="faiss not installed")
+def test_numpy_file_loads_into_faiss_backend(tmp_path, monkeypatch):
+    vectors = _vectors()
+    path = str(tmp_path / "index.bin")
+    with monkeypatch.context() as m:
+        m.setattr(embedding_index, "HAS_FAISS", False)
+        index = EmbeddingIndex(8)
+        index.add(vectors)
+        index.save(path)
+
+    loaded = EmbeddingIndex.load(path)
+
+    assert loaded.index is not None
+    assert len(loaded) == 20
+    _, ids = loaded.search(vectors[5], k=1)
+    assert ids[0, 0] == 5
+
+
+@pytest.mark.skipif(not embedding_index.HAS_FAISS, reason="faiss not installed")
+def test_faiss_save_load_round_trip(tmp_path):
+    vectors = _vectors()
+    index = EmbeddingIndex(8, exact=True)
+    index.add(vectors)
+    path = str(tmp_path / "index.bin")
+    index.save(path)
+
+    loaded = EmbeddingIndex.load(path)
+
+    assert loaded.dimension == 8
+    assert len(loaded) == 20
+    _, ids = loaded.search(vectors[7], k=1)
+    assert ids[0, 0] == 7
+
+
+def test_faiss_file_without_faiss_raises(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.bin")
+    with open(path, "wb") as f:
+        np.savez(f, backend="faiss", data=np.zeros(4, dtype=np.uint8))
+    monkeypatch.setattr(embedding_index, "HAS_FAISS", False)
+
+    with pytest.raises(ImportError):
+        EmbeddingIndex.load(path)
@@ -0,0 +1,34 @@
+import math
+import os
+import sys
+from datetime import date
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.extraction.entities import Location, Person, PersonTable
+
+
+def test_person_table_mirrors_numeric_fields():
+    persons = [
+        Person(
+            case_number="UP1", person_type="unidentified", estimated_sex="Female",
+            estimated_age_min=20, estimated_age_max=30, discovery_date=date(2010, 6, 1),
+            location=Location(name="Hope", latitude=49.38, longitude=-121.44),
+            description="rose tattoo",
+        ),
+        Person(case_number="MP1", person_type="missing"),
+    ]
+
+    table = PersonTable.from_persons(persons)
+
+    assert len(table) == 2
+    assert table.case_numbers.tolist() == ["UP1", "MP1"]
+    assert table.age_min[0] == 20 and math.isnan(table.age_min[1])
+    assert math.isclose(table.latitude[0], 49.38, rel_tol=1e-6) and math.isnan(table.longitude[1])
+    assert str(table.discovery_date[0]) == "2010-06-01"
+    assert str(table.discovery_date[1]) == "NaT"
+    assert table.descriptions == ["rose tattoo", ""]
+    assert table.to_persons() == persons
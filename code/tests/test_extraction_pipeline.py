@@ -0,0 +1,106 @@
+import os
+import pickle
+import sys
+from datetime import date
+
+import numpy as np
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.extraction.entities import Clothing, Location, Person, PhysicalFeature
+from core.extraction import pipeline as pipeline_module
+from core.extraction.pipeline import ExtractionPipeline
+
+
+class CountingPipeline(ExtractionPipeline):
+    """Pipeline whose extraction step is a stub that counts LLM calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def _load_text(self, file_path):
+        return file_path.read_text()
+
+    def _extract_from_text(self, text):
+        self.calls += 1
+        return Person(
+            case_number=text.split()[0],
+            discovery_date=date(2010, 6, 1),
+            location=Location(name="Hope", latitude=49.38),
+            physical_features=[PhysicalFeature(category="skin", description="rose tattoo")],
+            clothing=[Clothing(item_type="jacket", brand="Old Navy")],
+        )
+
+
+def test_process_file_reuses_cached_extraction(tmp_path):
+    report = tmp_path / "UP1.txt"
+    report.write_text("UP1 Female remains with rose tattoo")
+    pipeline = CountingPipeline(cache_path=str(tmp_path / "cache.db"))
+
+    first = pipeline.process_file(report)
+    second = pipeline.process_file(report)
+
+    assert pipeline.calls == 1
+    assert second == first
+
+    pipeline.llm_model = "mistral"
+    pipeline.process_file(report)
+    assert pipeline.calls == 2
+
+    pipeline.close()
+
+
+class LetterCountModel:
+    """Tiny stand-in for EmbeddingModel: letter-frequency vectors."""
+
+    dimension = 26
+
+    def embed_batch(self, texts, normalize=False):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if "a" <= char <= "z":
+                    vectors[row, ord(char) - ord("a")] += 1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_process_file_reuses_near_duplicate_extraction(tmp_path):
+    original = tmp_path / "a.txt"
+    original.write_text("UP1 Female remains with rose tattoo on the left shoulder")
+    reformatted = tmp_path / "b.txt"
+    reformatted.write_text("UP1   Female remains with rose tattoo on the left shoulder\n")
+    unrelated = tmp_path / "c.txt"
+    unrelated.write_text("MP9 xyzzy quux")
+    pipeline = CountingPipeline(cache_path=str(tmp_path / "cache.db"), embedding_model=LetterCountModel())
+
+    first = pipeline.process_file(original)
+    assert pipeline.process_file(reformatted) == first
+    assert pipeline.calls == 1
+
+    assert pipeline.process_file(unrelated).case_number == "MP9"
+    assert pipeline.calls == 2
+
+    pipeline.close()
+
+
+def test_pickled_pipeline_reloads_embedding_model_in_worker(tmp_path, monkeypatch):
+    model = LetterCountModel()
+    model.init_kwargs = {"model_name": "letters"}
+    pipeline = CountingPipeline(cache_path=str(tmp_path / "cache.db"), embedding_model=model)
+
+    copy = pickle.loads(pickle.dumps(pipeline))
+    assert copy.embedding_model is None
+    assert copy._embedding_config == {"model_name": "letters"}
+
+    loaded = []
+    monkeypatch.setattr(pipeline_module, "_load_embedding_model", lambda config: loaded.append(config) or model)
+    pipeline_module._init_worker(copy)
+    assert loaded == [{"model_name": "letters"}]
+    assert copy.embedding_model is model
+    assert pipeline_module._worker_pipeline is copy
+
+    pipeline.close()
@@ -0,0 +1,53 @@
+import math
+import os
+import sys
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.utils.geo_utils import (
+    bounding_box,
+    calculate_geo_score,
+    calculate_geo_score_batch,
+    haversine_distance,
+    haversine_distance_batch,
+    longitude_ranges,
+)
+
+
+def test_haversine_distance_batch_matches_scalar():
+    points = [(49.28, -123.12), (53.91, -122.75), (48.43, -123.37)]
+    lats = [p[0] for p in points]
+    lons = [p[1] for p in points]
+
+    batch = haversine_distance_batch(49.38, -121.44, lats, lons)
+
+    for dist, (lat, lon) in zip(batch, points):
+        assert math.isclose(dist, haversine_distance(49.38, -121.44, lat, lon), rel_tol=1e-9)
+
+
+def test_bounding_box_contains_points_within_distance():
+    lat_min, lat_max, lon_min, lon_max = bounding_box(49.38, -121.44, 100.0)
+
+    assert lat_min < 49.16 < lat_max and lon_min < -121.95 < lon_max
+    assert haversine_distance(49.38, -121.44, lat_max, -121.44) <= 100.0 + 1e-6
+
+
+def test_longitude_ranges_wrap_across_antimeridian():
+    lat_min, lat_max, lon_min, lon_max = bounding_box(52.0, 179.95, 100.0)
+    ranges = longitude_ranges(lon_min, lon_max)
+
+    assert len(ranges) == 2
+    assert any(lo <= -179.95 <= hi for lo, hi in ranges)
+    assert all(-180.0 <= lo <= hi <= 180.0 for lo, hi in ranges)
+    assert longitude_ranges(-121.0, -119.0) == [(-121.0, -119.0)]
+
+
+def test_calculate_geo_score_batch_matches_scalar():
+    scores = calculate_geo_score_batch([0.0, 150.0, float("nan")])
+
+    assert math.isclose(scores[0], calculate_geo_score(0.0))
+    assert math.isclose(scores[1], calculate_geo_score(150.0))
+    assert scores[2] == calculate_geo_score(None) == 0.5
@@ -0,0 +1,66 @@
+import os
+import sys
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.graph.client import GraphClient
+
+
+def test_init_schema_creates_indexes():
+    client = GraphClient(":memory:")
+    rows = client.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    ).fetchall()
+    names = {row[0] for row in rows}
+
+    assert {
+        "idx_edges_source_type",
+        "idx_edges_target_type",
+        "idx_nodes_label",
+        "idx_nodes_type",
+    } <= names
+
+    client.close()
+
+
+def test_type_filter_uses_expression_index():
+    client = GraphClient(":memory:")
+    client.create_person("UP-1", {"type": "unidentified"})
+
+    plan = client.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM graph_nodes "
+        "WHERE json_extract(properties, '$.type') = 'unidentified'"
+    ).fetchall()
+
+    assert any("idx_nodes_type" in row[-1] for row in plan)
+
+    client.close()
+
+
+def test_file_database_uses_wal(tmp_path):
+    client = GraphClient(str(tmp_path / "graph.db"))
+    mode = client.conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+    client.close()
+
+
+def test_bulk_writers_insert_nodes_and_edges():
+    client = GraphClient(":memory:")
+    client.create_nodes_bulk([
+        ("MP-1", "Person", {"type": "missing"}),
+        ("L-1", "Location", {"name": "Hope", "lat": 49.38}),
+    ])
+    client.link_nodes_bulk([("MP-1", "L-1", "LAST_SEEN_AT", None)])
+
+    assert client.conn.execute("SELECT COUNT(*) FROM graph_nodes").fetchone()[0] == 2
+    edge = client.conn.execute("SELECT source, target, type, properties FROM graph_edges").fetchone()
+    assert edge == ("MP-1", "L-1", "LAST_SEEN_AT", "{}")
+    lat = client.conn.execute("SELECT lat_r FROM graph_nodes WHERE id = 'L-1'").fetchone()[0]
+    assert lat == 49.38
+
+    client.close()
@@ -0,0 +1,97 @@
+import os
+import sys
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.graph.client import GraphClient
+from core.graph.queries import find_geographic_proximity, find_matches_by_feature
+
+
+def _build_feature_graph():
+    client = GraphClient(":memory:")
+    client.create_person("UP-1", {"type": "unidentified"})
+    client.create_person("MP-1", {"type": "missing", "name": "Jane Doe"})
+    client.create_person("MP-2", {"type": "missing", "name": "John Roe"})
+
+    client.create_node("F-rose", "Feature", {
+        "category": "skin", "medical_term": "tattoo", "description": "rose tattoo",
+    })
+    client.create_node("F-scar", "Feature", {
+        "category": "skin", "medical_term": "scar", "description": "appendix scar",
+    })
+    client.create_node("F-crown", "Feature", {
+        "category": "dental", "medical_term": "crown", "description": "gold crown",
+    })
+
+    client.link_nodes("UP-1", "F-rose", "HAS_FEATURE")
+    client.link_nodes("MP-1", "F-rose", "HAS_FEATURE")
+    client.link_nodes("MP-1", "F-scar", "HAS_FEATURE")
+    client.link_nodes("MP-2", "F-crown", "HAS_FEATURE")
+    return client
+
+
+def test_find_matches_by_feature_returns_shared_feature_matches():
+    client = _build_feature_graph()
+
+    results = find_matches_by_feature(client.conn, "UP-1")
+
+    assert [r["missing_id"] for r in results] == ["MP-1"]
+    assert results[0]["missing_name"] == "Jane Doe"
+    assert results[0]["unid_features"] == ["rose tattoo"]
+    assert sorted(results[0]["missing_features"]) == ["appendix scar", "rose tattoo"]
+
+    client.close()
+
+
+def test_find_matches_by_feature_requires_unidentified_source():
+    client = _build_feature_graph()
+
+    assert find_matches_by_feature(client.conn, "MP-1") == []
+
+    client.close()
+
+
+def test_find_geographic_proximity_filters_and_sorts_by_distance():
+    client = GraphClient(":memory:")
+    client.create_person("UP-1", {"type": "unidentified"})
+    client.create_location("L-found", {"name": "Hope", "lat": 49.38, "lon": -121.44})
+    client.link_person_to_location("UP-1", "L-found")
+
+    sightings = {
+        "MP-near": ("Chilliwack", 49.16, -121.95),
+        "MP-mid": ("Vancouver", 49.28, -123.12),
+        "MP-far": ("Prince George", 53.91, -122.75),
+    }
+    for m_id, (place, lat, lon) in sightings.items():
+        client.create_person(m_id, {"type": "missing", "name": m_id})
+        client.create_location(f"L-{m_id}", {"name": place, "lat": lat, "lon": lon})
+        client.link_nodes(m_id, f"L-{m_id}", "LAST_SEEN_AT")
+
+    results = find_geographic_proximity(client.conn, "UP-1", max_distance_km=100.0)
+
+    assert [r["missing_id"] for r in results] == ["MP-near", "MP-mid"]
+    assert results[0]["last_seen_location"] == "Chilliwack"
+    assert results[0]["distance_km"] < results[1]["distance_km"] <= 100.0
+
+    client.close()
+
+
+def test_find_geographic_proximity_wraps_across_antimeridian():
+    client = GraphClient(":memory:")
+    client.create_person("UP-1", {"type": "unidentified"})
+    client.create_location("L-found", {"name": "East", "lat": 52.0, "lon": 179.95})
+    client.link_person_to_location("UP-1", "L-found")
+
+    client.create_person("MP-1", {"type": "missing", "name": "MP-1"})
+    client.create_location("L-MP-1", {"name": "West", "lat": 52.0, "lon": -179.95})
+    client.link_nodes("MP-1", "L-MP-1", "LAST_SEEN_AT")
+
+    results = find_geographic_proximity(client.conn, "UP-1", max_distance_km=100.0)
+
+    assert [r["missing_id"] for r in results] == ["MP-1"]
+    assert results[0]["distance_km"] < 10.0
+
+    client.close()
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import sys
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.search.specificity_search import CompositeMatcher
+
+
+SCHEMA_SQL = """
+CREATE TABLE unidentified_cases (
+    case_number TEXT, estimated_sex TEXT, estimated_age_min INTEGER, estimated_age_max INTEGER,
+    discovery_date TEXT, description TEXT, discovery_lat REAL, discovery_lon REAL,
+    race TEXT, dna_status TEXT, dental_status TEXT
+);
+CREATE TABLE missing_persons (
+    file_number TEXT, name TEXT, age_at_disappearance INTEGER, last_seen_date TEXT,
+    description TEXT, last_seen_lat REAL, last_seen_lon REAL, sex TEXT, race TEXT,
+    dna_status TEXT, dental_status TEXT
+);
+"""
+
+UHR_DESC = "Female remains with dragon tattoo and titanium plate in left wrist"
+
+
+def _make_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.execute(
+        "INSERT INTO unidentified_cases VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+        ("UP1", "Female", 20, 30, "2010-06-01", UHR_DESC, 49.2, -123.1, "Asian", None, None),
+    )
+    missing = [
+        # Strong match: same traits, nearby, seen before discovery
+        ("MP-match", "Jane", 25, "2009-01-01", "Dragon tattoo, titanium plate wrist", 49.3, -123.0, "Female", "Asian"),
+        # Last seen after the remains were found
+        ("MP-later", "Late", 25, "2012-01-01", "Dragon tattoo, titanium plate wrist", 49.3, -123.0, "Female", "Asian"),
+        # Wrong sex
+        ("MP-male", "Joe", 25, "2009-01-01", "Dragon tattoo, titanium plate wrist", 49.3, -123.0, "Male", "Asian"),
+        # Outside the +/- 8 degree bounding box
+        ("MP-far", "Far", 25, "2009-01-01", "Dragon tattoo, titanium plate wrist", 30.0, -80.0, "Female", "Asian"),
+        # Outside the +/- 10 year age window
+        ("MP-old", "Old", 70, "2009-01-01", "Dragon tattoo, titanium plate wrist", 49.3, -123.0, "Female", "Asian"),
+        # No description to compare against
+        ("MP-nodesc", "Blank", 25, "2009-01-01", None, 49.3, -123.0, "Female", "Asian"),
+    ]
+    conn.executemany(
+        "INSERT INTO missing_persons VALUES (?,?,?,?,?,?,?,?,?,NULL,NULL)",
+        missing,
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_find_leads_applies_hard_filters(tmp_path):
+    db_path = str(tmp_path / "filament.db")
+    _make_db(db_path)
+
+    matcher = CompositeMatcher(db_path)
+    leads = matcher.find_leads(min_score=0.0, limit=10, parallel=False)
+
+    assert [lead["mp_file"] for lead in leads] == ["MP-match"]
+    lead = leads[0]
+    assert lead["uhr_case"] == "UP1"
+    assert lead["uhr_desc_preview"] == UHR_DESC
+    assert lead["shared_features"][-1].endswith("miles away")
+    assert 0.0 < lead["score"] <= 1.0
+
+
+def test_get_words_matches_regex_tokens_for_ascii_and_unicode():
+    matcher = CompositeMatcher(":memory:")
+
+    assert matcher._get_words("Rose-TATTOO on O'Brien, 1985 ab_cd") == {"rose", "tattoo", "brien", "ab_cd"}
+    assert matcher._get_words("Tatouage café à Montréal") == {"tatouage", "café", "montréal"}
+
+
+def test_get_words_drops_stop_words_and_numbers():
+    matcher = CompositeMatcher(":memory:")
+
+    assert matcher._get_words("The TATTOO was found with a scar, approx 1985, between the Shoulders") == {
+        "tattoo", "scar", "shoulders",
+    }
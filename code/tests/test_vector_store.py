@@ -0,0 +1,48 @@
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+code_dir = os.path.dirname(test_dir)
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.search.vector_store import VectorStore
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(sqlite3.Connection, "enable_load_extension"),
+    reason="sqlite3 built without extension loading",
+)
+
+
+def _store_with_plain_table():
+    # sqlite-vss is not needed to check the bookkeeping around vss_<table>
+    store = VectorStore(":memory:")
+    store.conn.execute("CREATE TABLE vss_docs (embedding)")
+    return store
+
+
+def test_insert_many_links_vectors_to_metadata_rowids():
+    store = _store_with_plain_table()
+    store.insert_many("docs", [
+        ("a", "first", np.array([1.0, 0.0]), {"source": "x"}),
+        ("b", "second", np.array([0.0, 1.0]), None),
+    ])
+
+    rows = store.conn.execute("""
+        SELECT m.id, m.metadata, v.embedding
+        FROM vector_metadata m JOIN vss_docs v ON v.rowid = m.rowid
+        ORDER BY m.id
+    """).fetchall()
+
+    assert [(r[0], json.loads(r[1]), np.frombuffer(r[2], dtype=np.float32).tolist()) for r in rows] == [
+        ("a", {"source": "x"}, [1.0, 0.0]),
+        ("b", {}, [0.0, 1.0]),
+    ]
+
+    store.close()